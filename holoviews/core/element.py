@@ -1,4 +1,3 @@
-from itertools import groupby
 from numbers import Number
 import numpy as np
 
@@ -9,7 +8,8 @@ from .layout import Composable, Layout, AdjointLayout, NdLayout
 from .ndmapping import OrderedDict, UniformNdMapping, NdMapping
 from .overlay import Overlayable, NdOverlay, Overlay, CompositeOverlay
 from .tree import AttrTree
-from .util import sanitize_identifier
+from .util import (sanitize_identifier, factorize, reduce_groups,
+                   dimension_sort, FrameCache, parallel_map)
 
 
 class Element(ViewableElement, Composable, Overlayable):
@@ -176,6 +176,12 @@ class NdElement(Element, NdMapping):
 
     _deep_indexable = False
 
+    # Columnar representation of the data, one array per dimension
+    _cached_data_columns = None
+
+    # List of rows holding the concatenated key and value tuples
+    _cached_rows = None
+
     def __init__(self, data=None, **params):
         NdMapping.__init__(self, data, **dict(params, group=params.get('group',self.group)))
         for k, v in self.data.items():
@@ -186,6 +192,88 @@ class NdElement(Element, NdMapping):
         value = (value,) if np.isscalar(value) else tuple(value)
         key = key if isinstance(key, tuple) else (key,)
         self.data[key] = value
+        self._modified += 1
+
+
+    def __getstate__(self):
+        obj_dict = super(NdElement, self).__getstate__()
+        obj_dict.pop('_cached_data_columns', None)
+        obj_dict.pop('_cached_rows', None)
+        return obj_dict
+
+
+    def _cached(self, attr, compute):
+        """
+        Returns the cache stored in the given attribute, recomputing
+        it if the data has been replaced or modified since it was
+        computed.
+        """
+        cached = getattr(self, attr)
+        state = (self._modified, len(self.data))
+        if cached is None or cached[0] is not self.data or cached[1] != state:
+            cached = (self.data, state, compute())
+            setattr(self, attr, cached)
+        return cached[2]
+
+
+    def row(self, index):
+        """
+        Returns the row at the given integer index as a tuple of the
+        key and value components. The rows are cached until the
+        NdElement is modified, allowing constant time random access.
+        """
+        rows = self._cached('_cached_rows',
+                            lambda: [k + v for k, v in self.data.items()])
+        return rows[index]
+
+
+    def column(self, dimension):
+        """
+        Returns the array of values along the specified dimension,
+        which may be supplied as a name or an integer index.
+        """
+        label = self.get_dimension(dimension).name
+        return self.columns([label])[label]
+
+
+    def columns(self, dimensions=None):
+        """
+        Returns the data as an OrderedDict of columns, holding one
+        array per key and value dimension. The columns are computed
+        once and cached until the NdElement is modified, allowing
+        vectorized operations over the whole table. Optionally a
+        subset of the dimensions may be requested by name. The arrays
+        are shared with the cache and therefore read-only.
+        """
+        columns = self._cached('_cached_data_columns', self._compute_columns)
+        if dimensions is None:
+            return columns
+        return OrderedDict((d, columns[d]) for d in dimensions)
+
+
+    def _compute_columns(self):
+        labels = self.dimensions(label=True)
+        rows = [k + v for k, v in self.data.items()]
+        columns = list(zip(*rows)) if rows else [()]*len(labels)
+        arrays = [self._column_array(c) for c in columns]
+        for arr in arrays:
+            arr.flags.writeable = False
+        return OrderedDict(zip(labels, arrays))
+
+
+    @staticmethod
+    def _column_array(values):
+        """
+        Converts a sequence of values into a one-dimensional array,
+        falling back to an object array if the values would otherwise
+        be broadcast into multiple dimensions.
+        """
+        arr = np.array(values)
+        if arr.ndim != 1:
+            arr = np.empty(len(values), dtype=object)
+            for i, v in enumerate(values):
+                arr[i] = v
+        return arr
 
 
     def _filter_columns(self, index, col_names):
@@ -293,30 +381,44 @@ class NdElement(Element, NdMapping):
                             "or as part of the kwargs not both.")
         elif dimensions:
             reduce_map = {d: function for d in dimensions}
-        dim_labels = self._cached_index_names
+
+        # Group the reduced dimensions by reduce function
+        reduce_fns = OrderedDict()
+        for dim in self._cached_index_names:
+            if dim in reduce_map:
+                reduce_fns.setdefault(reduce_map[dim], []).append(dim)
+
         reduced_table = self
-        for reduce_fn, group in groupby(reduce_map.items(), lambda x: x[1]):
-            dims = [dim for dim, _ in group]
-            split_dims = [self.get_dimension(d) for d in dim_labels if d not in dims]
-            if len(split_dims) and reduced_table.ndims > 1:
-                split_map = reduced_table.groupby([d.name for d in split_dims], container_type=HoloMap,
-                                                  group_type=self.__class__)
-                reduced_table = self.clone(shared_data=False, key_dimensions=split_dims)
-                for k, table in split_map.items():
-                    reduced = []
-                    for vdim in self.value_dimensions:
-                        valtable = table.select(value=vdim.name) if len(self.value_dimensions) > 1 else table
-                        reduced.append(reduce_fn(valtable.data.values()))
-                    reduced_table[k] = reduced
-            else:
-                reduced = tuple(reduce_fn(self.dimension_values(vdim.name))
-                                for vdim in self.value_dimensions)
-                params = dict(group=self.group) if self.value != type(self).__name__ else {}
-                reduced_table = self.__class__([((), reduced)], label=self.label,
-                                               value_dimensions=self.value_dimensions, **params)
+        for reduce_fn, dims in reduce_fns.items():
+            reduced_table = reduced_table._reduce_dimensions(dims, reduce_fn)
         return reduced_table
 
 
+    def _reduce_dimensions(self, dims, reduce_fn):
+        """
+        Reduces the supplied key dimensions by applying the reduce_fn
+        to the values of each group of rows that share the same values
+        along the remaining key dimensions.
+        """
+        split_dims = [d for d in self.key_dimensions if d.name not in dims]
+        columns = self.columns()
+        if not split_dims:
+            reduced = tuple(reduce_fn(columns[vdim.name])
+                            for vdim in self.value_dimensions)
+            params = dict(group=self.group) if self.group != type(self).__name__ else {}
+            return self.__class__([((), reduced)], label=self.label, key_dimensions=[],
+                                  value_dimensions=self.value_dimensions, **params)
+
+        codes, first = factorize([columns[d.name] for d in split_dims])
+        reduced = [reduce_groups(reduce_fn, columns[vdim.name], codes, len(first))
+                   for vdim in self.value_dimensions]
+        keys = list(self.data.keys())
+        inds = [self.get_dimension_index(d.name) for d in split_dims]
+        items = [(tuple(keys[idx][i] for i in inds), vals)
+                 for idx, vals in zip(first, zip(*reduced))]
+        return self.clone(items, key_dimensions=split_dims)
+
+
     def _item_check(self, dim_vals, data):
         if isinstance(data, tuple):
             for el in data:
@@ -337,10 +439,11 @@ class NdElement(Element, NdMapping):
     def dimension_values(self, dim):
         if isinstance(dim, Dimension):
             raise Exception('Dimension to be specified by name')
-        value_dims = self.dimensions('value', label=True)
-        if dim in value_dims:
-            index = value_dims.index(dim)
-            return [v[index] for v in self.values()]
+        if isinstance(dim, int):
+            dim = self.get_dimension(dim).name
+        columns = self.columns()
+        if dim in columns:
+            return columns[dim].copy()
         else:
             return NdMapping.dimension_values(self, dim)
 
@@ -350,10 +453,8 @@ class NdElement(Element, NdMapping):
             import pandas
         except ImportError:
             raise Exception("Cannot build a DataFrame without the pandas library.")
-        labels = [d.name for d in self.dimensions()]
-        return pandas.DataFrame(
-            [dict(zip(labels, np.concatenate([np.array(k),v])))
-             for (k, v) in self.data.items()])
+        columns = self.columns()
+        return pandas.DataFrame(columns, columns=list(columns.keys()))
 
 
 
@@ -541,7 +642,7 @@ class HoloMap(UniformNdMapping):
         on the HoloMap. Homogenous Elements may be collapsed by
         supplying a function, inhomogenous elements are merged.
         """
-        from .operation import MapOperation
+        from .operation import MapOperation, _dispatch_map, _operation_spec
         if not dimensions:
             dimensions = self._cached_index_names
         if self.ndims > 1 and len(dimensions) != self.ndims:
@@ -551,10 +652,22 @@ class HoloMap(UniformNdMapping):
             [self.get_dimension(dim) for dim in dimensions]
             groups = HoloMap([(0, self)])
         collapsed = groups.clone(shared_data=False)
-        for key, group in groups.items():
-            if isinstance(function, MapOperation):
-                collapsed[key] = function(group, **kwargs)
+        if isinstance(function, MapOperation):
+            items = groups.items()
+            executor = kwargs.pop('executor', function.executor)
+            workers = kwargs.pop('workers', function.workers)
+            timeout = kwargs.pop('timeout', function.timeout)
+            if executor == 'serial':
+                results = [function(group, **kwargs) for _, group in items]
             else:
+                spec = _operation_spec(function)
+                results = parallel_map(_dispatch_map,
+                                       [(spec, kwargs, group) for _, group in items],
+                                       executor, workers, timeout)
+            for (key, _), result in zip(items, results):
+                collapsed[key] = result
+        else:
+            for key, group in groups.items():
                 data = group.type.collapse_data([el.data for el in group], function, **kwargs)
                 collapsed[key] = group.last.clone(data)
         return collapsed if self.ndims > 1 else collapsed.last
@@ -624,25 +737,323 @@ class HoloMap(UniformNdMapping):
 
 
     def hist(self, num_bins=20, bin_range=None, adjoin=True, individually=True, **kwargs):
-        histmap = self.clone(shared_data=False)
-
-        map_range = None if individually else self.range
-        bin_range = map_range if bin_range is None else bin_range
+        """
+        Computes a histogram of each frame of the HoloMap, returned as
+        a HoloMap adjoined to this HoloMap if adjoin is True. Unless
+        individually is True or a bin_range is supplied, the bins are
+        shared across all the frames. For HoloMaps of Overlays, the
+        histograms are computed for the layer selected by index.
+        """
+        from ..operation import histogram
         style_prefix = 'Custom[<' + self.name + '>]_'
-        for k, v in self.data.items():
-            histmap[k] = v.hist(adjoin=False, bin_range=bin_range,
-                                individually=individually, num_bins=num_bins,
-                                style_prefix=style_prefix, **kwargs)
+        frames = self
+        index = kwargs.pop('index', 0)
+        if issubclass(self.type, Overlay):
+            frames = self.clone([(k, v.get(index)) for k, v in self.data.items()])
+        hists = histogram(frames, adjoin=False, bin_range=bin_range,
+                          individually=individually, num_bins=num_bins,
+                          style_prefix=style_prefix, **kwargs)
+        histmap = self.clone(hists.items(), shared_data=False)
 
         if adjoin and issubclass(self.type, (NdOverlay, Overlay)):
             layout = (self << histmap)
-            layout.main_layer = kwargs['index']
+            layout.main_layer = index
             return layout
 
         return (self << histmap) if adjoin else histmap
 
 
 
+class LazyFrames(object):
+    """
+    LazyFrames is the ordered mapping backing a LazyHoloMap. It holds
+    the keys of the map and a function, which is called with the key
+    values to generate the frame for a key on demand. Generated frames
+    are held in a FrameCache, frames assigned explicitly are always
+    kept in memory.
+    """
+
+    def __init__(self, keys=[], function=None, cache=None, frames=None):
+        self._keys = [k if isinstance(k, tuple) else (k,) for k in keys]
+        self._keyset = set(self._keys)
+        self.function = function
+        self.cache = FrameCache() if cache is None else cache
+        self.frames = {} if frames is None else dict(frames)
+
+
+    def copy(self):
+        "Returns a copy sharing the function and the frame cache."
+        return LazyFrames(self._keys, self.function, self.cache, self.frames)
+
+
+    def subset(self, keys, transform=None):
+        """
+        Returns a LazyFrames instance holding only the supplied keys.
+        If a transform is supplied it is applied to each frame as it
+        is generated, otherwise the frame cache is shared.
+        """
+        if transform is None:
+            frames = {k: v for k, v in self.frames.items() if k in set(keys)}
+            return LazyFrames(keys, self.function, self.cache, frames)
+        cache = FrameCache(self.cache.budget, self.cache.size_fn,
+                           self.cache.max_items)
+        return LazyFrames(keys, lambda *key: transform(self[key]), cache)
+
+
+    def reorder(self, keys):
+        self._keys = list(keys)
+
+
+    def keys(self):
+        return list(self._keys)
+
+
+    def values(self):
+        return FrameSequence(self)
+
+
+    def items(self, scalar_keys=False):
+        return FrameSequence(self, items=True, scalar_keys=scalar_keys)
+
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+    def pop(self, key, default=None):
+        if key not in self._keyset:
+            return default
+        value = self[key]
+        self._keys.remove(key)
+        self._keyset.remove(key)
+        self.frames.pop(key, None)
+        return value
+
+
+    def __getitem__(self, key):
+        if key in self.frames:
+            return self.frames[key]
+        elif key not in self._keyset or self.function is None:
+            raise KeyError(key)
+        frame = self.cache.get(key)
+        if frame is None:
+            frame = self.function(*key)
+            self.cache[key] = frame
+        return frame
+
+
+    def __setitem__(self, key, value):
+        if key not in self._keyset:
+            self._keys.append(key)
+            self._keyset.add(key)
+        self.frames[key] = value
+
+
+    def __getstate__(self):
+        "Generated frames are not pickled."
+        state = self.__dict__.copy()
+        state['cache'] = FrameCache(self.cache.budget, self.cache.size_fn,
+                                    self.cache.max_items)
+        return state
+
+
+    def __contains__(self, key):
+        return key in self._keyset
+
+
+    def __iter__(self):
+        return iter(self._keys)
+
+
+    def __reversed__(self):
+        return reversed(self._keys)
+
+
+    def __len__(self):
+        return len(self._keys)
+
+
+
+class FrameSequence(object):
+    """
+    Sequence of the frames (or the key, frame pairs) in a LazyFrames
+    mapping, generating each frame only when it is accessed. If
+    scalar_keys is enabled, single valued keys are unpacked.
+    """
+
+    def __init__(self, frames, items=False, scalar_keys=False):
+        self._frames = frames
+        self._items = items
+        self._scalar_keys = scalar_keys
+
+    def _get(self, key):
+        frame = self._frames[key]
+        if not self._items:
+            return frame
+        return (key[0] if self._scalar_keys else key, frame)
+
+    def __getitem__(self, index):
+        keys = self._frames._keys
+        if isinstance(index, slice):
+            return [self._get(k) for k in keys[index]]
+        return self._get(keys[index])
+
+    def __iter__(self):
+        for key in list(self._frames._keys):
+            yield self._get(key)
+
+    def __len__(self):
+        return len(self._frames)
+
+
+
+class LazyHoloMap(HoloMap):
+    """
+    A LazyHoloMap declares the keys of a HoloMap together with a
+    callable returning the Element for a given key, e.g.:
+
+        LazyHoloMap(lambda t: Image(simulation(t)), keys=range(1000),
+                    key_dimensions=['Time'])
+
+    The callable is called with the key values of a frame and frames
+    are only generated when they are accessed, either by indexing, by
+    iterating over the map or when plotting. Generated frames are held
+    in a least recently used cache, which evicts frames once their
+    combined size exceeds the cache_budget.
+
+    Indexing, slicing and mapping over a LazyHoloMap do not generate
+    any frames, other operations return ordinary data generated from
+    all the frames. As frames may be regenerated, any changes to a
+    generated frame (e.g. customized options) should be applied by
+    the callable itself.
+    """
+
+    cache_budget = param.Integer(default=256*1024**2, allow_None=True, doc="""
+        The memory budget in bytes for the cache of generated frames,
+        beyond which the least recently used frames are evicted. If
+        None, all generated frames are kept in memory.""")
+
+    def __init__(self, initial_items=None, keys=[], **params):
+        lazy = isinstance(initial_items, LazyFrames)
+        function = (callable(initial_items) and not lazy and
+                    not isinstance(initial_items, Dimensioned))
+        super(LazyHoloMap, self).__init__([] if lazy or function else initial_items,
+                                          **params)
+        if lazy:
+            self.data = initial_items.copy()
+        else:
+            cache = FrameCache(self.cache_budget)
+            if function:
+                self.data = LazyFrames(keys, initial_items, cache)
+            else:
+                self.data = LazyFrames(self.data.keys(), None, cache, self.data)
+        self._resort()
+
+
+    def _resort(self):
+        if not isinstance(self.data, LazyFrames):
+            return super(LazyHoloMap, self)._resort()
+        keys = self.data.keys()
+        try:
+            keys = sorted(keys, key=self._sort_key)
+        except (TypeError, KeyError):
+            self._key_fn = None
+            keys = [k for k, _ in dimension_sort(OrderedDict.fromkeys(keys),
+                                                 self.key_dimensions,
+                                                 self._cached_categorical,
+                                                 self._cached_index_values)]
+        self.data.reorder(keys)
+        self._key_index, self._cached_columns = None, None
+
+
+    def _insert_key(self, key):
+        self._resort()
+
+
+    def __getitem__(self, indexslice):
+        """
+        Indexing returns the generated frame, while slicing returns a
+        LazyHoloMap over the selected keys without generating frames.
+        """
+        if indexslice in [Ellipsis, ()]:
+            return self
+
+        map_slice, data_slice = self._split_index(indexslice)
+        map_slice = self._transform_indices(map_slice)
+        map_slice = self._expand_slice(map_slice)
+
+        if all(not isinstance(el, (slice, set, list, tuple)) for el in map_slice):
+            return self._dataslice(self.data[map_slice], data_slice)
+        keys = self.data.keys()
+        keys = [keys[i] for i in np.flatnonzero(self._generate_mask(map_slice))]
+        if len(keys) == 0:
+            raise KeyError('No items within specified slice.')
+        transform = (lambda frame: self._dataslice(frame, data_slice)) if data_slice else None
+        return self.clone(self.data.subset(keys, transform))
+
+
+    def map(self, map_fn, specs=None):
+        """
+        Maps the function over the map itself and lazily over each
+        frame as it is generated.
+        """
+        applies = specs is None or any(self.matches(spec) for spec in specs)
+        mapped = map_fn(self) if applies else self
+        if not isinstance(mapped, LazyHoloMap):
+            return super(LazyHoloMap, self).map(map_fn, specs)
+        frames = mapped.data.subset(mapped.data.keys(),
+                                    lambda frame: frame.map(map_fn, specs))
+        return mapped.clone(frames)
+
+
+    @property
+    def group(self):
+        "The group of the map, inferred from the first frame if not set."
+        if self._group or not len(self):
+            return self._group if self._group else type(self).__name__
+        frame = self.values()[0]
+        if not frame._auxiliary_component and frame.group != type(frame).__name__:
+            return frame.group
+        return type(self).__name__
+
+    @group.setter
+    def group(self, group):
+        HoloMap.group.fset(self, group)
+
+
+    @property
+    def label(self):
+        "The label of the map, inferred from the first frame if not set."
+        if self._label or not len(self):
+            return self._label if self._label else ''
+        frame = self.values()[0]
+        return '' if frame._auxiliary_component else frame.label
+
+    @label.setter
+    def label(self, label):
+        HoloMap.label.fset(self, label)
+
+
+    @property
+    def last(self):
+        "Returns the frame with the highest key."
+        return self.data[next(reversed(self.data))] if len(self) else None
+
+
+    def values(self):
+        "Returns a sequence of the frames, generated as they are accessed."
+        return self.data.values()
+
+
+    def items(self):
+        "Returns a sequence of (key, frame) pairs, generated as they are accessed."
+        return self.data.items(scalar_keys=self.ndims == 1)
+
+
+
 class Collator(NdMapping):
     """
     Collator is an NdMapping type which can merge any number
@@ -14,21 +14,109 @@ Archives: A collection of HoloViews objects that are first collected
 """
 from __future__ import absolute_import
 
-import re, os, time, string, zipfile, tarfile, shutil, itertools, pickle
+import re, os, sys, time, string, struct, zipfile, tarfile, shutil, tempfile
+import itertools, numbers, pickle
 
 from io import BytesIO
 from hashlib import sha256
 
+import numpy as np
 import param
 from param.parameterized import bothmethod
 
 from .options import Store
-from .util import unique_iterator, sanitize_identifier
+from .util import unique_iterator, sanitize_identifier, basestring, Parallelizable
 from .ndmapping import OrderedDict, UniformNdMapping
 from .layout import Layout
+from .element import HoloMap, LazyHoloMap
 from .dimension import LabelledData
 
 
+def _is_stream(data):
+    "Whether the data is an iterator over chunks of data."
+    return hasattr(data, '__next__') or hasattr(data, 'next')
+
+
+# Directories of the .npy members and of the HoloMap frames in
+# version 2 .hvz archives
+_ARRAY_DIR = 'arrays'
+_FRAME_DIR = 'frames'
+
+# Directory of the metadata updates written by Pickler.append
+_APPEND_DIR = 'appended'
+
+
+def _read_metadata(archive):
+    """
+    Returns the metadata of an open .hvz archive, applying the updates
+    written by each append in turn to the metadata written on save.
+    """
+    metadata = pickle.loads(archive.read('metadata'))
+    updates = [name for name in archive.namelist() if name.startswith(_APPEND_DIR + '/')]
+    for name in sorted(updates, key=lambda name: int(name.split('/')[-1])):
+        update = pickle.loads(archive.read(name))
+        for entry, keys in update.pop('index').items():
+            metadata.setdefault('index', {}).setdefault(entry, []).extend(keys)
+        metadata.update(update)
+    return metadata
+
+def _select_keys(keys, selection):
+    """
+    Returns the positions of the keys matching the selection, which
+    may be None to select all keys, a list of keys or a slice over the
+    values of the first key dimension.
+    """
+    if selection is None:
+        return range(len(keys))
+    elif isinstance(selection, slice):
+        return [i for i, k in enumerate(keys)
+                if (selection.start is None or k[0] >= selection.start)
+                and (selection.stop is None or k[0] < selection.stop)]
+    positions = {k: i for i, k in enumerate(keys)}
+    selection = [k if isinstance(k, tuple) else (k,) for k in selection]
+    missing = [k for k in selection if k not in positions]
+    if missing:
+        raise KeyError("Keys %s not found in the index" % missing)
+    return [positions[k] for k in selection]
+
+
+def _write_array(archive, name, array):
+    "Writes an array to a .npy member of a zip archive."
+    if sys.version_info >= (3, 6):
+        with archive.open(name, 'w', force_zip64=True) as member:
+            np.lib.format.write_array(member, array, allow_pickle=False)
+    else:
+        buff = BytesIO()
+        np.lib.format.write_array(buff, array, allow_pickle=False)
+        archive.writestr(name, buff.getvalue())
+
+
+def _read_array(archive, filename, name, mmap=True):
+    """
+    Reads an array from a .npy member of a zip archive. If mmap is
+    enabled and the member of the archive file is stored uncompressed,
+    the array is memory-mapped directly from the file.
+    """
+    info = archive.getinfo(name)
+    if mmap and isinstance(filename, basestring) and info.compress_type == zipfile.ZIP_STORED:
+        with open(filename, 'rb') as f:
+            # Skip the local file header preceding the member data
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = struct.unpack('<HH', f.read(4))
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            read_header = (np.lib.format.read_array_header_1_0 if version == (1, 0)
+                           else np.lib.format.read_array_header_2_0)
+            shape, fortran, dtype = read_header(f)
+            offset = f.tell()
+        if np.prod(shape): # Empty arrays cannot be memory-mapped
+            return np.memmap(filename, dtype=dtype, mode='r', shape=shape,
+                             order='F' if fortran else 'C', offset=offset)
+    with archive.open(name) as member:
+        return np.lib.format.read_array(member)
+
+
+
 class Reference(param.Parameterized):
     """
     A Reference allows access to an object to be deferred until it is
@@ -142,6 +230,20 @@ class Exporter(param.ParameterizedFunction):
         raise NotImplementedError("Exporter not implemented.")
 
 
+    @bothmethod
+    def stream(self_or_cls, obj, fmt=None):
+        """
+        Equivalent to calling the exporter except that the exported
+        data is returned as an iterator over chunks of data, which
+        may be written out incrementally. By default, the data is
+        returned as a single chunk.
+        """
+        rendered = self_or_cls(obj) if fmt is None else self_or_cls(obj, fmt)
+        if rendered is None: return None
+        (data, info) = rendered
+        return iter([data]), info
+
+
     @bothmethod
     def save(self_or_cls, obj, basename, fmt=None, key={}, info={}, **kwargs):
         """
@@ -292,9 +394,16 @@ class Pickler(Exporter):
     1. Optional (zip) compression.
     2. Ability to save and load components of a Layout independently.
     3. Support for metadata per saved component.
+    4. Appending objects or HoloMap frames to an existing archive.
 
     The output file with the .hvz file extension is simply a zip
-    archive containing pickled HoloViews objects.
+    archive containing pickled HoloViews objects. In version 2 of the
+    format, the array data of the objects is stored out-of-band in
+    separate .npy members of the archive, which are written without
+    copying the data into the pickles and may be memory-mapped when
+    loaded from an uncompressed archive. The frames of HoloMaps are
+    pickled individually and indexed by their keys, so that selected
+    frames may be loaded without loading the whole HoloMap.
     """
 
     protocol = param.Integer(default=2, doc="""
@@ -304,6 +413,16 @@ class Pickler(Exporter):
     compress = param.Boolean(default=True, doc="""
         Whether compression is enabled or not""")
 
+    version = param.ObjectSelector(default=1, objects=[1, 2], doc="""
+        The version of the .hvz format. Version 1 stores each
+        component as a single pickle, version 2 stores the arrays of
+        the components as separate .npy members and each frame of a
+        HoloMap as a separate pickle.""")
+
+    array_nbytes = param.Integer(default=1024, bounds=(0, None), doc="""
+        The minimum size in bytes of the arrays stored as separate
+        .npy members in version 2, smaller arrays are pickled.""")
+
     mime_type = 'application/zip'
     file_ext = 'hvz'
 
@@ -316,28 +435,132 @@ class Pickler(Exporter):
 
     @bothmethod
     def save(self_or_cls, obj, filename, key={}, info={}, **kwargs):
+        if kwargs:
+            self_or_cls = self_or_cls.instance(**kwargs)
         base_info = {'file-ext': 'hvz', 'mime_type':self_or_cls.mime_type}
         key = self_or_cls._merge_metadata(obj, self_or_cls.key_fn, key)
         info = self_or_cls._merge_metadata(obj, self_or_cls.info_fn, info, base_info)
-        compression = zipfile.ZIP_STORED if self_or_cls.compress else zipfile.ZIP_DEFLATED
+        compression = zipfile.ZIP_DEFLATED if self_or_cls.compress else zipfile.ZIP_STORED
 
         filename = self_or_cls._filename(filename) if isinstance(filename, str) else filename
         with zipfile.ZipFile(filename, 'w', compression=compression) as f:
+            index = {}
+            for entry, component in self_or_cls._components(obj):
+                self_or_cls._write_component(f, component, entry, index)
+            f.writestr('metadata',
+                       pickle.dumps({'info':info, 'key':key, 'index':index,
+                                     'version':self_or_cls.version}))
 
-            if isinstance(obj, Layout):
-                entries = ['.'.join(k) for k in obj.data.keys()]
-                components = list(obj.data.values())
-                entries = entries if len(entries) > 1 else [entries[0]+'(L)']
-            else:
-                entries = ['%s.%s' % (sanitize_identifier(obj.group, False),
-                                      sanitize_identifier(obj.label, False))]
-                components = [obj]
+    @bothmethod
+    def append(self_or_cls, obj, filename, key={}, info={}, **kwargs):
+        """
+        Appends an object to an existing archive, creating the archive
+        if it does not exist yet. The frames of a HoloMap are added to
+        a matching HoloMap entry of a version 2 archive, other
+        components are added as new entries. The supplied metadata
+        key and info are merged into the existing metadata. Earlier
+        content is not rewritten, each append only writes the merged
+        key and info and the keys of the frames it added, which are
+        combined with the original metadata when it is read.
+        """
+        if kwargs:
+            self_or_cls = self_or_cls.instance(**kwargs)
+        filename = self_or_cls._filename(filename) if isinstance(filename, str) else filename
+        if isinstance(filename, str) and not os.path.isfile(filename):
+            return self_or_cls.save(obj, filename, key=key, info=info)
 
-            for component, entry in zip(components, entries):
-                f.writestr(entry,
-                           Store.dumps(component, protocol=self_or_cls.protocol))
-            f.writestr('metadata',
-                       pickle.dumps({'info':info, 'key':key}))
+        with zipfile.ZipFile(filename, 'r') as f:
+            metadata = _read_metadata(f)
+            existing = set(f.namelist())
+        updates = len([name for name in existing if name.startswith(_APPEND_DIR + '/')])
+        key = self_or_cls._merge_metadata(obj, self_or_cls.key_fn, metadata['key'], key)
+        info = self_or_cls._merge_metadata(obj, self_or_cls.info_fn, metadata['info'], info)
+        version = metadata.get('version', 1)
+        index = metadata.get('index', {})
+        lengths = {entry: len(keys) for entry, keys in index.items()}
+
+        compression = zipfile.ZIP_DEFLATED if self_or_cls.compress else zipfile.ZIP_STORED
+        with zipfile.ZipFile(filename, 'a', compression=compression) as f:
+            for entry, component in self_or_cls._components(obj):
+                if entry in index and isinstance(component, HoloMap):
+                    self_or_cls._write_frames(f, component, entry, index, version)
+                elif entry in existing and version == 1:
+                    raise ValueError("Entry %s already exists in a version 1 archive, "
+                                     "frames may only be appended to HoloMaps in "
+                                     "version 2 archives." % entry)
+                elif entry in existing:
+                    raise ValueError("Entry %s already exists and cannot be "
+                                     "appended to." % entry)
+                else:
+                    self_or_cls._write_component(f, component, entry, index, version)
+            added = {entry: keys[lengths.get(entry, 0):] for entry, keys in index.items()
+                     if entry not in lengths or len(keys) > lengths[entry]}
+            f.writestr('%s/%d' % (_APPEND_DIR, updates),
+                       pickle.dumps({'info':info, 'key':key, 'index':added}))
+
+    @staticmethod
+    def _components(obj):
+        "Returns the (entry, component) pairs to be stored for an object."
+        if isinstance(obj, Layout):
+            entries = ['.'.join(k) for k in obj.data.keys()]
+            components = list(obj.data.values())
+            entries = entries if len(entries) > 1 else [entries[0]+'(L)']
+        else:
+            entries = ['%s.%s' % (sanitize_identifier(obj.group, False),
+                                  sanitize_identifier(obj.label, False))]
+            components = [obj]
+        return list(zip(entries, components))
+
+    @bothmethod
+    def _write_component(self_or_cls, archive, component, entry, index, version=None):
+        """
+        Writes a component to the archive. In version 2, the frames of
+        a HoloMap are written separately and their keys are added to
+        the index.
+        """
+        version = self_or_cls.version if version is None else version
+        if version == 2 and isinstance(component, HoloMap):
+            index[entry] = []
+            self_or_cls._write_frames(archive, component, entry, index, version)
+            component = component.clone([])
+        archive.writestr(entry, self_or_cls._dumps(archive, component, entry, version))
+
+    @bothmethod
+    def _write_frames(self_or_cls, archive, component, entry, index, version=None):
+        "Writes the frames of a HoloMap, adding their keys to the index."
+        keys = list(component.data.keys())
+        duplicates = set(keys) & set(index[entry])
+        if duplicates:
+            raise ValueError("Frames with keys %s already exist in entry %s."
+                             % (sorted(duplicates), entry))
+        for k in keys:
+            name = '%s/%s/%d' % (_FRAME_DIR, entry, len(index[entry]))
+            archive.writestr(name, self_or_cls._dumps(archive, component.data[k],
+                                                      name, version))
+            index[entry].append(k)
+
+    @bothmethod
+    def _dumps(self_or_cls, archive, component, name, version=None):
+        """
+        Pickles a component, writing its arrays to separate .npy
+        members of the archive in version 2 of the format.
+        """
+        version = self_or_cls.version if version is None else version
+        if version == 1:
+            return Store.dumps(component, protocol=self_or_cls.protocol)
+
+        arrays = OrderedDict()
+        def persistent_id(obj):
+            if (type(obj) not in (np.ndarray, np.memmap) or obj.dtype.hasobject
+                or obj.nbytes < self_or_cls.array_nbytes):
+                return None
+            if id(obj) not in arrays:
+                member = '%s/%s/%d.npy' % (_ARRAY_DIR, name, len(arrays))
+                _write_array(archive, member, obj)
+                arrays[id(obj)] = (member, obj)
+            return arrays[id(obj)][0]
+        return Store.dumps(component, protocol=self_or_cls.protocol,
+                           persistent_id=persistent_id)
 
 
 
@@ -351,22 +574,43 @@ class Unpickler(Importer):
     load the entire file into memory.
 
     The components that may be individually loaded may be found using
-    the entries method.
+    the entries method. The frames of HoloMaps stored in version 2
+    archives may be selected by their keys, as listed by the index
+    method, or loaded on access using a LazyHoloMap returned by the
+    lazy method.
     """
 
-    def __call__(self, data, entries=None):
+    mmap = param.Boolean(default=True, doc="""
+        Whether the arrays stored in version 2 archives are
+        memory-mapped if the archive is a file stored uncompressed.
+        Otherwise the arrays are read into memory.""")
+
+    def __call__(self, data, entries=None, keys=None):
         buff = BytesIO(data)
-        return self.load(buff, entries=entries)
+        return self.load(buff, entries=entries, keys=keys)
 
     @bothmethod
-    def load(self_or_cls, filename, entries=None):
+    def load(self_or_cls, filename, entries=None, keys=None):
+        """
+        Loads the selected entries of the archive, or all of them if
+        no entries are supplied. The keys may select the frames of the
+        HoloMaps in version 2 archives, either as a list of keys or as
+        a slice over the values of the first key dimension.
+        """
         components, single_layout = [], False
         entries = entries if entries else self_or_cls.entries(filename)
+        index = self_or_cls.index(filename)
         with zipfile.ZipFile(filename, 'r') as f:
             for entry in entries:
                 if entry not in f.namelist():
                     raise Exception("Entry %s not available" % entry)
-                components.append(Store.loads(f.read(entry)))
+                component = self_or_cls._loads(f, filename, entry)
+                if entry in index:
+                    selected = _select_keys(index[entry], keys)
+                    component = component.clone(
+                        [(index[entry][i], self_or_cls._load_frame(f, filename, entry, i))
+                         for i in selected])
+                components.append(component)
                 single_layout = entry.endswith('(L)')
 
         if len(components) == 1 and not single_layout:
@@ -374,12 +618,54 @@ class Unpickler(Importer):
         else:
             return Layout.from_values(components)
 
+    @bothmethod
+    def lazy(self_or_cls, filename, entry=None, **params):
+        """
+        Returns a LazyHoloMap over the frames of a HoloMap entry of a
+        version 2 archive, which are loaded from the archive when they
+        are accessed. The entry may be omitted if the archive holds a
+        single HoloMap. Any params are passed to the LazyHoloMap.
+        """
+        index = self_or_cls.index(filename)
+        if entry is None and len(index) == 1:
+            entry = list(index)[0]
+        elif entry not in index:
+            raise KeyError("Entry %r is not an indexed HoloMap" % entry)
+        with zipfile.ZipFile(filename, 'r') as f:
+            skeleton = self_or_cls._loads(f, filename, entry)
+        frames = ArchiveFrames(filename, entry, index[entry], self_or_cls.mmap)
+        settings = dict(skeleton.get_param_values(), **params)
+        return LazyHoloMap(frames, keys=index[entry], **settings)
+
+    @bothmethod
+    def index(self_or_cls, filename):
+        """
+        Returns a dictionary of the keys of the frames of each HoloMap
+        entry of a version 2 archive.
+        """
+        try:
+            return self_or_cls._load_metadata(filename, 'index')
+        except KeyError:
+            return {}
+
+    @bothmethod
+    def _load_frame(self_or_cls, archive, filename, entry, position):
+        name = '%s/%s/%d' % (_FRAME_DIR, entry, position)
+        return self_or_cls._loads(archive, filename, name)
+
+    @bothmethod
+    def _loads(self_or_cls, archive, filename, entry):
+        "Unpickles an entry, resolving any arrays stored out-of-band."
+        def persistent_load(name):
+            return _read_array(archive, filename, name, self_or_cls.mmap)
+        return Store.loads(archive.read(entry), persistent_load=persistent_load)
+
     @bothmethod
     def _load_metadata(self_or_cls, filename, name):
         with zipfile.ZipFile(filename, 'r') as f:
             if 'metadata' not in f.namelist():
                 raise Exception("No metadata available")
-            metadata = pickle.loads(f.read('metadata'))
+            metadata = _read_metadata(f)
             if name not in metadata:
                 raise KeyError("Entry %s is missing from the metadata" % name)
             return metadata[name]
@@ -395,7 +681,339 @@ class Unpickler(Importer):
     @bothmethod
     def entries(self_or_cls, filename):
         with zipfile.ZipFile(filename, 'r') as f:
-            return [el for el in f.namelist() if el != 'metadata']
+            return [el for el in unique_iterator(f.namelist()) if el != 'metadata'
+                    and not el.startswith((_ARRAY_DIR + '/', _FRAME_DIR + '/',
+                                           _APPEND_DIR + '/'))]
+
+
+
+class ArchiveFrames(object):
+    """
+    Callable loading the frame of a HoloMap entry of a version 2 .hvz
+    archive given its key values, used to back a LazyHoloMap. The
+    archive is opened for each frame that is loaded.
+    """
+
+    def __init__(self, filename, entry, keys, mmap=True):
+        self.filename = filename
+        self.entry = entry
+        self.positions = {k: i for i, k in enumerate(keys)}
+        self.mmap = mmap
+
+    def __call__(self, *key):
+        with zipfile.ZipFile(self.filename, 'r') as f:
+            return Unpickler.instance(mmap=self.mmap)._load_frame(
+                f, self.filename, self.entry, self.positions[key])
+
+
+
+def _import_h5py():
+    try:
+        import h5py
+    except ImportError:
+        raise ImportError("The HDF5 exporter and importer require h5py.")
+    return h5py
+
+
+def _bytes_dataset(group, name, data):
+    "Stores a byte string (e.g. a pickle) as a uint8 dataset."
+    group.create_dataset(name, data=np.frombuffer(data, dtype=np.uint8))
+
+
+class HDF5Exporter(Exporter):
+    """
+    Exporter storing HoloViews objects in an HDF5 file using h5py.
+    Each component of a Layout is stored in a group, in which the
+    frames of a HoloMap are stored in separate groups, indexed by an
+    index table holding the key values of each frame. The array data
+    of the frames is stored in chunked, compressed datasets, so that
+    selected frames and regions of Image data may be read without
+    loading the whole file.
+
+    The remaining state of each object is pickled, including its
+    dimensions and any customized options. The names and units of
+    the dimensions are also stored as attributes of the groups.
+    """
+
+    compression = param.ObjectSelector(default='gzip', objects=['gzip', 'lzf', None], doc="""
+        The compression filter applied to the datasets.""")
+
+    compression_opts = param.Integer(default=4, allow_None=True, doc="""
+        The compression level of the gzip filter.""")
+
+    protocol = param.Integer(default=2, doc="""
+        The pickling protocol used for the state of the objects.""")
+
+    array_nbytes = param.Integer(default=1024, bounds=(0, None), doc="""
+        The minimum size in bytes of the arrays stored as datasets,
+        smaller arrays are pickled.""")
+
+    mime_type = 'application/x-hdf5'
+    file_ext = 'h5'
+
+    def __call__(self, obj, key={}, info={}, **kwargs):
+        buff = BytesIO()
+        self.save(obj, buff, key=key, info=info, **kwargs)
+        return buff.getvalue(), {'file-ext': self.file_ext, 'mime_type':self.mime_type}
+
+    @bothmethod
+    def save(self_or_cls, obj, filename, key={}, info={}, **kwargs):
+        if kwargs:
+            self_or_cls = self_or_cls.instance(**kwargs)
+        h5py = _import_h5py()
+        base_info = {'file-ext': self_or_cls.file_ext, 'mime_type':self_or_cls.mime_type}
+        key = self_or_cls._merge_metadata(obj, self_or_cls.key_fn, key)
+        info = self_or_cls._merge_metadata(obj, self_or_cls.info_fn, info, base_info)
+        filename = self_or_cls._filename(filename) if isinstance(filename, str) else filename
+        with h5py.File(filename, 'w') as f:
+            f.attrs['format'] = 'holoviews'
+            f.attrs['version'] = 1
+            components = Pickler._components(obj)
+            f.attrs['entries'] = [entry for entry, _ in components]
+            for entry, component in components:
+                self_or_cls._write_component(f.create_group(entry), component)
+            _bytes_dataset(f, 'metadata', pickle.dumps({'info':info, 'key':key}))
+
+    @bothmethod
+    def _write_component(self_or_cls, group, component):
+        holomap = isinstance(component, HoloMap)
+        items = list(component.data.items()) if holomap else [((), component)]
+        group.attrs['type'] = type(component).__name__
+        group.attrs['holomap'] = holomap
+        if holomap:
+            dims = component.key_dimensions
+            group.attrs['key_dimensions'] = [d.name for d in dims]
+            group.attrs['key_units'] = [d.unit or '' for d in dims]
+            component = component.clone([])
+
+        keys = [k for k, _ in items]
+        index = group.create_group('index')
+        _bytes_dataset(index, 'keys', pickle.dumps(keys, protocol=self_or_cls.protocol))
+        for i in range(len(keys[0]) if keys else 0):
+            values = [k[i] for k in keys]
+            if all(isinstance(v, numbers.Number) for v in values):
+                column = index.create_dataset(str(i), data=np.array(values))
+                column.attrs['dimension'] = group.attrs['key_dimensions'][i]
+
+        frames = group.create_group('frames')
+        for i, (_, frame) in enumerate(items):
+            self_or_cls._write_frame(frames.create_group(str(i)), frame)
+        _bytes_dataset(group, 'skeleton', Store.dumps(component, protocol=self_or_cls.protocol))
+
+    @bothmethod
+    def _write_frame(self_or_cls, group, frame):
+        """
+        Writes the arrays of a frame to datasets and pickles the frame
+        referring to the datasets by name.
+        """
+        from ..element.raster import Image
+        images = set(id(el.data) for el in frame.traverse(lambda x: x, [Image]))
+        group.attrs['value_dimensions'] = [d.name for d in getattr(frame, 'value_dimensions', [])]
+        arrays = OrderedDict()
+        def persistent_id(obj):
+            if (type(obj) not in (np.ndarray, np.memmap) or obj.dtype.kind not in 'biufc'
+                or obj.nbytes < self_or_cls.array_nbytes):
+                return None
+            if id(obj) not in arrays:
+                name = str(len(arrays))
+                compressed = obj.ndim > 0 and obj.size > 0
+                dataset = group.create_dataset(
+                    name, data=obj, chunks=True if compressed else None,
+                    compression=self_or_cls.compression if compressed else None,
+                    compression_opts=(self_or_cls.compression_opts if compressed and
+                                      self_or_cls.compression == 'gzip' else None))
+                dataset.attrs['image'] = id(obj) in images
+                arrays[id(obj)] = (name, obj)
+            return arrays[id(obj)][0]
+        _bytes_dataset(group, 'pickle', Store.dumps(frame, protocol=self_or_cls.protocol,
+                                                    persistent_id=persistent_id))
+
+
+
+class HDF5Importer(Importer):
+    """
+    The inverse of HDF5Exporter, loading HoloViews objects from HDF5
+    files. The frames of HoloMaps may be selected by their keys and
+    Image data may be restricted to a region in sheet coordinates, in
+    which case only the selected frames and the chunks of the Image
+    datasets overlapping the region are read from the file.
+    Alternatively, the lazy method returns a LazyHoloMap whose frames
+    are read on access, with Image data backed by the HDF5 datasets.
+    """
+
+    def __call__(self, data, entries=None, keys=None, region=None):
+        return self.load(BytesIO(data), entries=entries, keys=keys, region=region)
+
+    @bothmethod
+    def load(self_or_cls, filename, entries=None, keys=None, region=None):
+        """
+        Loads the selected entries of the file, or all of them if no
+        entries are supplied. The keys may select the frames of the
+        HoloMaps, either as a list of keys, a slice over the values of
+        the first key dimension or a dictionary of (lower, upper)
+        ranges of the values of the key dimensions. The region may
+        be supplied as a (left, bottom, right, top) tuple to select
+        the region of any Image data in sheet coordinates.
+        """
+        h5py = _import_h5py()
+        components = []
+        with h5py.File(filename, 'r') as f:
+            entries = entries if entries else self_or_cls._entries(f)
+            for entry in entries:
+                if entry not in f:
+                    raise Exception("Entry %s not available" % entry)
+                group = f[entry]
+                stored = self_or_cls._keys(group)
+                selected = (self_or_cls._select(group, stored, keys)
+                            if group.attrs['holomap'] else [0])
+                frames = [(stored[i], self_or_cls._load_frame(group, i, region))
+                          for i in selected]
+                if group.attrs['holomap']:
+                    skeleton = Store.loads(group['skeleton'][()].tobytes())
+                    components.append(skeleton.clone(frames))
+                else:
+                    components.append(frames[0][1])
+
+        if len(components) == 1 and not entries[0].endswith('(L)'):
+            return components[0]
+        return Layout.from_values(components)
+
+    @bothmethod
+    def lazy(self_or_cls, filename, entry=None, **params):
+        """
+        Returns a LazyHoloMap over the frames of a HoloMap entry, which
+        are read from the file when they are accessed. The entry may
+        be omitted if the file holds a single HoloMap. Any params are
+        passed to the LazyHoloMap.
+        """
+        h5py = _import_h5py()
+        with h5py.File(filename, 'r') as f:
+            entries = [e for e in self_or_cls._entries(f) if f[e].attrs['holomap']]
+            if entry is None and len(entries) == 1:
+                entry = entries[0]
+            elif entry not in entries:
+                raise KeyError("Entry %r is not a HoloMap" % entry)
+            skeleton = Store.loads(f[entry]['skeleton'][()].tobytes())
+            keys = self_or_cls._keys(f[entry])
+        settings = dict(skeleton.get_param_values(), **params)
+        return LazyHoloMap(HDF5Frames(filename, entry, keys), keys=keys, **settings)
+
+    @staticmethod
+    def _entries(f):
+        "Returns the entries of an open file in the order they were saved."
+        return [str(e) for e in f.attrs['entries']]
+
+    @staticmethod
+    def _keys(group):
+        return pickle.loads(group['index']['keys'][()].tobytes())
+
+    @staticmethod
+    def _select(group, keys, selection):
+        """
+        Returns the positions of the frames matching the selection.
+        Ranges over numeric key dimensions are evaluated on the index
+        datasets holding their values.
+        """
+        if not isinstance(selection, dict):
+            return _select_keys(keys, selection)
+        dims = list(group.attrs['key_dimensions'])
+        mask = np.ones(len(keys), dtype=bool)
+        for d, (lower, upper) in selection.items():
+            i = dims.index(d)
+            if str(i) in group['index']:
+                values = group['index'][str(i)][()]
+            else:
+                values = np.array([k[i] for k in keys], dtype=object)
+            if lower is not None:
+                mask &= np.asarray(values >= lower, dtype=bool)
+            if upper is not None:
+                mask &= np.asarray(values < upper, dtype=bool)
+        return list(np.flatnonzero(mask))
+
+    @staticmethod
+    def _load_frame(group, position, region=None, lazy=False):
+        """
+        Loads a frame, reading its Image data only within the region if
+        supplied. If lazy is True, Image data is backed by the datasets.
+        """
+        from ..element.raster import Image
+        frame_group = group['frames'][str(position)]
+        def persistent_load(name):
+            dataset = frame_group[name]
+            if dataset.attrs['image'] and (lazy or region is not None):
+                return dataset
+            return dataset[()]
+        frame = Store.loads(frame_group['pickle'][()].tobytes(),
+                            persistent_load=persistent_load)
+        if region is not None:
+            l, b, r, t = region
+            frame = frame.map(lambda x: x[l:r, b:t], [Image])
+        return frame
+
+    @bothmethod
+    def _load_metadata(self_or_cls, filename, name):
+        h5py = _import_h5py()
+        with h5py.File(filename, 'r') as f:
+            if 'metadata' not in f:
+                raise Exception("No metadata available")
+            metadata = pickle.loads(f['metadata'][()].tobytes())
+        if name not in metadata:
+            raise KeyError("Entry %s is missing from the metadata" % name)
+        return metadata[name]
+
+    @bothmethod
+    def key(self_or_cls, filename):
+        return self_or_cls._load_metadata(filename, 'key')
+
+    @bothmethod
+    def info(self_or_cls, filename):
+        return self_or_cls._load_metadata(filename, 'info')
+
+    @bothmethod
+    def entries(self_or_cls, filename):
+        h5py = _import_h5py()
+        with h5py.File(filename, 'r') as f:
+            return self_or_cls._entries(f)
+
+    @bothmethod
+    def index(self_or_cls, filename):
+        "Returns a dictionary of the keys of the frames of each HoloMap entry."
+        h5py = _import_h5py()
+        with h5py.File(filename, 'r') as f:
+            return {e: self_or_cls._keys(f[e]) for e in self_or_cls._entries(f)
+                    if f[e].attrs['holomap']}
+
+
+
+class HDF5Frames(object):
+    """
+    Callable loading the frame of a HoloMap entry of an HDF5 file given
+    its key values, used to back a LazyHoloMap. The file is opened on
+    the first access and shared by all frames, whose Image data is
+    backed by its datasets until the file is closed.
+    """
+
+    def __init__(self, filename, entry, keys):
+        self.filename = filename
+        self.entry = entry
+        self.positions = {k: i for i, k in enumerate(keys)}
+        self._file = None
+
+    def __call__(self, *key):
+        if self._file is None:
+            self._file = _import_h5py().File(self.filename, 'r')
+        return HDF5Importer._load_frame(self._file[self.entry], self.positions[key], lazy=True)
+
+    def close(self):
+        "Closes the file, after which loaded frames may not be accessed."
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_file'] = None
+        return state
 
 
 
@@ -428,6 +1046,42 @@ class Archive(param.Parameterized):
 
 
 
+class StagedFile(object):
+    """
+    The data of a FileArchive entry that has been written to a file
+    in the staging directory, which is read back in chunks on export.
+    """
+
+    def __init__(self, path, chunk_size=2**20):
+        self.path = path
+        self.chunk_size = chunk_size
+
+    def chunks(self):
+        with open(self.path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b''):
+                yield chunk
+
+
+
+class DuplicateEntry(object):
+    """
+    The data of a FileArchive entry with the same content as a
+    previous entry, which is written once and referenced by the
+    duplicate where the archive format allows it.
+    """
+
+    def __init__(self, target, data):
+        self.target = target
+        self.data = data
+
+
+
+def _render(exporter, obj):
+    "Renders an object with an exporter, used by the FileArchive workers."
+    return exporter(obj)
+
+
+
 def simple_name_generator(obj):
     """
     Simple name_generator designed for HoloViews objects.
@@ -450,10 +1104,16 @@ def simple_name_generator(obj):
 
 
 
-class FileArchive(Archive):
+class FileArchive(Parallelizable, Archive):
     """
     A file archive stores files on disk, either unpacked in a
     directory or in an archive format (e.g. a zip file).
+
+    By default each object is rendered by the exporters as it is
+    added. With the 'thread' or 'process' executor, the rendering
+    jobs are submitted to a pool of workers instead, and the archive
+    waits for the results on export or when its contents are listed.
+    The executor has no effect if stream is enabled.
     """
 
     exporters= param.List(default=[Pickler], doc="""
@@ -525,6 +1185,27 @@ class FileArchive(Archive):
        practical maximum for zip and tar file generation, but you may
        wish to use a lower value to avoid long filenames.""")
 
+    stream = param.Boolean(default=False, doc="""
+       Whether the exporters should stream their data. If enabled,
+       the data of each object is only generated upon export and is
+       written to disk in chunks as it is generated, e.g. animations
+       are encoded one frame at a time. Entries in zip and tar
+       archives are still collected in memory before being written.""")
+
+    flush = param.Boolean(default=False, doc="""
+       Whether the data of each entry is written to a staging
+       directory within the root directory as soon as it is added,
+       instead of being held in memory until export. On export, the
+       staged files are moved or packed into the export, so the memory
+       used by the archive stays bounded as entries are added.""")
+
+    deduplicate = param.Boolean(default=False, doc="""
+       Whether entries with identical content are only stored once.
+       Entries are compared by the SHA of their data, and duplicates
+       are written as hard links in directories and tar archives.
+       Zip archives do not support links, so the data is repeated,
+       but duplicates are never held in memory or staged twice.""")
+
 
     ffields = {'type', 'group', 'label', 'obj', 'SHA', 'timestamp', 'dimensions'}
     efields = {'timestamp'}
@@ -543,6 +1224,10 @@ class FileArchive(Archive):
         super(FileArchive, self).__init__(**params)
         #  Items with key: (basename,ext) and value: (data, info)
         self._files = OrderedDict()
+        self._staging, self._staged = None, 0
+        # Rendering jobs submitted to the pool and SHAs of the entries
+        self._pool, self._pending = None, []
+        self._digests = {}
         self._validate_formatters()
 
 
@@ -602,9 +1287,17 @@ class FileArchive(Archive):
         self._validate_formatters()
 
         entries = []
+        if data is None and self.executor != 'serial' and not self.stream:
+            for exporter in self.exporters:
+                job = self._submit(exporter, obj)
+                self._pending.append((obj, filename, info, job))
+            return
+
+        # Entries rendered in the pool precede the new entries
+        self._collect()
         if data is None:
             for exporter in self.exporters:
-                rendered = exporter(obj)
+                rendered = exporter.stream(obj) if self.stream else exporter(obj)
                 if rendered is None: continue
                 (data, new_info) = rendered
                 info = dict(info, **new_info)
@@ -616,11 +1309,73 @@ class FileArchive(Archive):
             self._add_content(obj, data, info, filename=filename)
 
 
+    def _submit(self, exporter, obj):
+        "Submits a rendering job to the pool of workers."
+        if self._pool is None:
+            import multiprocessing
+            from multiprocessing.pool import ThreadPool
+            workers = self.workers or multiprocessing.cpu_count()
+            pool_type = ThreadPool if self.executor == 'thread' else multiprocessing.Pool
+            self._pool = pool_type(workers)
+        return self._pool.apply_async(_render, (exporter, obj))
+
+
+    def _collect(self):
+        """
+        Waits for the pending rendering jobs and adds their results to
+        the archive in the order the objects were added.
+        """
+        if self._pool is None:
+            return
+        try:
+            for (obj, filename, info, job) in self._pending:
+                rendered = job.get(self.timeout)
+                if rendered is None: continue
+                (data, new_info) = rendered
+                self._add_content(obj, data, dict(info, **new_info), filename=filename)
+            self._pool.close()
+        finally:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool, self._pending = None, []
+
+
     def _add_content(self, obj, data, info, filename=None):
         (unique_key, ext) = self._compute_filename(obj, info, filename=filename)
+        if self.deduplicate and not _is_stream(data):
+            digest = self._digest(data, info)
+            if digest in self._digests:
+                target = self._digests[digest]
+                data = DuplicateEntry(target, self._files[target][0])
+            else:
+                self._digests[digest] = (unique_key, ext)
+        if self.flush and not isinstance(data, DuplicateEntry):
+            data = self._stage((data, info))
         self._files[(unique_key, ext)] = (data, info)
 
 
+    @staticmethod
+    def _digest(data, info):
+        """
+        Returns the SHA of the unencoded data of an entry together with
+        its mime type, which determines how the data is encoded.
+        """
+        hashfn = sha256(info.get('mime_type', '').encode('utf-8') + b'\0')
+        hashfn.update(data if isinstance(data, bytes) else data.encode('utf-8'))
+        return hashfn.hexdigest()
+
+
+    def _stage(self, entry):
+        "Writes an entry to the staging directory."
+        if self._staging is None:
+            self._staging = tempfile.mkdtemp(prefix='.staging-',
+                                             dir=os.path.abspath(self.root))
+        path = os.path.join(self._staging, str(self._staged))
+        self._staged += 1
+        self._write(path, entry)
+        return StagedFile(path)
+
+
     def _compute_filename(self, obj, info, filename=None):
         if filename is None:
             hashfn = sha256()
@@ -646,20 +1401,74 @@ class FileArchive(Archive):
                                               self._files.keys(), force=True)
         return (unique_key, ext)
 
+    @staticmethod
+    def _encode_chunks(entry):
+        """
+        Returns an iterator over the encoded chunks of an entry, which
+        holds either the data or a stream of chunks of data.
+        """
+        (data, info) = entry
+        if isinstance(data, DuplicateEntry):
+            data = data.data
+        if isinstance(data, StagedFile):
+            return data.chunks()
+        chunks = data if _is_stream(data) else [data]
+        return (Exporter.encode((chunk, info)) for chunk in chunks)
+
+    def _encode(self, entry):
+        "Returns the encoded data of an entry, joining any stream."
+        chunks = list(self._encode_chunks(entry))
+        return chunks[0] if len(chunks) == 1 else b''.join(chunks)
+
+    def _write(self, fpath, entry):
+        """
+        Writes an entry to file, one chunk at a time. Duplicates of a
+        previous entry are linked to the file written for it, which
+        is in the same directory.
+        """
+        if isinstance(entry[0], DuplicateEntry):
+            target = os.path.join(os.path.dirname(fpath),
+                                  self._truncate_name(*entry[0].target))
+            try:
+                os.link(target, fpath)
+            except (AttributeError, OSError):
+                shutil.copyfile(target, fpath)
+            return
+        elif isinstance(entry[0], StagedFile):
+            shutil.move(entry[0].path, fpath)
+            return
+        with open(fpath, 'wb') as f:
+            for chunk in self._encode_chunks(entry):
+                f.write(chunk)
+
     def _zip_archive(self, export_name, files, root):
         archname = '.'.join(self._unique_name(export_name, 'zip', root))
         with zipfile.ZipFile(os.path.join(root, archname), 'w') as zipf:
             for (basename, ext), entry in files:
                 filename = self._truncate_name(basename, ext)
-                zipf.writestr(('%s/%s' % (export_name, filename)),Exporter.encode(entry))
+                if isinstance(entry[0], DuplicateEntry):
+                    entry = (entry[0].data, entry[1])
+                if isinstance(entry[0], StagedFile):
+                    zipf.write(entry[0].path, '%s/%s' % (export_name, filename))
+                else:
+                    zipf.writestr(('%s/%s' % (export_name, filename)), self._encode(entry))
 
     def _tar_archive(self, export_name, files, root):
         archname = '.'.join(self._unique_name(export_name, 'tar', root))
         with tarfile.TarFile(os.path.join(root, archname), 'w') as tarf:
             for (basename, ext), entry in files:
                 filename = self._truncate_name(basename, ext)
+                if isinstance(entry[0], StagedFile):
+                    tarf.add(entry[0].path, '%s/%s' % (export_name, filename))
+                    continue
                 tarinfo = tarfile.TarInfo('%s/%s' % (export_name, filename))
-                filedata = Exporter.encode(entry)
+                if isinstance(entry[0], DuplicateEntry):
+                    tarinfo.type = tarfile.LNKTYPE
+                    tarinfo.linkname = '%s/%s' % (export_name,
+                                                  self._truncate_name(*entry[0].target))
+                    tarf.addfile(tarinfo)
+                    continue
+                filedata = self._encode(entry)
                 tarinfo.size = len(filedata)
                 tarf.addfile(tarinfo, BytesIO(filedata))
 
@@ -670,8 +1479,7 @@ class FileArchive(Archive):
         (unique_name, ext) = self._unique_name(full_fname, ext, root)
         filename = self._truncate_name(self._normalize_name(unique_name), ext=ext)
         fpath = os.path.join(root, filename)
-        with open(fpath, 'wb') as f:
-            f.write(Exporter.encode(entry))
+        self._write(fpath, entry)
 
     def _directory_archive(self, export_name, files, root):
         output_dir = os.path.join(root, self._unique_name(export_name,'', root)[0])
@@ -683,8 +1491,7 @@ class FileArchive(Archive):
             (data, info) = entry
             filename = self._truncate_name(basename, ext)
             fpath = os.path.join(output_dir, filename)
-            with open(fpath, 'wb') as f:
-                f.write(Exporter.encode(entry))
+            self._write(fpath, entry)
 
 
     def _unique_name(self, basename, ext, existing, force=False):
@@ -736,9 +1543,10 @@ class FileArchive(Archive):
         tval = tuple(time.localtime()) if timestamp is None else timestamp
         tstamp = time.strftime(self.timestamp_format, tval)
 
+        self._collect()
         info = dict(info, timestamp=tstamp)
         export_name = self._format(self.export_name, info)
-        files = [((self._format(base, info), ext), val)
+        files = [((self._format(base, info), ext), self._format_entry(val, info))
                  for ((base, ext), val) in self._files.items()]
         root = os.path.abspath(self.root)
         # Make directory and populate if multiple files and not packed
@@ -750,7 +1558,18 @@ class FileArchive(Archive):
             self._zip_archive(export_name, files, root)
         elif self.archive_format == 'tar':
             self._tar_archive(export_name, files, root)
-        self._files = OrderedDict()
+        self._files, self._digests = OrderedDict(), {}
+        if self._staging is not None:
+            shutil.rmtree(self._staging, ignore_errors=True)
+            self._staging, self._staged = None, 0
+
+    def _format_entry(self, entry, info):
+        "Formats the name of the entry referenced by a duplicate entry."
+        (data, entry_info) = entry
+        if isinstance(data, DuplicateEntry):
+            (base, ext) = data.target
+            data = DuplicateEntry((self._format(base, info), ext), data.data)
+        return (data, entry_info)
 
     def _format(self, formatter, info):
         filtered = {k:v for k,v in info.items()
@@ -758,8 +1577,13 @@ class FileArchive(Archive):
         return formatter.format(**filtered)
 
     def __len__(self):
-        "The number of files currently specified in the archive"
-        return len(self._files)
+        """
+        The number of files currently specified in the archive,
+        counting objects still being rendered by the executor once
+        per exporter. Parameters may be validated before __init__ has
+        set up the archive, in which case the archive is empty.
+        """
+        return len(getattr(self, '_files', ())) + len(getattr(self, '_pending', ()))
 
     def __repr__(self):
         return self.pprint()
@@ -767,6 +1591,7 @@ class FileArchive(Archive):
     def contents(self, maxlen=70):
         "Print the current (unexported) contents of the archive"
         lines = []
+        self._collect()
         if len(self._files) == 0:
             print("Empty %s" % self.__class__.__name__)
             return
@@ -780,4 +1605,5 @@ class FileArchive(Archive):
 
     def listing(self):
         "Return a list of filename entries currently in the archive"
+        self._collect()
         return ['.'.join([f,ext]) if ext else f for (f,ext) in self._files.keys()]
@@ -4,14 +4,15 @@ map types. The former class only allows indexing whereas the latter
 also enables slicing over multiple dimension ranges.
 """
 
-from operator import itemgetter
+from bisect import bisect_right
 import numpy as np
 
 import param
 
 from . import traversal
 from .dimension import OrderedDict, Dimension, Dimensioned, ViewableElement
-from .util import unique_iterator, sanitize_identifier, dimension_sort
+from .util import (unique_iterator, sanitize_identifier, dimension_sort,
+                   dimension_sort_key, is_number, factorize, group_indices)
 
 
 class item_check(object):
@@ -70,6 +71,22 @@ class MultiDimensionalMapping(Dimensioned):
     _sorted = True
     _check_items = True
 
+    # Sorted index of the keys in data and the function generating it
+    _key_index = None
+    _key_fn = None
+
+    # Keys in sorted order, parallel to the sorted index, and whether
+    # data still has to be reordered to match them
+    _key_order = None
+    _reorder = False
+
+    # Columnar store of the keys in data, holding one column per dimension
+    _cached_columns = None
+
+    # Counter incremented whenever items are added, replaced or removed,
+    # invalidating any caches derived from the data
+    _modified = 0
+
     def __init__(self, initial_items=None, **params):
         if isinstance(initial_items, NdMapping):
             map_type = type(initial_items)
@@ -101,6 +118,26 @@ class MultiDimensionalMapping(Dimensioned):
         self._instantiated = True
 
 
+    @property
+    def data(self):
+        """
+        The OrderedDict of items, reordered to match the sorted keys on
+        first access after any out-of-order insertions.
+        """
+        data = self.__dict__['data']
+        if self._reorder:
+            data = OrderedDict((k, data[k]) for k in self._key_order)
+            self.__dict__['data'] = data
+            self._reorder = False
+        return data
+
+
+    @data.setter
+    def data(self, data):
+        self.__dict__['data'] = data
+        self._key_index, self._key_order, self._reorder = None, None, False
+
+
     def _item_check(self, dim_vals, data):
         """
         Applies optional checks to individual data elements before
@@ -146,19 +183,24 @@ class MultiDimensionalMapping(Dimensioned):
             if not self._instantiated and self.get_dimension(dim).values == 'initial':
                 if val not in vals:
                     self._cached_index_values[dim].append(val)
+                    self._key_fn = None
             elif vals and val not in vals:
                 raise KeyError('%s Dimension value %s not in'
                                ' specified Dimension values.' % (dim, repr(val)))
 
-        # Updates nested data structures rather than simply overriding them.
-        if ((dim_vals in self.data)
-            and isinstance(self.data[dim_vals], (NdMapping, OrderedDict))):
-            self.data[dim_vals].update(data)
+        self._modified += 1
+        # Updates nested data structures rather than simply overriding
+        # them, accessing the items without forcing a pending reorder.
+        items = self.__dict__['data']
+        if dim_vals in items:
+            if isinstance(items[dim_vals], (NdMapping, OrderedDict)):
+                items[dim_vals].update(data)
+            else:
+                items[dim_vals] = data
         else:
-            self.data[dim_vals] = data
-
-        if sort:
-            self._resort()
+            items[dim_vals] = data
+            if sort:
+                self._insert_key(dim_vals)
 
 
     def _apply_key_type(self, keys):
@@ -214,11 +256,109 @@ class MultiDimensionalMapping(Dimensioned):
         return data
 
 
+    def _sort_key(self, key):
+        "Maps a key onto the value used to sort it."
+        if self._key_fn is None:
+            self._key_fn = dimension_sort_key(self.key_dimensions,
+                                              self._cached_categorical,
+                                              self._cached_index_values)
+        return self._key_fn(key)
+
+
     def _resort(self):
-        resorted = dimension_sort(self.data, self.key_dimensions,
-                                  self._cached_categorical,
-                                  self._cached_index_values)
-        self.data = OrderedDict(resorted)
+        """
+        Sorts the data by key and rebuilds the sorted key index. The
+        sort is skipped entirely if the keys are already in order.
+        """
+        try:
+            index = [self._sort_key(k) for k in self.data]
+            if any(b < a for a, b in zip(index[:-1], index[1:])):
+                order = sorted(range(len(index)), key=index.__getitem__)
+                items = list(self.data.items())
+                self.data = OrderedDict(items[i] for i in order)
+                index = [index[i] for i in order]
+        except (TypeError, KeyError):
+            # Keys not comparable or not hashable, fall back to full sort
+            self._key_fn, index = None, None
+            resorted = dimension_sort(self.data, self.key_dimensions,
+                                      self._cached_categorical,
+                                      self._cached_index_values)
+            self.data = OrderedDict(resorted)
+        self._key_index = index
+        self._key_order = None if index is None else list(self.data.keys())
+
+
+    def _insert_key(self, key):
+        """
+        Inserts a key that was just appended to the data into the
+        sorted key index, bisecting for its position. Keys arriving out
+        of order only mark the data to be reordered, which happens once
+        on the next access to data rather than on every insertion.
+        """
+        index, items = self._key_index, self.__dict__['data']
+        if index is None or len(index) != len(items)-1:
+            self._resort()
+            return
+        try:
+            sort_key = self._sort_key(key)
+            if not index or not sort_key < index[-1]:
+                index.append(sort_key)
+                self._key_order.append(key)
+                return
+            pos = bisect_right(index, sort_key)
+        except (TypeError, KeyError):
+            self._resort()
+            return
+        index.insert(pos, sort_key)
+        self._key_order.insert(pos, key)
+        self._reorder = True
+
+
+    def __getstate__(self):
+        """
+        Drops the sorted key index when pickling, it is rebuilt
+        on demand after unpickling.
+        """
+        obj_dict = super(MultiDimensionalMapping, self).__getstate__()
+        obj_dict['data'] = self.data
+        obj_dict.pop('_key_index', None)
+        obj_dict.pop('_key_order', None)
+        obj_dict.pop('_reorder', None)
+        obj_dict.pop('_key_fn', None)
+        obj_dict.pop('_cached_columns', None)
+        return obj_dict
+
+
+    def _key_columns(self):
+        """
+        Returns the keys as a list of columns, one per key dimension.
+        Values along categorical dimensions are replaced by their
+        position in the Dimension values. Columns of numeric values
+        are returned as arrays, all other columns as lists. The
+        columns are cached until the keys are modified.
+        """
+        cached = self._cached_columns
+        if cached is not None and cached[0] is self.data and cached[1] == len(self.data):
+            return cached[2]
+
+        keys = list(self.data.keys())
+        columns = []
+        for idx, dim in enumerate(self.key_dimensions):
+            column = [k[idx] for k in keys]
+            values = self._cached_index_values.get(dim.name, None)
+            if values:
+                lookup = dict((v, i) for i, v in reversed(list(enumerate(values))))
+                column = [lookup[v] if v in lookup else values.index(v)
+                          for v in column]
+            try:
+                arr = np.array(column)
+            except ValueError:
+                arr = None
+            if arr is not None and arr.ndim == 1 and arr.dtype.kind in 'biuf':
+                column = arr
+            columns.append(column)
+        self._cached_columns = (self.data, len(self.data), columns)
+        return columns
 
 
     def clone(self, data=None, shared_data=True, *args, **overrides):
@@ -245,13 +385,24 @@ class MultiDimensionalMapping(Dimensioned):
         group_type = group_type if group_type else type(self)
         dims, inds = zip(*((self.get_dimension(dim), self.get_dimension_index(dim))
                          for dim in dimensions))
-        inames, idims = zip(*((dim.name, dim) for dim in self.key_dimensions
-                              if not dim.name in dimensions))
-        selects = unique_iterator(itemgetter(*inds)(key) if len(inds) > 1 else (key[inds[0]],)
-                                  for key in self.data.keys())
+        idims = [d for d in self.key_dimensions if not d.name in dimensions]
+        rinds = [self.get_dimension_index(d.name) for d in idims]
+
+        # Factorize the key columns of the grouped dimensions, the
+        # items within each group retain their sorted order
+        columns = self._key_columns()
+        codes, first = factorize([columns[i] for i in inds])
+        keys, values = list(self.data.keys()), list(self.data.values())
+
         with item_check(False):
-            groups = [(sel, group_type(self.select(**dict(zip(dimensions, sel))).reindex(inames), **kwargs))
-                      for sel in selects]
+            groups = []
+            for idx, rows in zip(first, group_indices(codes, len(first))):
+                sel = tuple(keys[idx][i] for i in inds)
+                items = [(tuple(keys[r][i] for i in rinds), values[r]) for r in rows]
+                constant_dimensions = dict(zip(dims, sel))
+                group = self.clone(items, key_dimensions=idims,
+                                   constant_dimensions=constant_dimensions)
+                groups.append((sel, group_type(group, **kwargs)))
             return container_type(groups, key_dimensions=dims)
 
 
@@ -452,6 +603,8 @@ class MultiDimensionalMapping(Dimensioned):
     def pop(self, key, default=None):
         "Standard pop semantics for all mapping types"
         if not isinstance(key, tuple): key = (key,)
+        self._key_index, self._cached_columns = None, None
+        self._modified += 1
         return self.data.pop(key, default)
 
 
@@ -521,13 +674,10 @@ class NdMapping(MultiDimensionalMapping):
         if all(not isinstance(el, (slice, set, list, tuple)) for el in map_slice):
             return self._dataslice(self.data[map_slice], data_slice)
         else:
-            conditions = self._generate_conditions(map_slice)
-            items = self.data.items()
-            for cidx, (condition, dim) in enumerate(zip(conditions, self.key_dimensions)):
-                values = self._cached_index_values.get(dim.name, None)
-                items = [(k, v) for k, v in items
-                         if condition(values.index(k[cidx]) if values else k[cidx])]
-            items = [(k, self._dataslice(v, data_slice)) for k, v in items]
+            mask = self._generate_mask(map_slice)
+            items = list(self.data.items())
+            items = [(k, self._dataslice(v, data_slice))
+                     for k, v in (items[i] for i in np.flatnonzero(mask))]
             if len(items) == 0:
                 raise KeyError('No items within specified slice.')
             with item_check(False):
@@ -566,9 +716,40 @@ class NdMapping(MultiDimensionalMapping):
         return indices
 
 
+    def _generate_mask(self, map_slice):
+        """
+        Generates a boolean mask over all keys selecting the keys
+        within the supplied slice. The conditions are applied to whole
+        key columns at once if both the column and the slice are
+        numeric, otherwise they are evaluated for each key value.
+        """
+        conditions = self._generate_conditions(map_slice)
+        columns = self._key_columns()
+        mask = np.ones(len(self.data), dtype=bool)
+        for dim, dim_slice, condition, column in zip(self.key_dimensions, map_slice,
+                                                     conditions, columns):
+            if isinstance(column, np.ndarray) and (dim.values or self._numeric_slice(dim_slice)):
+                mask &= condition(column)
+            else:
+                mask &= np.fromiter((condition(v) for v in column),
+                                    dtype=bool, count=len(column))
+        return mask
+
+
+    def _numeric_slice(self, dim_slice):
+        "Whether the supplied slice only contains numeric bounds or values."
+        if isinstance(dim_slice, slice):
+            return all(v is None or is_number(v) for v in (dim_slice.start, dim_slice.stop))
+        elif isinstance(dim_slice, set):
+            return all(is_number(v) for v in dim_slice)
+        return dim_slice is Ellipsis or is_number(dim_slice)
+
+
     def _generate_conditions(self, map_slice):
         """
-        Generates filter conditions used for slicing the data structure.
+        Generates filter conditions used for slicing the data
+        structure. The conditions may be applied to a single key value
+        or to an array of key values.
         """
         conditions = []
         for dim, dim_slice in zip(self.key_dimensions, map_slice):
@@ -607,15 +788,16 @@ class NdMapping(MultiDimensionalMapping):
 
 
     def _values_condition(self, values):
-        return lambda x: x in values
+        return lambda x: (np.in1d(x, list(values)) if isinstance(x, np.ndarray)
+                          else x in values)
 
 
     def _range_condition(self, slice):
         if slice.step is None:
-            lmbd = lambda x: slice.start <= x < slice.stop
+            lmbd = lambda x: (slice.start <= x) & (x < slice.stop)
         else:
-            lmbd = lambda x: slice.start <= x < slice.stop and not (
-                (x-slice.start) % slice.step)
+            lmbd = lambda x: ((slice.start <= x) & (x < slice.stop) &
+                              ((x-slice.start) % slice.step == 0))
         return lmbd
 
 
@@ -623,7 +805,7 @@ class NdMapping(MultiDimensionalMapping):
         if slice.step is None:
             lmbd = lambda x: x < slice.stop
         else:
-            lmbd = lambda x: x < slice.stop and not (x % slice.step)
+            lmbd = lambda x: (x < slice.stop) & (x % slice.step == 0)
         return lmbd
 
 
@@ -631,7 +813,7 @@ class NdMapping(MultiDimensionalMapping):
         if slice.step is None:
             lmbd = lambda x: x > slice.start
         else:
-            lmbd = lambda x: x > slice.start and ((x-slice.start) % slice.step)
+            lmbd = lambda x: (x > slice.start) & ((x-slice.start) % slice.step == 0)
         return lmbd
 
     def _all_condition(self):
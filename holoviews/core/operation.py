@@ -2,7 +2,10 @@
 Operations manipulate Elements, HoloMaps and Layouts, typically for
 the purposes of analysis or visualization.
 """
+import copy
 from functools import reduce
+
+import numpy as np
 import param
 
 from .dimension import ViewableElement
@@ -10,10 +13,76 @@ from .element import Element, HoloMap, GridSpace
 from .layout import Layout
 from .overlay import NdOverlay, Overlay
 from .traversal import unique_dimkeys
+from .util import FrameCache, Parallelizable, deephash, parallel_map
+
+
+
+def _frame_state(element):
+    """
+    Returns the state of an element other than its data values and
+    name, used to find HoloMap frames that only differ in their data.
+    """
+    state = {k: (v.shape, v.dtype.str, v.tobytes()) if isinstance(v, np.ndarray) else v
+             for k, v in element.__dict__.items() if k not in ['data', '_name_param_value']}
+    state['data'] = (element.data.shape, element.data.dtype.str)
+    return state
+
 
+def _replicate(element, data):
+    """
+    Returns a copy of an element holding the supplied data, without
+    instantiating and validating its parameters again. Lists and
+    dictionaries are copied so that they are not shared between the
+    element and the copy.
+    """
+    replica = object.__new__(type(element))
+    replica.__dict__.update((k, copy.copy(v) if isinstance(v, (list, dict)) else v)
+                            for k, v in element.__dict__.items())
+    replica.data = data
+    return replica
 
 
-class Operation(param.ParameterizedFunction):
+def _operation_spec(operation):
+    """
+    Returns the class and parameter values of an operation, from which
+    a copy of the operation is created for each dispatched call.
+    """
+    return (type(operation), operation.get_param_values())
+
+
+def _instantiate(spec, overrides):
+    """
+    Creates a copy of an operation from its class and parameter values
+    with the parameter overrides of the current call, so that calls
+    dispatched to a pool of threads or processes never share their
+    overrides.
+    """
+    (cls, params) = spec
+    operation = cls.instance(**dict(params))
+    operation.p = param.ParamOverrides(operation, overrides)
+    return operation
+
+
+def _dispatch_element(args):
+    "Applies an ElementOperation with the given overrides to an element."
+    (spec, params, key, element) = args
+    return _instantiate(spec, params)._apply(element, key)
+
+
+def _dispatch_tree(args):
+    "Applies a TreeOperation with the given overrides to a Layout."
+    (spec, params, key, tree) = args
+    return _instantiate(spec, params)._process(tree, key)
+
+
+def _dispatch_map(args):
+    "Applies a MapOperation with the given overrides to a HoloMap."
+    (spec, params, holomap) = args
+    return _instantiate(spec, {})(holomap, **params)
+
+
+
+class Operation(Parallelizable, param.ParameterizedFunction):
     """
     Base class for all Operation types.
     """
@@ -84,6 +153,28 @@ class ElementOperation(Operation):
        first component is a Normalization.ranges list and the second
        component is Normalization.keys. """)
 
+    memoize = param.Boolean(default=False, doc="""
+       Whether to memoize the processed elements. Results are cached
+       by the content hash of the input element together with the
+       key and parameter values, so that processing the same element
+       again with the same settings returns the cached result. The
+       results are held in the memo_cache and, if set, in the
+       disk_cache.""")
+
+    # Bounded in-memory cache of memoized results, shared by all
+    # ElementOperations
+    memo_cache = FrameCache(budget=256*1024**2)
+
+    # Optional persistent cache of memoized results (e.g. a FileCache)
+    disk_cache = None
+
+    # Element types whose HoloMap frames the operation can process in
+    # vectorized batches via _process_stack
+    stackable = ()
+
+    # Maximum size in bytes of the data stacked into a single batch
+    stack_nbytes = 2**20
+
 
     def _process(self, view, key=None):
         """
@@ -95,20 +186,105 @@ class ElementOperation(Operation):
         raise NotImplementedError
 
 
+    def _process_stack(self, stack, element):
+        """
+        Processes the data of a number of frames stacked along the
+        first axis of an array, where the frames match the supplied
+        element in everything but their data. Returns the processed
+        data stacked in the same way.
+        """
+        raise NotImplementedError
+
+
     def process_element(self, element, key, **params):
         """
         The process_element method allows a single element to be
         operated on given an externally supplied key.
         """
         self.p = param.ParamOverrides(self, params)
-        return self._process(element, key)
+        return self._apply(element, key)
+
+
+    def _apply(self, element, key=None):
+        """
+        Applies the operation to a single element, looking up and
+        storing the result in the memoization caches if memoize is
+        enabled. Memoized results are returned as clones, so callers
+        do not share the cached object (its data is still shared).
+        """
+        if not self.p.memoize:
+            return self._process(element, key)
+        settings = [(k, self.p[k]) for k in sorted(self.params())
+                    if k not in ['name', 'memoize']]
+        cache_key = deephash((type(self), settings, key, element))
+        caches = [c for c in [self.memo_cache, self.disk_cache] if c is not None]
+        for cache in caches:
+            processed = cache.get(cache_key)
+            if processed is not None:
+                break
+        else:
+            processed = self._process(element, key)
+        for cache in caches:
+            if cache_key not in cache:
+                cache[cache_key] = processed
+        return processed.clone()
+
+
+    def _process_map(self, element):
+        """
+        Processes the items of a HoloMap, returning a list of the
+        processed (key, element) items, dispatching the frames to the
+        configured executor.
+        """
+        if self.p.executor != 'serial':
+            items = element.items()
+            spec = _operation_spec(self)
+            processed = parallel_map(_dispatch_element,
+                                     [(spec, dict(self.p), k, el) for k, el in items],
+                                     self.p.executor, self.p.workers, self.p.timeout)
+            return list(zip([k for k, _ in items], processed))
+        elif not self.stackable or self.p.memoize:
+            return [(k, self._apply(el, key=k)) for k, el in element.items()]
+
+        # Group consecutive frames of stackable types that only differ
+        # in their data into runs
+        runs = []
+        for k, el in element.items():
+            state = None
+            if isinstance(el, self.stackable) and isinstance(el.data, np.ndarray):
+                state = _frame_state(el)
+            if state is not None and runs and runs[-1][0] == state:
+                runs[-1][1].append((k, el))
+            else:
+                runs.append((state, [(k, el)]))
+        return [item for _, items in runs for item in self._process_run(items)]
+
+
+    def _process_run(self, items):
+        """
+        Processes a run of (key, element) items only differing in their
+        data. The first frame is processed as usual, the data of the
+        remaining frames is processed in stacked batches and the frames
+        are replicated from the first processed frame, skipping the
+        cost of instantiating every frame from scratch.
+        """
+        (key, first), rest = items[0], items[1:]
+        template = self._apply(first, key=key)
+        processed = [(key, template)]
+        step = max(1, self.stack_nbytes // max(first.data.nbytes, 1))
+        for i in range(0, len(rest), step):
+            batch = rest[i:i+step]
+            stack = self._process_stack(np.array([el.data for _, el in batch]), first)
+            processed += [(k, _replicate(template, data))
+                          for (k, _), data in zip(batch, stack)]
+        return processed
 
 
     def __call__(self, element, **params):
         self.p = param.ParamOverrides(self, params)
 
         if isinstance(element, ViewableElement):
-            processed = self._process(element)
+            processed = self._apply(element)
         elif isinstance(element, GridSpace):
             # Initialize an empty axis layout
             processed = GridSpace(None, label=element.label)
@@ -116,8 +292,7 @@ class ElementOperation(Operation):
             for pos, cell in element.items():
                 processed[pos] = self(cell, **params)
         elif isinstance(element, HoloMap):
-            mapped_items = [(k, self._process(el, key=k))
-                            for k, el in element.items()]
+            mapped_items = self._process_map(element)
             refval = mapped_items[0][1]
             processed = element.clone(mapped_items,
                                       group=refval.group,
@@ -128,7 +303,7 @@ class ElementOperation(Operation):
 
 
 
-class MapOperation(param.ParameterizedFunction):
+class MapOperation(Parallelizable, param.ParameterizedFunction):
     """
     A MapOperation takes a HoloMap containing elements or overlays and
     processes them at the HoloMap level, returning arbitrary new
@@ -189,13 +364,18 @@ class TreeOperation(Operation):
             dim_names = [d.name for d in dims]
             values = [src.select(**dict(zip(dim_names, key))) for key in keys]
 
-        tree = Layout()
-        for key, el in zip(keys, values):
-            if not isinstance(el, Layout):
-                result = self._process(Layout.from_values(el), key)
-            else:
-                result = self._process(el, key)
+        trees = [el if isinstance(el, Layout) else Layout.from_values(el)
+                 for el in values]
+        if self.p.executor == 'serial':
+            results = [self._process(t, key) for key, t in zip(keys, trees)]
+        else:
+            spec = _operation_spec(self)
+            results = parallel_map(_dispatch_tree,
+                                   [(spec, dict(self.p), key, t) for key, t in zip(keys, trees)],
+                                   self.p.executor, self.p.workers, self.p.timeout)
 
+        tree = Layout()
+        for key, result in zip(keys, results):
             holomaps = [HoloMap([(key,el)], key_dimensions=dims,
                                 group=el.group, label=el.label) for el in result]
             if len(holomaps) == 1:
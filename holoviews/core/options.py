@@ -32,7 +32,10 @@ Store:
    extension together.
 
 """
+from __future__ import absolute_import
+
 import pickle
+from io import BytesIO
 from contextlib import contextmanager
 
 import numpy as np
@@ -721,14 +724,22 @@ class Store(object):
         print(InfoPrinter.info(obj, ansi=ansi))
 
     @classmethod
-    def loads(cls, pickle_string):
+    def loads(cls, pickle_string, persistent_load=None):
         """
         Equivalent to pickle.loads except that the HoloViews trees is
-        restored appropriately.
+        restored appropriately. The optional persistent_load function
+        resolves objects stored out-of-band by Store.dumps.
         """
         cls.load_counter_offset = max(cls.custom_options) if cls.custom_options else 0
-        val = pickle.loads(pickle_string)
-        cls.load_counter_offset = None
+        try:
+            if persistent_load is None:
+                val = pickle.loads(pickle_string)
+            else:
+                unpickler = pickle.Unpickler(BytesIO(pickle_string))
+                unpickler.persistent_load = persistent_load
+                val = unpickler.load()
+        finally:
+            cls.load_counter_offset = None
         return val
 
 
@@ -743,14 +754,25 @@ class Store(object):
         cls.save_option_state = False
 
     @classmethod
-    def dumps(cls, obj, protocol=0):
+    def dumps(cls, obj, protocol=0, persistent_id=None):
         """
         Equivalent to pickle.dumps except that the HoloViews option
-        tree is saved appropriately.
+        tree is saved appropriately. The optional persistent_id
+        function may return an identifier for objects to be stored
+        out-of-band, which are then omitted from the pickle.
         """
         cls.save_option_state = True
-        val = pickle.dumps(obj, protocol=protocol)
-        cls.save_option_state = False
+        try:
+            if persistent_id is None:
+                val = pickle.dumps(obj, protocol=protocol)
+            else:
+                buff = BytesIO()
+                pickler = pickle.Pickler(buff, protocol)
+                pickler.persistent_id = persistent_id
+                pickler.dump(obj)
+                val = buff.getvalue()
+        finally:
+            cls.save_option_state = False
         return val
 
 
@@ -14,14 +14,26 @@ def create_ndkey(length, indexes, values):
         key[i] = v
     return tuple(key)
 
+def holomaps(obj):
+    """
+    Returns all the HoloMaps (including subclasses) contained in the
+    object without traversing the frames of the HoloMaps themselves.
+    """
+    from .element import HoloMap
+    if isinstance(obj, HoloMap):
+        return [obj]
+    elif getattr(obj, '_deep_indexable', False):
+        return [hmap for el in obj for hmap in holomaps(el)]
+    return []
+
+
 def uniform(obj):
     """
     Finds all common dimension keys in the object including subsets of
     dimensions. If there are is no common subset of dimensions, None
     is returned.
     """
-    dim_groups = obj.traverse(lambda x: tuple(x.key_dimensions),
-                              ('HoloMap',))
+    dim_groups = [tuple(hmap.key_dimensions) for hmap in holomaps(obj)]
     if dim_groups:
         dgroups = [[d.name for d in dg] for dg in dim_groups]
         return all(set(g1) <= set(g2) or set(g1) >= set(g2)
@@ -39,8 +51,8 @@ def unique_dimkeys(obj, default_dim='Frame'):
     keys.
     """
     from .ndmapping import NdMapping
-    key_dims = obj.traverse(lambda x: (tuple(x.key_dimensions),
-                                       list(x.data.keys())), ('HoloMap',))
+    key_dims = [(tuple(hmap.key_dimensions), list(hmap.data.keys()))
+                for hmap in holomaps(obj)]
     if not key_dims:
         return [Dimension(default_dim)], [(0,)]
     dim_groups, keys = zip(*sorted(key_dims, key=lambda x: -len(x[0])))
@@ -57,15 +69,23 @@ def unique_dimkeys(obj, default_dim='Frame'):
 
     ndims = len(all_dims)
     unique_keys = []
+    # Index of the unique keys projected onto each set of defined
+    # dimensions, with the undefined (None) dimensions of a padded
+    # key matching any value.
+    indexes = {}
     for group, keys in zip(dim_groups, keys):
         dim_idxs = [all_dims.index(dim) for dim in group]
         for key in keys:
             padded_key = create_ndkey(ndims, dim_idxs, key)
-            matches = [item for item in unique_keys
-                       if padded_key == tuple(k if k is None else i
-                                              for i, k in zip(item, padded_key))]
-            if not matches:
-                unique_keys.append(padded_key)
+            defined = tuple(i for i, k in enumerate(padded_key) if k is not None)
+            if defined not in indexes:
+                indexes[defined] = {tuple(item[i] for i in defined)
+                                    for item in unique_keys}
+            if tuple(padded_key[i] for i in defined) in indexes[defined]:
+                continue
+            unique_keys.append(padded_key)
+            for idxs, index in indexes.items():
+                index.add(tuple(padded_key[i] for i in idxs))
 
     sorted_keys = NdMapping({key: None for key in unique_keys},
                             key_dimensions=all_dims).data.keys()
@@ -81,10 +101,10 @@ def bijective(keys):
         return True
     for idx in range(ndims):
         getter = itemgetter(*(i for i in range(ndims) if i != idx))
-        store = []
+        store = set()
         for key in keys:
             subkey = getter(key)
             if subkey in store:
                 return False
-            store.append(subkey)
+            store.add(subkey)
     return True
@@ -1,9 +1,10 @@
-import sys, warnings
+import os, re, sys, glob, warnings, weakref, hashlib, pickle
 import numbers
+import types
 import itertools
 import string
 import unicodedata
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from itertools import takewhile, count
 
 import numpy as np
@@ -271,6 +272,62 @@ def max_range(ranges):
       return (np.NaN, np.NaN)
 
 
+_chunk_ranges = {}
+
+def _block_rows(data, chunk_size):
+    """
+    Returns the number of rows in each block when processing an array
+    in blocks of rows, following the chunk layout of the data if
+    declared or otherwise holding approximately chunk_size elements.
+    """
+    chunks = getattr(data, 'chunks', None)
+    if isinstance(chunks, tuple) and chunks and isinstance(chunks[0], int):
+        return chunks[0]
+    row_size = int(np.prod(data.shape[1:])) if len(data.shape) > 1 else 1
+    return max(1, chunk_size // max(row_size, 1))
+
+
+def array_range(data, channel=None, chunk_size=2**20):
+    """
+    Computes the (nanmin, nanmax) range of an array or array-like object
+    (e.g. a np.memmap or a chunked dataset) supporting slicing along
+    the first axis. The data is processed in blocks of rows, which
+    follow the chunk layout of the data if declared or otherwise
+    hold approximately chunk_size elements, so that only one block
+    is loaded into memory at a time. Optionally, a channel may be
+    selected along the last axis of three dimensional data.
+
+    The ranges of the blocks of read-only arrays are cached, so the
+    range of an array that cannot change is only computed once.
+    """
+    shape = data.shape
+    step = _block_rows(data, chunk_size)
+
+    flags = getattr(data, 'flags', None)
+    cached = {}
+    if flags is not None and not flags.writeable:
+        key = id(data)
+        if key not in _chunk_ranges:
+            ref = weakref.ref(data, lambda r: _chunk_ranges.pop(key, None))
+            _chunk_ranges[key] = (ref, {})
+        cached = _chunk_ranges[key][1]
+
+    lower, upper = [], []
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', r'All-NaN (slice|axis) encountered')
+        for start in range(0, shape[0], step):
+            if (start, step, channel) not in cached:
+                block = data[start:start+step]
+                block = np.asarray(block if channel is None else block[..., channel])
+                cached[(start, step, channel)] = (np.nanmin(block), np.nanmax(block))
+            (bmin, bmax) = cached[(start, step, channel)]
+            lower.append(bmin)
+            upper.append(bmax)
+        if not lower:
+            return (np.NaN, np.NaN)
+        return (np.nanmin(lower), np.nanmax(upper))
+
+
 def max_extents(extents, zrange=False):
    """
    Computes the maximal extent in 2D and 3D space from
@@ -399,6 +456,237 @@ def dimension_sort(odict, dimensions, categorical, cached_values):
         return sorted(odict.items(), **sortkws)
 
 
+def dimension_sort_key(dimensions, categorical, cached_values):
+    """
+    Returns a function mapping a key onto a tuple, which sorts in the
+    same order as dimension_sort. Values along categorical Dimensions
+    are replaced by their position in the Dimension values, looked up
+    in a dictionary rather than by searching the list of values.
+    """
+    if not categorical:
+        return lambda key: key
+    orderings = [dict((v, i) for i, v in reversed(list(enumerate(cached_values[d.name]))))
+                 if d.values else None for d in dimensions]
+    return lambda key: tuple(v if o is None else o[v]
+                             for o, v in zip(orderings, key))
+
+
+def factorize(columns):
+    """
+    Assigns an integer group code to each row of the supplied key
+    columns, which may be arrays or lists of hashable values. Groups
+    are numbered in order of their first appearance. Returns the
+    group codes along with the index of the first row in each group.
+    """
+    nrows = len(columns[0]) if len(columns) else 0
+    combined = np.zeros(nrows, dtype=np.int64)
+    for column in columns:
+        inverse = None
+        if isinstance(column, np.ndarray):
+            try:
+                _, inverse = np.unique(column, return_inverse=True)
+                ncodes = inverse.max()+1 if nrows else 0
+            except TypeError:
+                pass # Unorderable values, e.g. mixed types on Python 3
+        if inverse is None:
+            lookup = {}
+            inverse = np.array([lookup.setdefault(v, len(lookup)) for v in column],
+                               dtype=np.int64)
+            ncodes = len(lookup)
+        # Compress the combined codes to keep them bounded by nrows
+        _, combined = np.unique(combined*ncodes + inverse, return_inverse=True)
+    _, first, codes = np.unique(combined, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order))
+    return ranks[codes], first[order]
+
+
+def group_indices(codes, ngroups):
+    """
+    Splits the row indices into one array per group given the group
+    codes of each row, preserving the row order within each group.
+    """
+    order = np.argsort(codes, kind='mergesort')
+    bounds = np.cumsum(np.bincount(codes, minlength=ngroups))[:-1]
+    return np.split(order, bounds)
+
+
+def reduce_groups(function, values, codes, ngroups):
+    """
+    Applies a reduce function to the values within each group defined
+    by the group codes. Common numpy reductions over numeric values
+    are computed for all groups at once using bincount or the reduceat
+    method of binary ufuncs, any other function is applied to each
+    group in turn. Sums of integers keep the dtype returned by np.sum.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'biuf' and len(values):
+        counts = np.bincount(codes, minlength=ngroups)
+        if function in [np.sum, np.add] and values.dtype.kind != 'f':
+            values = values.astype(np.sum(values[:0]).dtype)
+            function = np.add
+        elif function in [np.sum, np.add]:
+            return np.bincount(codes, weights=values, minlength=ngroups)
+        elif function in [np.mean, np.average]:
+            return np.bincount(codes, weights=values, minlength=ngroups)/counts
+        elif function in [np.var, np.std]:
+            means = np.bincount(codes, weights=values, minlength=ngroups)/counts
+            sqdiff = (values-means[codes])**2
+            var = np.bincount(codes, weights=sqdiff, minlength=ngroups)/counts
+            return var if function is np.var else np.sqrt(var)
+
+        ufuncs = {np.min: np.minimum, np.amin: np.minimum, np.max: np.maximum,
+                  np.amax: np.maximum, np.prod: np.multiply}
+        ufunc = ufuncs.get(function, function)
+        if isinstance(ufunc, np.ufunc) and ufunc.nin == 2:
+            order = np.argsort(codes, kind='mergesort')
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            return ufunc.reduceat(values[order], starts)
+    reduced = [function(values[idx]) for idx in group_indices(codes, ngroups)]
+    try:
+        arr = np.array(reduced)
+    except ValueError:
+        arr = None
+    if arr is None or arr.ndim != 1:
+        # Functions returning arrays, e.g. unary ufuncs
+        arr = np.empty(len(reduced), dtype=object)
+        for i, r in enumerate(reduced):
+            arr[i] = r
+    return arr
+
+
+def minmax_decimate(xs, ys, x0, x1, bins):
+    """
+    Decimates a curve for display, returning the sorted indices of
+    the samples to retain. The range x0 to x1 is divided into the
+    supplied number of equally sized bins (usually one per pixel
+    column) and of each run of consecutive samples falling into the
+    same bin, the first, last, minimum and maximum sample is retained
+    along with the first NaN sample marking a gap in the curve.
+    Samples outside the range fall into one additional bin on either
+    side. When drawn, the decimated curve covers the same pixels as
+    the original curve.
+    """
+    n = len(xs)
+    if not n or bins < 1 or not x1 > x0:
+        return np.arange(n)
+    index = np.arange(n)
+    codes = np.floor((np.asarray(xs, dtype=np.float64) - x0) / (x1 - x0) * bins)
+    codes = np.clip(np.nan_to_num(codes), -1, bins).astype(np.int64)
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(codes)) + 1])
+    ends = np.concatenate([starts[1:], [n]])
+    counts = ends - starts
+
+    ys = np.asarray(ys, dtype=np.float64)
+    nans = np.isnan(ys)
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', r'invalid value encountered')
+        retained = [starts, ends-1]
+        for reducer, fill in [(np.minimum, np.inf), (np.maximum, -np.inf)]:
+            filled = np.where(nans, fill, ys)
+            extrema = np.repeat(reducer.reduceat(filled, starts), counts)
+            candidates = np.where(filled == extrema, index, n)
+            retained.append(np.minimum.reduceat(candidates, starts))
+        retained.append(np.minimum.reduceat(np.where(nans, index, n), starts))
+    indices = np.unique(np.concatenate(retained))
+    return indices[indices < n]
+
+
+def density_subsample(xs, ys, extents, shape, samples, seed=0):
+    """
+    Subsamples a set of points for display, returning the sorted
+    indices of the points to retain. A random subsample of the
+    supplied number of samples is drawn, preserving the density of
+    the points, along with one point in every occupied bin of a grid
+    of the given (width, height) shape spanning the (left, bottom,
+    right, top) extents, so sparse regions and outliers are never
+    dropped. The random state is seeded, making the subsample
+    deterministic.
+    """
+    n = len(xs)
+    if n <= samples:
+        return np.arange(n)
+    (l, b, r, t), (width, height) = extents, shape
+    xs, ys = np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', r'invalid value encountered')
+        xbins = np.floor((xs - l) / float(r - l) * width) if r > l else np.zeros(n)
+        ybins = np.floor((ys - b) / float(t - b) * height) if t > b else np.zeros(n)
+    xbins = np.clip(np.nan_to_num(xbins), -1, width).astype(np.int64)
+    ybins = np.clip(np.nan_to_num(ybins), -1, height).astype(np.int64)
+    _, occupied = np.unique(xbins * (height + 2) + ybins, return_index=True)
+    sampled = np.random.RandomState(seed).choice(n, samples, replace=False)
+    return np.union1d(occupied, sampled)
+
+
+class HistogramAccumulator(object):
+    """
+    Accumulates the number of values falling into a fixed set of bins
+    defined by their edges. Values may be added in chunks, so that
+    streams of data or the frames of a HoloMap can be binned in a
+    single pass without holding all the values in memory, and
+    accumulators sharing the same edges may be merged. As in
+    np.histogram the last bin includes its upper edge, values outside
+    the bins and NaNs are ignored.
+    """
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(len(self.edges)-1, dtype=np.int64)
+
+    @classmethod
+    def from_range(cls, bin_range, num_bins):
+        "Returns an accumulator with num_bins equal bins over the range."
+        return cls(np.linspace(bin_range[0], bin_range[1], num_bins+1))
+
+    def add(self, values):
+        "Adds an array or sequence of values to the counts."
+        values = np.asarray(values, dtype=np.float64).ravel()
+        nbins = len(self.counts)
+        indices = np.searchsorted(self.edges, values, side='right') - 1
+        indices[values == self.edges[-1]] = nbins - 1
+        valid = (indices >= 0) & (indices < nbins)
+        self.counts += np.bincount(indices[valid], minlength=nbins)
+        return self
+
+    def add_array(self, data, channel=None, chunk_size=2**20):
+        """
+        Adds the values of an array or array-like object supporting
+        slicing along the first axis (e.g. a np.memmap) in blocks of
+        rows, as in array_range. Optionally, a channel may be selected
+        along the last axis of three dimensional data.
+        """
+        step = _block_rows(data, chunk_size)
+        for start in range(0, data.shape[0], step):
+            block = np.asarray(data[start:start+step])
+            self.add(block if channel is None else block[..., channel])
+        return self
+
+    def merge(self, other):
+        "Adds the counts of another accumulator with the same edges."
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Only histograms with matching bin edges can be merged.")
+        self.counts += other.counts
+        return self
+
+    def copy(self):
+        accumulator = HistogramAccumulator(self.edges)
+        accumulator.counts = self.counts.copy()
+        return accumulator
+
+    def histogram(self, normed=False):
+        """
+        Returns the (values, edges) of the histogram, where the values
+        are normalized to a probability density if normed is True.
+        """
+        values = self.counts.astype(np.float64)
+        total = values.sum()
+        if normed and total:
+            values = values / (total * np.diff(self.edges))
+        return values, self.edges.copy()
+
+
 # Copied from param should make param version public
 def is_number(obj):
     if isinstance(obj, numbers.Number): return True
@@ -410,6 +698,327 @@ def is_number(obj):
     else: return False
 
 
+def data_nbytes(obj):
+    """
+    Estimates the memory in bytes held by the data of a HoloViews
+    object, summing over all nested objects. Array data is measured
+    exactly, the size of any other data is approximated by the size
+    of the container itself.
+    """
+    def nbytes(x):
+        data = getattr(x, 'data', None)
+        if isinstance(data, np.ndarray):
+            return data.nbytes
+        return sys.getsizeof(data)
+    if hasattr(obj, 'traverse'):
+        return sum(obj.traverse(nbytes))
+    return nbytes(obj)
+
+
+class FrameCache(object):
+    """
+    A least recently used cache with a memory budget. The size of
+    each item is estimated by the size_fn when it is added and the
+    least recently used items are evicted whenever the total size
+    exceeds the budget (in bytes) or the number of items exceeds
+    max_items. The most recently added item is always retained, even
+    if it exceeds the budget on its own. A budget or max_items of None
+    disables the corresponding limit.
+    """
+
+    def __init__(self, budget=None, size_fn=data_nbytes, max_items=None):
+        self.budget = budget
+        self.size_fn = size_fn
+        self.max_items = max_items
+        self.nbytes = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def keys(self):
+        return list(self._items.keys())
+
+    def get(self, key, default=None):
+        "Returns the cached item, marking it as most recently used."
+        if key not in self._items:
+            return default
+        item = self._items.pop(key)
+        self._items[key] = item
+        return item[0]
+
+    def __getitem__(self, key):
+        if key not in self._items:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        self.pop(key)
+        size = self.size_fn(value)
+        self._items[key] = (value, size)
+        self.nbytes += size
+        while len(self._items) > 1 and (
+                (self.budget is not None and self.nbytes > self.budget) or
+                (self.max_items is not None and len(self._items) > self.max_items)):
+            _, (_, evicted) = self._items.popitem(last=False)
+            self.nbytes -= evicted
+
+    def pop(self, key, default=None):
+        if key not in self._items:
+            return default
+        value, size = self._items.pop(key)
+        self.nbytes -= size
+        return value
+
+    def clear(self):
+        self._items.clear()
+        self.nbytes = 0
+
+
+def deephash(obj):
+    """
+    Computes a stable hash of the contents of an object, which may be
+    an Element or any (nested) container of data. Arrays are hashed by
+    their dtype, shape and data buffer, while Parameterized objects
+    (including Dimensions and Elements) are hashed by their type and
+    parameter values along with any data they hold. Unlike the
+    builtin hash, the result is consistent across Python sessions.
+    """
+    hasher = hashlib.md5()
+    _update_hash(hasher, obj)
+    return hasher.hexdigest()
+
+
+def _update_hash(hasher, obj):
+    "Recursively updates the hasher with the contents of obj."
+    update = lambda s: hasher.update(s.encode('utf-8'))
+    if isinstance(obj, np.ndarray):
+        update('ndarray%s%r' % (obj.dtype.str, obj.shape))
+        if obj.dtype.hasobject:
+            for item in obj.flat:
+                _update_hash(hasher, item)
+        else:
+            hasher.update(np.ascontiguousarray(obj).view(np.uint8).data)
+    elif isinstance(obj, param.Parameterized):
+        update(type(obj).__name__)
+        for name, value in sorted(obj.get_param_values()):
+            # Skip automatically generated instance names
+            if name == 'name' and re.match(type(obj).__name__+r'\d{5}$', value):
+                continue
+            update(name)
+            _update_hash(hasher, value)
+        if hasattr(obj, 'data'):
+            _update_hash(hasher, obj.data)
+    elif isinstance(obj, dict):
+        items = obj.items()
+        if not isinstance(obj, OrderedDict):
+            items = sorted(items, key=lambda x: repr(x[0]))
+        update(type(obj).__name__)
+        for k, v in items:
+            _update_hash(hasher, k)
+            _update_hash(hasher, v)
+    elif isinstance(obj, (list, tuple)):
+        update('%s%d' % (type(obj).__name__, len(obj)))
+        for item in obj:
+            _update_hash(hasher, item)
+    elif obj is None or isinstance(obj, (basestring, bytes, numbers.Number)):
+        update(repr(obj))
+    elif isinstance(getattr(obj, 'data', None), OrderedDict):
+        # Containers such as AttrTrees holding their items as data
+        update(type(obj).__name__)
+        _update_hash(hasher, obj.data)
+    elif isinstance(obj, types.FunctionType):
+        # Lambdas and closures share their names, so their code,
+        # defaults and closed over values are hashed as well
+        update('function%s.%s' % (obj.__module__, obj.__name__))
+        _update_code(hasher, obj.__code__)
+        _update_hash(hasher, obj.__defaults__)
+        for cell in (obj.__closure__ or ()):
+            try:
+                value = cell.cell_contents
+            except ValueError:
+                value = None
+            if value is not obj:
+                _update_hash(hasher, value)
+    elif isinstance(obj, types.MethodType):
+        _update_hash(hasher, obj.__func__)
+        _update_hash(hasher, obj.__self__)
+    elif isinstance(obj, type) or callable(obj):
+        update('%s.%s' % (getattr(obj, '__module__', ''),
+                          getattr(obj, '__name__', repr(obj))))
+    else:
+        try:
+            hasher.update(pickle.dumps(obj, 2))
+        except Exception:
+            update(repr(obj))
+
+
+def _update_code(hasher, code):
+    "Updates the hasher with the bytecode, constants and names of code."
+    hasher.update(code.co_code)
+    hasher.update(repr(code.co_names).encode('utf-8'))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _update_code(hasher, const)
+        else:
+            _update_hash(hasher, const)
+
+
+class FileCache(object):
+    """
+    A least recently used cache that pickles items to files in the
+    specified directory using Store.dumps, making them available
+    across sessions along with any custom options. Keys
+    must be valid filenames, e.g. the hashes returned by deephash.
+    Whenever the total size of the cached files exceeds the budget
+    (in bytes) the least recently used files are deleted. A budget of
+    None disables eviction.
+    """
+
+    def __init__(self, path, budget=None):
+        self.path = path
+        self.budget = budget
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    def _filename(self, key):
+        return os.path.join(self.path, '%s.pkl' % key)
+
+    def __contains__(self, key):
+        return os.path.isfile(self._filename(key))
+
+    def keys(self):
+        files = glob.glob(os.path.join(self.path, '*.pkl'))
+        return [os.path.basename(f)[:-4] for f in sorted(files, key=os.path.getmtime)]
+
+    def get(self, key, default=None):
+        "Returns the cached item, marking it as most recently used."
+        from .options import Store
+        filename = self._filename(key)
+        try:
+            with open(filename, 'rb') as f:
+                item = Store.loads(f.read())
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            return default
+        os.utime(filename, None)
+        return item
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        from .options import Store
+        filename = self._filename(key)
+        with open(filename+'.tmp', 'wb') as f:
+            f.write(Store.dumps(value, protocol=2))
+        if os.path.isfile(filename):
+            os.remove(filename)
+        os.rename(filename+'.tmp', filename)
+        if self.budget is None:
+            return
+        files = [self._filename(k) for k in self.keys()]
+        nbytes = sum(os.path.getsize(f) for f in files)
+        for f in files:
+            if nbytes <= self.budget: break
+            elif f == filename: continue
+            nbytes -= os.path.getsize(f)
+            os.remove(f)
+
+    def pop(self, key, default=None):
+        value = self.get(key, default)
+        if key in self:
+            os.remove(self._filename(key))
+        return value
+
+    def clear(self):
+        for key in self.keys():
+            os.remove(self._filename(key))
+
+
+def _call_pickled(args):
+    "Calls a function on an item pickled by parallel_map."
+    (function, payload) = args
+    return function(pickle.loads(payload))
+
+
+def parallel_map(function, items, executor='serial', workers=None, timeout=None):
+    """
+    Applies the function to each of the items, returning the results
+    in order. The executor may be 'serial', 'thread' to dispatch the
+    items to a pool of threads or 'process' to dispatch them to a pool
+    of processes, in which case the function and items must be
+    picklable. The items are dispatched in chunks to the specified
+    number of workers, which defaults to the number of CPUs. If a
+    timeout in seconds is supplied, a multiprocessing TimeoutError is
+    raised if the results are not available in time.
+    """
+    items = list(items)
+    if executor == 'serial' or len(items) < 2:
+        return [function(item) for item in items]
+    elif executor not in ['thread', 'process']:
+        raise ValueError("Unknown executor %r, valid executors are "
+                         "'serial', 'thread' and 'process'." % executor)
+    import multiprocessing
+    from multiprocessing.pool import ThreadPool
+    if executor == 'process':
+        # Pickling the items here and unpickling them within the call
+        # ensures errors are raised in the caller instead of killing
+        # the worker processes, which would leave the pool waiting
+        items = [(function, pickle.dumps(item, pickle.HIGHEST_PROTOCOL))
+                 for item in items]
+        function = _call_pickled
+    workers = min(workers or multiprocessing.cpu_count(), len(items))
+    chunksize = max(1, int(np.ceil(len(items) / (4. * workers))))
+    pool = (ThreadPool if executor == 'thread' else multiprocessing.Pool)(workers)
+    try:
+        results = pool.map_async(function, items, chunksize).get(timeout)
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+    return results
+
+
+class Parallelizable(param.Parameterized):
+    """
+    Mixin declaring the parameters that control how the items processed
+    by an object are dispatched by parallel_map. The parameter
+    overrides of the current call held by ParameterizedFunctions are
+    not pickled, so they never leak into other calls.
+    """
+
+    executor = param.ObjectSelector(default='serial',
+                                    objects=['serial', 'thread', 'process'], doc="""
+       How the items are dispatched for processing. By default they
+       are processed in turn by the object itself. The 'thread' and
+       'process' executors process the items in chunks across a pool
+       of threads or processes instead, preserving their order. The
+       'process' executor requires the object, its parameters and the
+       items to be picklable.""")
+
+    workers = param.Integer(default=None, allow_None=True, bounds=(1, None), doc="""
+       The number of threads or processes used by the executor,
+       defaulting to the number of CPUs.""")
+
+    timeout = param.Number(default=None, allow_None=True, bounds=(0, None), doc="""
+       The maximum time in seconds to wait for the items dispatched
+       to the executor, after which a TimeoutError is raised. By
+       default, the executor waits until all items are processed.""")
+
+    __abstract = True
+
+    def __reduce__(self):
+        (new, args, state) = super(Parallelizable, self).__reduce__()
+        state.pop('p', None)
+        return (new, args, state)
+
+
+
 class ProgressIndicator(param.Parameterized):
     """
     Baseclass for any ProgressIndicator that indicates progress
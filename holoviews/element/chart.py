@@ -55,8 +55,7 @@ class Chart(Element2D):
         Should return the data and parameters of the new Chart.
         """
         if isinstance(ndmap, Table):
-            data = np.vstack([np.concatenate([key, vals])
-                              for key, vals in ndmap.data.items()]).astype(np.float)
+            data = np.column_stack(list(ndmap.columns().values())).astype(np.float)
             settings = dict(ndmap.get_param_values(onlychanged=True))
         else:
             data = np.concatenate([v.data for v in ndmap])
@@ -24,7 +24,7 @@ from numpy.testing import assert_array_almost_equal
 
 from . import *    # pyflakes:ignore (All Elements need to support comparison)
 from ..core import Element, AdjointLayout, Overlay, Dimension, HoloMap, \
-                   Dimensioned, Layout, NdLayout, NdOverlay, GridSpace
+                   LazyHoloMap, Dimensioned, Layout, NdLayout, NdOverlay, GridSpace
 from ..core.options import Options
 from ..interface.pandas import DFrame as PandasDFrame
 from ..interface.pandas import DataFrameView
@@ -170,6 +170,7 @@ class Comparison(ComparisonInterface):
         cls.equality_type_funcs[NdOverlay] =     cls.compare_ndoverlays
         cls.equality_type_funcs[GridSpace] =     cls.compare_grids
         cls.equality_type_funcs[HoloMap] =       cls.compare_holomap
+        cls.equality_type_funcs[LazyHoloMap] =   cls.compare_holomap
 
         # Option objects
         cls.equality_type_funcs[Options] =     cls.compare_options
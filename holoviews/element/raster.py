@@ -59,6 +59,29 @@ class Raster(Element2D):
         return int(round(coord[1])), int(round(coord[0]))
 
 
+    def range(self, dim, data_range=True):
+        dim_idx = dim if isinstance(dim, int) else self.get_dimension_index(dim)
+        dim = self.get_dimension(dim_idx)
+        if (dim.range != (None, None) or not data_range
+            or dim_idx >= len(self.value_dimensions) + 2):
+            return super(Raster, self).range(dim, data_range)
+        elif dim_idx in [0, 1]:
+            data_range = (0, self.data.shape[abs(dim_idx-1)]-1)
+        else:
+            data_range = self._value_range(dim_idx-2)
+        return util.max_range([data_range, dim.soft_range])
+
+
+    def _value_range(self, vidx):
+        """
+        Computes the range of the values of the specified value
+        dimension in chunks, avoiding loading memory-mapped or
+        chunked arrays into memory in full.
+        """
+        channel = vidx if len(self.data.shape) == 3 else None
+        return util.array_range(self.data, channel)
+
+
     @classmethod
     def collapse_data(cls, data_list, function, **kwargs):
         if isinstance(function, np.ufunc):
@@ -265,6 +288,11 @@ class HeatMap(Raster):
             return super(HeatMap, self).dimension_values(dim)
 
 
+    def range(self, dim, data_range=True):
+        # Ranges are determined by the sparse data
+        return Element2D.range(self, dim, data_range)
+
+
     def dframe(self, dense=False):
         if dense:
             keys1, keys2 = self.dense_keys()
@@ -367,9 +395,7 @@ class Image(SheetCoordinateSystem, Raster):
             else:
                 data_range = (l, r)
         elif dim_idx < len(self.value_dimensions) + 2:
-            dim_idx -= 2
-            data = np.atleast_3d(self.data)[:, :, dim_idx]
-            data_range = (data.min(), data.max())
+            data_range = self._value_range(dim_idx-2)
         if data_range:
             return util.max_range([data_range, dim.soft_range])
         else:
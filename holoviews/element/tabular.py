@@ -101,12 +101,20 @@ class ItemTable(Element):
             raise Exception("Only two columns available in a ItemTable.")
         elif row >= self.rows:
             raise Exception("Maximum row index is %d" % self.rows-1)
-        elif col == 0:
-            return str(self.dimensions('value')[row])
+        dim, value = self.row(row)
+        if col == 0:
+            return str(dim)
         else:
-            dim = self.get_dimension(row)
-            heading = self._cached_value_names[row]
-            return dim.pprint_value(self.data.get(heading, np.NaN))
+            return dim.pprint_value(value)
+
+
+    def row(self, index):
+        """
+        Returns the value Dimension and the corresponding value of the
+        row at the given integer index.
+        """
+        dim = self.value_dimensions[index]
+        return dim, self.data.get(dim.name, np.NaN)
 
 
     def hist(self, *args, **kwargs):
@@ -188,13 +196,7 @@ class Table(NdElement):
             return str(self.key_dimensions[col])
         else:
             dim = self.get_dimension(col)
-            if col >= ndims:
-                row_values = self.values()[row-1]
-                val = row_values[col - ndims]
-            else:
-                row_data = list(self.data.keys())[row-1]
-                val = row_data[col]
-            return dim.pprint_value(val)
+            return dim.pprint_value(self.row(row-1)[col])
 
 
     def cell_type(self, row, col):
@@ -60,16 +60,42 @@ def animate(anim, dpi, writer, fmt, anim_kwargs, extra_args):
     return  tag.format(src=src, mime_type=mime_type)
 
 
+def b64encode_chunks(chunks):
+    """
+    Base64 encodes an iterator over chunks of data incrementally,
+    so the full binary data never has to be held in memory.
+    """
+    remainder = b''
+    for chunk in chunks:
+        data = remainder + chunk
+        split = len(data) - (len(data) % 3)
+        remainder = data[split:]
+        yield base64.b64encode(data[:split]).decode("utf-8")
+    yield base64.b64encode(remainder).decode("utf-8")
+
+
+def stream_video(plot, dpi, fmt):
+    "Encodes the frames of the plot with ffmpeg as they are rendered."
+    renderer = Store.renderer.instance(dpi=dpi, fps=OutputMagic.options['fps'])
+    b64data = ''.join(b64encode_chunks(renderer.anim_stream(plot, fmt)))
+    (mime_type, tag) = MIME_TYPES[fmt], HTML_TAGS[fmt]
+    src = HTML_TAGS['base64'].format(mime_type=mime_type, b64=b64data)
+    return tag.format(src=src, mime_type=mime_type)
+
+
 def HTML_video(plot):
     if OutputMagic.options['holomap'] == 'repr': return None
     dpi = OutputMagic.options['dpi']
-    anim = plot.anim(fps=OutputMagic.options['fps'])
     writers = animation.writers.avail
     current_format = OutputMagic.options['holomap']
     for fmt in [current_format] + list(OutputMagic.ANIMATION_OPTS.keys()):
-        if OutputMagic.ANIMATION_OPTS[fmt][0] in writers:
+        anim_opts = OutputMagic.ANIMATION_OPTS[fmt]
+        if anim_opts[0] in writers:
             try:
-                return animate(anim, dpi, *OutputMagic.ANIMATION_OPTS[fmt])
+                if anim_opts[0] == 'ffmpeg':
+                    return stream_video(plot, dpi, fmt)
+                anim = plot.anim(fps=OutputMagic.options['fps'])
+                return animate(anim, dpi, *anim_opts)
             except: pass
     msg = "<b>Could not generate %s animation</b>" % current_format
     if sys.version_info[0] == 3 and mpl.__version__[:-2] in ['1.2', '1.3']:
@@ -1,4 +1,4 @@
-import os, sys, math, time, uuid, json
+import os, sys, math, time, uuid, json, base64, threading
 from unittest import SkipTest
 
 try:
@@ -22,8 +22,9 @@ ipython2 = hasattr(IPython, 'version_info') and (IPython.version_info[0] == 2)
 import param
 
 from ..core import OrderedDict, NdMapping
-from ..core.util import ProgressIndicator
-from ..plotting import Plot
+from ..core.util import ProgressIndicator, FrameCache
+from ..core.options import Store
+from ..plotting import Plot, HTML_TAGS, MIME_TYPES
 from .magics import OutputMagic
 
 
@@ -243,6 +244,21 @@ class NdWidget(param.Parameterized):
          from this URL. Data should be served from:
          server_url/fig_{id}/{frame}.""")
 
+    #######################
+    # Delta frame options #
+    #######################
+
+    delta_frames = param.Boolean(default=False, doc="""
+         Whether to encode embedded PNG frames as deltas against a
+         keyframe. The static parts of the figure, e.g. the axes,
+         ticks, labels and colorbars, are then only embedded once per
+         keyframe and each frame only carries the regions of the
+         figure that changed, which are reassembled in the browser.""")
+
+    keyframe_interval = param.Integer(default=50, doc="""
+         The maximum number of delta frames encoded against a single
+         keyframe when delta_frames is enabled.""")
+
     ##############################
     # Javascript include options #
     ##############################
@@ -292,6 +308,41 @@ class NdWidget(param.Parameterized):
         return frames
 
 
+    def _delta_encoded(self):
+        "Whether the embedded frames are encoded as keyframe deltas."
+        return (self.delta_frames and not (self.mpld3 or self.export_json)
+                and OutputMagic.options['fig'] == 'png')
+
+
+    def _plot_deltas(self, indices):
+        """
+        Renders the frames at the supplied indices as keyframe deltas,
+        returning the JSON encoded frames. Each frame is encoded as
+        the index of its keyframe and the HTML of the patches placed
+        on top of it, while the keyframe HTML is stored once under the
+        'keyframes' key.
+        """
+        renderer = Store.renderer.instance(dpi=OutputMagic.options['dpi'])
+        img = "<img src='%s' style='%s'/>"
+        def src(data):
+            b64 = base64.b64encode(data).decode("utf-8")
+            return HTML_TAGS['base64'].format(mime_type=MIME_TYPES['png'], b64=b64)
+
+        frames, keyframes = {}, {}
+        deltas = renderer.delta_frames(self.plot, indices,
+                                       keyframe_interval=self.keyframe_interval)
+        for frame, (idx, key_idx, keydata, patches, (h, w)) in enumerate(deltas):
+            if keydata is not None:
+                keyframes[key_idx] = img % (src(keydata), 'display: block; max-width: 100%')
+            patch_html = ''.join(img % (src(data), 'position: absolute; left: %.4f%%; '
+                                        'top: %.4f%%; width: %.4f%%; height: %.4f%%'
+                                        % (100.*x/w, 100.*y/h, 100.*pw/w, 100.*ph/h))
+                                 for (x, y, pw, ph, data) in patches)
+            frames[frame] = [key_idx, patch_html]
+        frames['keyframes'] = keyframes
+        return json.dumps(frames)
+
+
     def _plot_figure(self, idx):
         from .display_hooks import display_figure
         fig = self.plot[idx]
@@ -320,18 +371,24 @@ class ScrubberWidget(NdWidget):
 
     def __init__(self, plot, **params):
         super(ScrubberWidget, self).__init__(plot, **params)
-        self.frames = OrderedDict((idx, self._plot_figure(idx))
-                                  for idx in range(len(self.plot)))
+        if self._delta_encoded():
+            self.frames = self._plot_deltas(range(len(self.plot)))
+        else:
+            self.frames = OrderedDict((idx, self._plot_figure(idx))
+                                      for idx in range(len(self.plot)))
 
 
     def __call__(self):
-        frames = {idx: frame if self.mpld3 or self.export_json else
-                  str(frame) for idx, frame in enumerate(self.frames.values())}
-        frames = self.encode_frames(frames)
+        if self._delta_encoded():
+            frames = self.frames
+        else:
+            frames = {idx: frame if self.mpld3 or self.export_json else
+                      str(frame) for idx, frame in enumerate(self.frames.values())}
+            frames = self.encode_frames(frames)
 
         data = {'id': self.id, 'Nframes': len(self.plot),
                 'interval': int(1000. / OutputMagic.options['fps']),
-                'frames': frames,
+                'frames': frames, 'delta': self._delta_encoded(),
                 'load_json': str(self.export_json).lower(),
                 'server': self.server_url,
                 'mpld3_url': self.mpld3_url,
@@ -393,6 +450,21 @@ class SelectionWidget(NdWidget):
     cache_size = param.Integer(default=100, doc="""
         Size of dynamic cache if frames are not embedded.""")
 
+    cache_budget = param.Integer(default=64*1024**2, allow_None=True, doc="""
+        Memory budget of the dynamic cache in bytes if frames are not
+        embedded. The least recently used frames are evicted whenever
+        either the cache_size or the cache_budget is exceeded.""")
+
+    prefetch = param.Integer(default=2, doc="""
+        Number of steps along each slider dimension rendered ahead of
+        the currently selected frame if frames are not embedded. The
+        neighbouring frames are rendered in a background thread so
+        that they are usually cached by the time they are requested.
+        The thread only draws the figure of the widget and is
+        serialized with the renders of the widget, but not with any
+        other matplotlib drawing in the kernel. A value of zero
+        disables prefetching.""")
+
     template = param.String('jsslider.jinja', doc="""
         The jinja2 template used to generate the html output.""")
 
@@ -407,8 +479,16 @@ class SelectionWidget(NdWidget):
         NdWidget.__init__(self, plot, **params)
         nbagg = CommSocket is not object
         self.nbagg = OutputMagic.options['backend'] == 'nbagg' and nbagg
-        self.frames = {}
-        if self.embed:
+        self.frames = FrameCache(self.cache_budget, self._frame_nbytes,
+                                 self.cache_size)
+        self._render_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._prefetch_lock = threading.Lock()
+        self._prefetch_queue = []
+        self._prefetch_thread = None
+        if self.embed and self._delta_encoded():
+            self.frames = self._plot_deltas(range(len(self.keys)))
+        elif self.embed:
             frames = {idx: self._plot_figure(idx)
                       for idx in range(len(self.keys))}
             self.frames = self.encode_frames(frames)
@@ -471,11 +551,12 @@ class SelectionWidget(NdWidget):
                 frames = self.encode_frames(frames)
                 self.frames[0] = frames
             else:
-                self.frames.update(frames)
+                self.frames[0] = frames[0]
 
         data = {'id': self.id, 'Nframes': len(self.mock_obj),
                 'Nwidget': self.mock_obj.ndims,
                 'frames': frames, 'dimensions': dimensions,
+                'delta': self.embed and self._delta_encoded(),
                 'key_data': key_data, 'widgets': widgets,
                 'init_dim_vals': init_dim_vals,
                 'load_json': str(self.export_json).lower(),
@@ -501,13 +582,94 @@ class SelectionWidget(NdWidget):
             fig = self.plot[n]
             fig.canvas.draw_idle()
             return
-        if n not in self.frames:
-            if len(self.frames) >= self.cache_size:
-                self.frames.popitem(last=False)
-            frame = self._plot_figure(n)
-            if self.mpld3: frame = self.encode_frames({0: frame})
-            self.frames[n] = frame
-        return self.frames[n]
+        frame = self._render_frame(n)
+        self._prefetch(n)
+        return frame
+
+
+    @staticmethod
+    def _frame_nbytes(frame):
+        return len(frame) if frame else 0
+
+
+    def _render_frame(self, n):
+        """
+        Returns the frame at index n from the cache, plotting it if it
+        has not been cached yet. Plotting is serialized as all frames
+        are drawn on the same figure.
+        """
+        with self._cache_lock:
+            frame = self.frames.get(n)
+        if frame is not None:
+            return frame
+        with self._render_lock:
+            # The frame may have been prefetched in the meantime
+            with self._cache_lock:
+                frame = self.frames.get(n)
+            if frame is None:
+                frame = self._plot_figure(n)
+                if self.mpld3: frame = self.encode_frames({0: frame})
+                with self._cache_lock:
+                    self.frames[n] = frame
+        return frame
+
+
+    def _neighbours(self, n):
+        """
+        Returns the indices of the frames up to prefetch steps away
+        from frame n along each dimension, nearest frames first.
+        """
+        if not hasattr(self, '_key_index'):
+            keys = list(self.mock_obj.data.keys())
+            self._key_list = keys
+            self._key_index = {k: i for i, k in enumerate(keys)}
+            self._dim_values = [sorted(set(k[d] for k in keys))
+                                for d in range(self.mock_obj.ndims)]
+        key = self._key_list[n]
+        neighbours = []
+        for step in range(1, self.prefetch+1):
+            for d, values in enumerate(self._dim_values):
+                pos = values.index(key[d])
+                for offset in (step, -step):
+                    if not 0 <= pos+offset < len(values): continue
+                    neighbour = key[:d] + (values[pos+offset],) + key[d+1:]
+                    idx = self._key_index.get(neighbour)
+                    if idx is not None and idx not in neighbours:
+                        neighbours.append(idx)
+        return neighbours
+
+
+    def _prefetch(self, n):
+        """
+        Queues the neighbours of frame n to be rendered in the
+        background, starting a thread to render them unless one is
+        already running. The thread exits once the queue is empty, so
+        that it does not keep the widget alive.
+        """
+        if not self.prefetch:
+            return
+        with self._prefetch_lock:
+            # Frames queued for a previous selection are superseded
+            with self._cache_lock:
+                self._prefetch_queue = [idx for idx in self._neighbours(n)
+                                        if idx not in self.frames]
+            if self._prefetch_queue and self._prefetch_thread is None:
+                self._prefetch_thread = threading.Thread(target=self._prefetch_frames)
+                self._prefetch_thread.daemon = True
+                self._prefetch_thread.start()
+
+
+    def _prefetch_frames(self):
+        while True:
+            with self._prefetch_lock:
+                if not self._prefetch_queue:
+                    self._prefetch_thread = None
+                    return
+                idx = self._prefetch_queue.pop(0)
+            try:
+                self._render_frame(idx)
+            except Exception as e:
+                self.warning("Prefetching frame %d failed: %s" % (idx, e))
 
 
 
@@ -3,14 +3,18 @@ Collection of either extremely generic or simple ElementOperation
 examples.
 """
 
+import warnings
+from collections import defaultdict
+
 import numpy as np
 
 import param
 
 from ..core import ElementOperation, NdOverlay, Overlay
-from ..core.util import find_minmax
+from ..core.util import (find_minmax, deephash, FrameCache, array_range,
+                         HistogramAccumulator)
 from ..element.chart import Histogram, Curve
-from ..element.raster import Image, RGB
+from ..element.raster import Raster, Image, RGB
 from ..element.path import Contours
 
 
@@ -276,18 +280,20 @@ class threshold(ElementOperation):
     group = param.String(default='Threshold', doc="""
        The group assigned to the thresholded output.""")
 
+    stackable = (Image,)
+
     def _process(self, matrix, key=None):
 
         if not isinstance(matrix, Image):
             raise TypeError("The threshold operation requires a Image as input.")
 
-        arr = matrix.data
-        high = np.ones(arr.shape) * self.p.high
-        low = np.ones(arr.shape) * self.p.low
-        thresholded = np.where(arr > self.p.level, high, low)
+        thresholded = self._process_stack(matrix.data, matrix)
 
         return matrix.clone(thresholded, group=self.p.group)
 
+    def _process_stack(self, stack, matrix):
+        return np.where(stack > self.p.level, float(self.p.high), float(self.p.low))
+
 
 
 class gradient(ElementOperation):
@@ -303,18 +309,23 @@ class gradient(ElementOperation):
     group = param.String(default='Gradient', doc="""
     The group assigned to the output gradient matrix.""")
 
+    stackable = (Image,)
+
     def _process(self, matrix, key=None):
 
         if len(matrix.value_dimensions) != 1:
             raise ValueError("Input matrix to gradient operation must "
                              "have single value dimension.")
 
+        return Image(self._process_stack(matrix.data, matrix), matrix.bounds,
+                     group=self.p.group)
+
+    def _process_stack(self, stack, matrix):
         matrix_dim = matrix.value_dimensions[0]
 
-        data = matrix.data
-        r, c = data.shape
-        dx = np.diff(data, 1, axis=1)[0:r-1, 0:c-1]
-        dy = np.diff(data, 1, axis=0)[0:r-1, 0:c-1]
+        r, c = stack.shape[-2:]
+        dx = np.diff(stack, 1, axis=-1)[..., 0:r-1, 0:c-1]
+        dy = np.diff(stack, 1, axis=-2)[..., 0:r-1, 0:c-1]
 
         cyclic_range = 1.0 if not matrix_dim.cyclic else matrix_dim.range
         if cyclic_range is not None: # Wrap into the specified range
@@ -327,7 +338,7 @@ class gradient(ElementOperation):
             dx = 0.5 * cyclic_range - np.abs(dx - 0.5 * cyclic_range)
             dy = 0.5 * cyclic_range - np.abs(dy - 0.5 * cyclic_range)
 
-        return Image(np.sqrt(dx * dx + dy * dy), matrix.bounds, group=self.p.group)
+        return np.sqrt(dx * dx + dy * dy)
 
 
 
@@ -336,6 +347,11 @@ class convolve(ElementOperation):
     Apply a convolution to an overlay using the top layer as the
     kernel for convolving the bottom layer. Both Image elements in
     the input overlay should have a single value dimension.
+
+    Small kernels are applied directly in the spatial domain, larger
+    kernels are applied via real FFTs, caching the kernel spectrum so
+    that the frames of a HoloMap sharing the same kernel only require
+    one transform each. Such frames are convolved in batches.
     """
 
     output_type = Image
@@ -348,7 +364,19 @@ class convolve(ElementOperation):
         convolution in lbrt (left, bottom, right, top) format. By
         default, no slicing is applied.""")
 
-    def _process(self, overlay, key=None):
+    direct_size = param.Integer(default=25, bounds=(0, None), doc="""
+        Kernels with at most this number of elements are applied
+        directly in the spatial domain instead of via FFTs.""")
+
+    # Bounded cache of kernel spectra keyed by the content hash of the
+    # kernel and the shape of the target
+    spectrum_cache = FrameCache(budget=64*1024**2)
+
+    # Maximum size in bytes of the frames convolved in a single batch
+    stack_nbytes = 2**20
+
+    def _split(self, overlay):
+        "Returns the target Image and the kernel array of the overlay."
         if len(overlay) != 2:
             raise Exception("Overlay must contain at least to items.")
 
@@ -361,23 +389,164 @@ class convolve(ElementOperation):
         yslice = slice(self.p.kernel_roi[1], self.p.kernel_roi[3])
 
         k = kernel.data if self.p.kernel_roi == (0,0,0,0) else kernel[xslice, yslice].data
+        return target, np.asarray(k)
 
-        fft1 = np.fft.fft2(target.data)
-        fft2 = np.fft.fft2(k, s= target.data.shape)
-        convolved_raw = np.fft.ifft2(fft1 * fft2).real
 
+    def _convolve(self, stack, k, khash=None):
+        """
+        Convolves a stack of frames along the first axis with the
+        kernel, wrapping around the edges and centering the kernel.
+        """
+        shape = stack.shape[1:]
         k_rows, k_cols = k.shape
-        rolled = np.roll(np.roll(convolved_raw, -(k_cols//2), axis=-1), -(k_rows//2), axis=-2)
-        convolved = rolled / float(k.sum())
+        if k.size <= self.p.direct_size and k_rows <= shape[0] and k_cols <= shape[1]:
+            convolved = np.zeros(stack.shape)
+            for (row, col), weight in np.ndenumerate(k):
+                if weight:
+                    convolved += weight * np.roll(np.roll(stack, row - k_rows//2, axis=1),
+                                                  col - k_cols//2, axis=2)
+        else:
+            cache_key = (deephash(k) if khash is None else khash, shape)
+            spectrum = self.spectrum_cache.get(cache_key)
+            if spectrum is None:
+                spectrum = np.fft.rfft2(k, s=shape)
+                self.spectrum_cache[cache_key] = spectrum
+            convolved_raw = np.fft.irfft2(np.fft.rfft2(stack) * spectrum, s=shape)
+            convolved = np.roll(np.roll(convolved_raw, -(k_cols//2), axis=2),
+                                -(k_rows//2), axis=1)
+        return convolved / float(k.sum())
 
+
+    def _process(self, overlay, key=None):
+        target, k = self._split(overlay)
+        convolved = self._convolve(target.data[np.newaxis], k)[0]
         return Image(convolved, bounds=target.bounds, group=self.p.group)
 
 
+    def _process_map(self, element):
+        if self.p.executor != 'serial' or self.p.memoize:
+            return super(convolve, self)._process_map(element)
+
+        batches = defaultdict(list)
+        for key, overlay in element.items():
+            target, k = self._split(overlay)
+            khash = deephash(k)
+            batches[(target.data.shape, khash)].append((key, target, k))
+
+        processed = {}
+        for (_, khash), items in batches.items():
+            keys, targets, kernels = zip(*items)
+            step = max(1, self.stack_nbytes // max(targets[0].data.nbytes, 1))
+            for i in range(0, len(items), step):
+                stack = np.array([t.data for t in targets[i:i+step]])
+                convolved = self._convolve(stack, kernels[0], khash)
+                processed.update((key, Image(c, bounds=t.bounds, group=self.p.group))
+                                 for key, t, c in zip(keys[i:i+step], targets[i:i+step], convolved))
+        return [(key, processed[key]) for key in element.keys()]
+
+
+
+# Pairs of cell edges (0=top, 1=right, 2=bottom, 3=left) joined by the
+# contour segments of each marching squares case, where the corners at
+# or above the level contribute 8 (top-left), 4 (top-right), 2
+# (bottom-right) and 1 (bottom-left). The saddle cases 5 and 10 are
+# repeated as cases 16 and 17 for cells whose mean is at or above the
+# level, joining the corners that are above the level.
+_MARCHING_SEGMENTS = np.array([
+    [(-1, -1), (-1, -1)], [(3, 2), (-1, -1)], [(2, 1), (-1, -1)],
+    [(3, 1), (-1, -1)],   [(0, 1), (-1, -1)], [(0, 1), (3, 2)],
+    [(0, 2), (-1, -1)],   [(3, 0), (-1, -1)], [(3, 0), (-1, -1)],
+    [(0, 2), (-1, -1)],   [(3, 0), (2, 1)],   [(0, 1), (-1, -1)],
+    [(3, 1), (-1, -1)],   [(2, 1), (-1, -1)], [(3, 2), (-1, -1)],
+    [(-1, -1), (-1, -1)], [(3, 0), (2, 1)],   [(0, 1), (3, 2)]])
+
+
+def marching_squares(array, level):
+    """
+    Extracts the contour lines of a 2D array at the given level using
+    the marching squares algorithm, returning a list of Nx2 arrays of
+    continuous (row, column) matrix coordinates, where integer
+    coordinates fall on the array samples. Closed contours repeat
+    their first point at the end. Saddle cells are disambiguated by
+    the mean of their corners and cells with NaN corners are skipped.
+    """
+    z = np.asarray(array, dtype=np.float64)
+    rows, cols = z.shape
+    if rows < 2 or cols < 2:
+        return []
+    corners = [z[:-1, :-1], z[:-1, 1:], z[1:, 1:], z[1:, :-1]]
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', r'invalid value encountered')
+        cases = sum((c >= level).astype(np.int64) << (3-i)
+                    for i, c in enumerate(corners))
+        center = sum(corners) / 4. >= level
+    cases[(cases == 5) & center] = 16
+    cases[(cases == 10) & center] = 17
+    cases[np.isnan(sum(corners))] = 0
+
+    # Cell edges are numbered with the rows*(cols-1) horizontal
+    # edges first, followed by the (rows-1)*cols vertical edges
+    cell_rows, cell_cols = np.nonzero((cases != 0) & (cases != 15))
+    nhorizontal = rows * (cols-1)
+    top = cell_rows * (cols-1) + cell_cols
+    left = nhorizontal + cell_rows * cols + cell_cols
+    edges = np.column_stack([top, left + 1, top + (cols-1), left])
+    segments = _MARCHING_SEGMENTS[cases[cell_rows, cell_cols]]
+    valid = segments[:, :, 0] >= 0
+    cells = np.repeat(np.arange(len(edges))[:, np.newaxis], 2, axis=1)[valid]
+    endpoints = edges[cells[:, np.newaxis], segments[valid]]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hoffset = (level - z[:, :-1]) / (z[:, 1:] - z[:, :-1])
+        voffset = (level - z[:-1]) / (z[1:] - z[:-1])
+    hrows, hcols = np.mgrid[0:rows, 0:cols-1]
+    vrows, vcols = np.mgrid[0:rows-1, 0:cols]
+    points = np.concatenate([
+        np.column_stack([hrows.ravel(), (hcols + hoffset).ravel()]),
+        np.column_stack([(vrows + voffset).ravel(), vcols.ravel()])])
+    return [points[path] for path in _join_segments(endpoints.tolist())]
+
+
+def _join_segments(segments):
+    """
+    Joins segments given as pairs of edge ids into paths of edge ids,
+    where each edge is shared by at most two segments. Open paths
+    start at edges on a single segment, closed paths return to their
+    starting edge.
+    """
+    adjacency = defaultdict(list)
+    for i, (start, end) in enumerate(segments):
+        adjacency[start].append(i)
+        adjacency[end].append(i)
+    visited = [False] * len(segments)
+
+    def walk(edge):
+        path = [edge]
+        while True:
+            unvisited = [s for s in adjacency[edge] if not visited[s]]
+            if not unvisited:
+                return path
+            visited[unvisited[0]] = True
+            start, end = segments[unvisited[0]]
+            edge = end if start == edge else start
+            path.append(edge)
+
+    ends = sorted(e for e, segs in adjacency.items() if len(segs) == 1)
+    paths = [walk(edge) for edge in ends if not visited[adjacency[edge][0]]]
+    for i, (start, _) in enumerate(segments):
+        if not visited[i]:
+            paths.append(walk(start))
+    return paths
+
+
 
 class contours(ElementOperation):
     """
     Given a Image with a single channel, annotate it with contour
-    lines for a given set of contour levels.
+    lines for a given set of contour levels. The contour lines are
+    extracted with the marching squares algorithm, joining the points
+    at which the levels are crossed between the sample centers of the
+    Image in sheet coordinates.
 
     The return is an NdOverlay with a Contours layer for each given
     level, overlaid on top of the input Image.
@@ -393,21 +562,14 @@ class contours(ElementOperation):
 
 
     def _process(self, matrix, key=None):
-        from matplotlib import pyplot as plt
-
-        figure_handle = plt.figure()
-        extent = matrix.range(0) + matrix.range(1)[::-1]
-        contour_set = plt.contour(matrix.data, extent=extent,
-                                  levels=self.p.levels)
-
         contours = NdOverlay(None, key_dimensions=['Levels'])
-        for level, cset in zip(self.p.levels, contour_set.collections):
-            paths = cset.get_paths()
-            lines = [path.vertices for path in paths]
-            contours[level] = Contours(lines, group=self.p.group,
+        for level in self.p.levels:
+            lines = []
+            for path in marching_squares(matrix.data, level):
+                xs, ys = matrix.matrixidx2sheet(path[:, 0], path[:, 1])
+                lines.append(np.column_stack([xs, ys]))
+            contours[level] = Contours(lines, level=level, group=self.p.group,
                                        label=matrix.label)
-
-        plt.close(figure_handle)
         return matrix * contours
 
 
@@ -420,6 +582,10 @@ class histogram(ElementOperation):
 
     If adjoin is True, the histogram will be returned adjoined to the
     Element as a side-plot.
+
+    The values are binned with a HistogramAccumulator, which processes
+    the data of Raster elements in blocks of rows so that large or
+    memory-mapped arrays are never loaded into memory at once.
     """
 
     adjoin = param.Boolean(default=True, doc="""
@@ -435,7 +601,9 @@ class histogram(ElementOperation):
       Whether the histogram frequencies are normalized.""")
 
     individually = param.Boolean(default=True, doc="""
-      Specifies whether the histogram will be rescaled for each Raster in a UniformNdMapping.""")
+      Specifies whether the histogram will be rescaled for each Raster in a UniformNdMapping.
+      Otherwise, unless a bin_range is supplied, the bins span the
+      combined range of all the elements in a HoloMap.""")
 
     num_bins = param.Integer(default=20, doc="""
       Number of bins in the histogram .""")
@@ -443,26 +611,66 @@ class histogram(ElementOperation):
     style_prefix = param.String(default=None, allow_None=None, doc="""
       Used for setting a common style for histograms in a HoloMap or AdjointLayout.""")
 
-    def _process(self, view, key=None):
+    def _dimension(self, view):
         if self.p.dimension:
-            selected_dim = self.p.dimension
+            return self.p.dimension
+        return [d.name for d in view.value_dimensions + view.key_dimensions][0]
+
+
+    def _channel(self, view, dimension):
+        """
+        Returns the channel of the value dimension of a Raster holding
+        the values of the dimension, False if the values have to be
+        obtained via dimension_values.
+        """
+        names = [d.name for d in view.value_dimensions]
+        if not isinstance(view, Raster) or dimension not in names:
+            return False
+        return None if len(view.data.shape) == 2 else names.index(dimension)
+
+
+    def _data_range(self, view, dimension):
+        channel = self._channel(view, dimension)
+        if channel is not False:
+            data_range = array_range(view.data, channel)
         else:
-            selected_dim = [d.name for d in view.value_dimensions + view.key_dimensions][0]
-        data = np.array(view.dimension_values(selected_dim))
-        range = find_minmax((np.min(data), np.max(data)), (0, -float('inf')))\
-            if self.p.bin_range is None else self.p.bin_range
+            values = np.asarray(view.dimension_values(dimension), dtype=np.float64)
+            data_range = ((np.nanmin(values), np.nanmax(values)) if len(values)
+                          else (np.NaN, np.NaN))
+        if any(np.isnan(data_range)):
+            return (0, 0)
+        return find_minmax(data_range, (0, -float('inf')))
+
+
+    def _process_map(self, element):
+        if self.p.individually or self.p.bin_range is not None:
+            return super(histogram, self)._process_map(element)
+        # Share the bins across the HoloMap
+        bin_range = (0, -float('inf'))
+        for view in element.values():
+            bin_range = find_minmax(self._data_range(view, self._dimension(view)), bin_range)
+        self.p = param.ParamOverrides(self, dict(self.p, bin_range=bin_range))
+        return super(histogram, self)._process_map(element)
+
+
+    def _process(self, view, key=None):
+        selected_dim = self._dimension(view)
+        range = (self._data_range(view, selected_dim)
+                 if self.p.bin_range is None else self.p.bin_range)
 
         # Avoids range issues including zero bin range and empty bins
         if range == (0, 0):
             range = (0.0, 0.1)
+        accumulator = HistogramAccumulator.from_range(range, self.p.num_bins)
+        channel = self._channel(view, selected_dim)
         try:
-            data = data[np.invert(np.isnan(data))]
-            hist, edges = np.histogram(data, normed=self.p.normed,
-                                       range=range, bins=self.p.num_bins)
-        except:
-            edges = np.linspace(range[0], range[1], self.p.num_bins + 1)
-            hist = np.zeros(self.p.num_bins)
-        hist[np.isnan(hist)] = 0
+            if channel is not False:
+                accumulator.add_array(view.data, channel)
+            else:
+                accumulator.add(view.dimension_values(selected_dim))
+        except (TypeError, ValueError):
+            accumulator = HistogramAccumulator.from_range(range, self.p.num_bins)
+        hist, edges = accumulator.histogram(self.p.normed)
 
         hist_view = Histogram(hist, edges, key_dimensions=[view.get_dimension(selected_dim)],
                               label=view.label)
@@ -87,7 +87,7 @@ class Normalization(ElementOperation):
     def process_element(self, element, key, ranges={}, keys=None, **params):
         params = dict(params,ranges=ranges, keys=keys)
         self.p = param.ParamOverrides(self, params)
-        return self._process(element, key)
+        return self._apply(element, key)
 
 
     def get_ranges(self, element, key):
@@ -1,19 +1,27 @@
 import os
 import warnings
+import subprocess
 from io import BytesIO
-from tempfile import NamedTemporaryFile
+from multiprocessing import Pool
+from tempfile import NamedTemporaryFile, TemporaryFile
+from threading import Thread
+
+try:    from queue import Queue
+except: from Queue import Queue
 
 # Python3 compatibility
 try: basestring = basestring
 except: basestring = str
 
+import numpy as np
 from matplotlib import animation
 from matplotlib import ticker
 from matplotlib import rc_params_from_file
+from matplotlib import rcParams
 
 from param.parameterized import bothmethod
 
-from ..core.options import Cycle, Palette, Options, StoreOptions
+from ..core.options import Cycle, Palette, Options, StoreOptions, Store
 from ..core import Dimension, Layout, NdLayout, Overlay
 from ..core.io import Exporter
 from .annotation import * # pyflakes:ignore (API import)
@@ -103,6 +111,47 @@ def get_plot_size(obj, percent_size):
 
 
 
+# Renderer and plot held by each process rendering frames in parallel
+_worker_state = {}
+
+def _init_frame_worker(renderer, obj_data):
+    "Instantiates the plot rendered by a frame rendering process."
+    _worker_state['renderer'] = renderer
+    _worker_state['plot'] = renderer.get_plot(Store.loads(obj_data))
+
+def _render_frames(frames):
+    "Renders the supplied frame indices to PNG data."
+    renderer, plot = _worker_state['renderer'], _worker_state['plot']
+    return [renderer.figure_data(plot[frame], 'png', bbox_inches=None)
+            for frame in frames]
+
+
+
+def image_patches(reference, image, gap=8):
+    """
+    Finds the regions in which an image array differs from a
+    reference image array of the same shape, returning a list of
+    (x, y, patch) tuples, where x and y are the pixel offsets of each
+    patch array. Changed rows separated by fewer than gap unchanged
+    rows are grouped into a single band and each band is cropped to
+    the columns that changed within it.
+    """
+    changed = (reference != image)
+    if changed.ndim == 3:
+        changed = changed.any(axis=2)
+    rows = np.flatnonzero(changed.any(axis=1))
+    if not len(rows):
+        return []
+    patches = []
+    for band in np.split(rows, np.flatnonzero(np.diff(rows) > gap) + 1):
+        r0, r1 = band[0], band[-1]+1
+        cols = np.flatnonzero(changed[r0:r1].any(axis=0))
+        c0, c1 = cols[0], cols[-1]+1
+        patches.append((c0, r0, image[r0:r1, c0:c1]))
+    return patches
+
+
+
 class MPLPlotRenderer(Exporter):
     """
     Exporter used to render data from matplotlib, either to a stream
@@ -142,6 +191,14 @@ class MPLPlotRenderer(Exporter):
     key_fn = param.Callable(None, allow_None=True, constant=True,  doc="""
         MPLPlotRenderer does not support the saving of object key metadata""")
 
+    processes = param.Integer(default=1, bounds=(1, None), doc="""
+        The number of processes used to render the frames of animated
+        formats written with ffmpeg. If greater than one, each process
+        instantiates its own plot and renders a share of the frames to
+        PNG, which are streamed to ffmpeg in order. Note that the
+        processes only inherit changes to the default options on
+        platforms which fork new processes.""")
+
     # Error messages generated when testing potentially supported formats
     HOLOMAP_FORMAT_ERROR_MESSAGES = {}
 
@@ -149,6 +206,49 @@ class MPLPlotRenderer(Exporter):
         """
         Render the supplied HoloViews component using matplotlib.
         """
+        rendered = self.stream(obj, fmt)
+        if rendered is None: return
+        (chunks, info) = rendered
+        chunks = list(chunks)
+        data = chunks[0] if len(chunks) == 1 else b''.join(chunks)
+        return data, info
+
+
+    @bothmethod
+    def stream(self_or_cls, obj, fmt=None):
+        """
+        Equivalent to calling the renderer except that the data is
+        returned as an iterator over chunks of data. Animations
+        written with ffmpeg are only rendered as the data is consumed,
+        with each frame piped straight into the encoder, so neither
+        all the frames nor the full video are ever held in memory.
+        """
+        self = self_or_cls.instance() if isinstance(self_or_cls, type) else self_or_cls
+        plot = self.get_plot(obj)
+
+        if fmt is None:
+            fmt = self.holomap if len(plot) > 1 else self.fig
+            if fmt is None: return
+        info = {'file-ext':fmt, 'mime_type':MIME_TYPES[fmt]}
+
+        if len(plot) == 1:
+            data = self.figure_data(plot(), fmt, **({'dpi':self.dpi} if self.dpi else {}))
+            return iter([data]), info
+
+        (writer, _, anim_kwargs, extra_args) = ANIMATION_OPTS[fmt]
+        if writer == 'ffmpeg':
+            return self.anim_stream(plot, fmt, obj), info
+
+        anim = plot.anim(fps=self.fps)
+        if extra_args != []:
+            anim_kwargs = dict(anim_kwargs, extra_args=extra_args)
+        return iter([self.anim_data(anim, fmt, writer, **anim_kwargs)]), info
+
+
+    def get_plot(self, obj):
+        """
+        Instantiates the plot for the supplied HoloViews component.
+        """
         if isinstance(obj, AdjointLayout):
             obj = Layout.from_values(obj)
 
@@ -158,24 +258,115 @@ class MPLPlotRenderer(Exporter):
         except KeyError:
             raise Exception("No corresponding plot type found for %r" % type(obj))
 
-        plot = plotclass(obj, **opts(obj,  get_plot_size(obj, self.size)))
+        return plotclass(obj, **opts(obj,  get_plot_size(obj, self.size)))
 
-        if fmt is None:
-            fmt = self.holomap if len(plot) > 1 else self.fig
-            if fmt is None: return
 
-        if len(plot) > 1:
-            (writer, _, anim_kwargs, extra_args) = ANIMATION_OPTS[fmt]
-            anim = plot.anim(fps=self.fps)
-            if extra_args != []:
-                anim_kwargs = dict(anim_kwargs, extra_args=extra_args)
+    def frame_data(self, obj, frames):
+        """
+        Renders the supplied frame indices of a HoloViews component to
+        PNG data across a pool of processes, yielding the data of each
+        frame in order as soon as it is available.
+        """
+        frames = list(frames)
+        chunksize = max(1, int(np.ceil(len(frames) / (4. * self.processes))))
+        chunks = [frames[i:i+chunksize] for i in range(0, len(frames), chunksize)]
+        pool = Pool(self.processes, _init_frame_worker,
+                    (self, Store.dumps(obj, protocol=2)))
+        try:
+            for chunk in pool.imap(_render_frames, chunks):
+                for data in chunk:
+                    yield data
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
 
-            data = self.anim_data(anim, fmt, writer, **anim_kwargs)
+    def anim_stream(self, plot, fmt, obj=None):
+        """
+        Renders each frame of the plot to PNG and pipes it to ffmpeg,
+        yielding the encoded video in chunks. If the plotted object
+        is supplied and multiple processes are enabled, the frames
+        are rendered in parallel.
+        """
+        (_, _, anim_kwargs, extra_args) = ANIMATION_OPTS[fmt]
+        if self.processes > 1 and obj is not None:
+            # The workers instantiate their own plots, the figure of
+            # this plot is only used for the number of frames
+            plt.close(plot.handles['fig'])
+            frames = self.frame_data(obj, range(len(plot)))
         else:
-            data = self.figure_data(plot(), fmt, **({'dpi':self.dpi} if self.dpi else {}))
+            frames = self._plot_frames(plot)
+        return self.encode_frames(frames, fmt, anim_kwargs.get('codec'), extra_args)
+
+
+    def _plot_frames(self, plot):
+        """
+        Renders each frame of the plot to PNG data in turn, closing
+        the figure once done even if the frames are not all consumed.
+        """
+        try:
+            for frame in range(len(plot)):
+                yield self.figure_data(plot[frame], 'png', bbox_inches=None)
+        finally:
+            plt.close(plot.handles['fig'])
+
+
+    def encode_frames(self, frames, fmt, codec=None, extra_args=[]):
+        """
+        Pipes the supplied PNG frame data into ffmpeg, yielding chunks
+        of the video encoded in the specified format as soon as they
+        are written by ffmpeg.
+        """
+        cmd = [rcParams['animation.ffmpeg_path'], '-loglevel', 'error', '-nostats',
+               '-f', 'image2pipe', '-vcodec', 'png', '-r', str(self.fps), '-i', 'pipe:0']
+        cmd += (['-vcodec', codec] if codec else []) + list(extra_args)
+        # Fragmented mp4 may be written without seeking in the output
+        cmd += (['-movflags', 'frag_keyframe+empty_moov'] if fmt == 'mp4' else [])
+        cmd += ['-f', fmt, 'pipe:1']
+        # The log is written to a file, as an unread pipe could fill up
+        # and block ffmpeg while frames are still being written to it
+        log = TemporaryFile()
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                stderr=log)
+
+        # Read the output on a thread to avoid blocking ffmpeg
+        chunks = Queue()
+        def read_output():
+            fd = proc.stdout.fileno()
+            for chunk in iter(lambda: os.read(fd, 2**16), b''):
+                chunks.put(chunk)
+            chunks.put(None)
+        reader = Thread(target=read_output)
+        reader.daemon = True
+        reader.start()
+
+        finished = False
+        try:
+            try:
+                for frame in frames:
+                    proc.stdin.write(frame)
+                    while not finished and not chunks.empty():
+                        chunk = chunks.get()
+                        finished = chunk is None
+                        if not finished: yield chunk
+                    if finished: break
+                proc.stdin.close()
+            except (IOError, OSError):
+                pass # Broken pipe, the error is reported below
+            if not finished:
+                for chunk in iter(chunks.get, None):
+                    yield chunk
+            if proc.wait() != 0:
+                log.seek(0)
+                raise IOError("ffmpeg failed to encode the animation: %s"
+                              % log.read().decode('utf-8', 'replace'))
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            log.close()
 
-        return data, {'file-ext':fmt,
-                      'mime_type':MIME_TYPES[fmt]}
 
     @bothmethod
     def supported_holomap_formats(self_or_cls, optional_formats):
@@ -188,11 +379,16 @@ class MPLPlotRenderer(Exporter):
                 warnings.simplefilter("ignore")
                 try:
                     fig = plt.figure()
-                    anim = animation.FuncAnimation(fig, lambda x: x, frames=[0,1])
                     (writer, fmt, anim_kwargs, extra_args) = ANIMATION_OPTS[fmt]
-                    if extra_args != []:
+                    renderer = self_or_cls.instance(dpi=72)
+                    if writer == 'ffmpeg':
+                        # Probe the pipeline used to render ffmpeg formats
+                        frame = renderer.figure_data(fig, 'png', bbox_inches=None)
+                        list(renderer.encode_frames([frame, frame], fmt,
+                                                    anim_kwargs.get('codec'), extra_args))
+                    elif extra_args != []:
+                        anim = animation.FuncAnimation(fig, lambda x: x, frames=[0,1])
                         anim_kwargs = dict(anim_kwargs, extra_args=extra_args)
-                        renderer = self_or_cls.instance(dpi=72)
                         renderer.anim_data(anim, fmt, writer, **anim_kwargs)
                     plt.close(fig)
                     supported.append(fmt)
@@ -205,18 +401,69 @@ class MPLPlotRenderer(Exporter):
     def save(self_or_cls, obj, basename, fmt=None, key={}, info={}, options=None, **kwargs):
         """
         Save a HoloViews object to file, either using an explicitly
-        supplied format or to the appropriate default.
+        supplied format or to the appropriate default. Instead of a
+        basename, a file-like object may be supplied. Animations are
+        written incrementally as they are encoded.
         """
         if info or key:
             raise Exception('MPLPlotRenderer does not support saving metadata to file.')
 
         with StoreOptions.options(obj, options, **kwargs):
-            rendered = self_or_cls(obj, fmt)
-        if rendered is None: return
-        (data, info) = rendered
-        filename ='%s.%s' % (basename, info['file-ext'])
-        with open(filename, 'wb') as f:
-            f.write(self_or_cls.encode(rendered))
+            rendered = self_or_cls.stream(obj, fmt)
+            if rendered is None: return
+            (chunks, info) = rendered
+            if hasattr(basename, 'write'):
+                for chunk in chunks:
+                    basename.write(self_or_cls.encode((chunk, info)))
+                return
+            filename ='%s.%s' % (basename, info['file-ext'])
+            with open(filename, 'wb') as f:
+                for chunk in chunks:
+                    f.write(self_or_cls.encode((chunk, info)))
+
+    def delta_frames(self, plot, indices, keyframe_interval=50, max_delta=0.5):
+        """
+        Renders the frames of the plot at the supplied indices to PNG,
+        encoding each frame as the regions that differ from the most
+        recent keyframe. The static parts of the figure, e.g. axes,
+        ticks, labels and colorbars, are therefore only encoded once
+        per keyframe. A new keyframe is started after every
+        keyframe_interval frames, whenever the size of the figure
+        changes or when the changed regions cover more than the
+        max_delta fraction of the figure.
+
+        Yields an (index, keyframe index, keyframe data, patches,
+        shape) tuple per frame, where the keyframe data is None
+        unless the frame is itself a keyframe, the patches are a list
+        of (x, y, width, height, PNG data) tuples and the shape is the
+        (height, width) of the keyframe in pixels.
+        """
+        keyframe, key_index, since_key, fig = None, None, 0, None
+        for index in indices:
+            fig = plot[index]
+            data = self.figure_data(fig, 'png')
+            image = plt.imread(BytesIO(data))
+            patches = None
+            if (keyframe is not None and keyframe.shape == image.shape
+                and since_key < keyframe_interval):
+                patches = image_patches(keyframe, image)
+                area = sum(p.shape[0]*p.shape[1] for _, _, p in patches)
+                if area > max_delta * image.shape[0] * image.shape[1]:
+                    patches = None
+            if patches is None:
+                keyframe, key_index, since_key = image, index, 0
+                yield index, key_index, data, [], image.shape[:2]
+                continue
+            since_key += 1
+            encoded = []
+            for (x, y, patch) in patches:
+                buff = BytesIO()
+                plt.imsave(buff, patch, format='png')
+                encoded.append((x, y, patch.shape[1], patch.shape[0], buff.getvalue()))
+            yield index, key_index, None, encoded, keyframe.shape[:2]
+        if fig is not None:
+            plt.close(fig)
+
 
     def anim_data(self, anim, fmt, writer, **anim_kwargs):
         """
@@ -9,7 +9,7 @@ import param
 
 from ..core.options import Store
 from ..core import OrderedDict, NdMapping, ViewableElement, CompositeOverlay, HoloMap
-from ..core.util import match_spec
+from ..core.util import match_spec, minmax_decimate, density_subsample
 from ..element import Scatter, Curve, Histogram, Bars, Points, Raster, VectorField, ErrorBars
 from .element import ElementPlot
 from .plot import Plot
@@ -106,6 +106,17 @@ class CurvePlot(ChartPlot):
     show_legend = param.Boolean(default=True, doc="""
         Whether to show legend for the plot.""")
 
+    lod = param.Boolean(default=False, doc="""
+        Whether to decimate curves with more than lod_threshold samples
+        before drawing, retaining only the first, last, minimum and
+        maximum sample per pixel column of the axes. The decimated
+        curve covers the same pixels as the full curve but is much
+        faster to draw and smaller to export. Curves drawn with
+        markers are never decimated.""")
+
+    lod_threshold = param.Integer(default=10000, bounds=(0, None), doc="""
+        The number of samples above which curves are decimated.""")
+
     style_opts = ['alpha', 'color', 'visible', 'linewidth', 'linestyle', 'marker']
 
     def __call__(self, ranges=None):
@@ -124,6 +135,8 @@ class CurvePlot(ChartPlot):
                 self.peak_argmax = np.argmax(element.data[:, 1])
             data = self._cyclic_curves(element)
             xticks = self._cyclic_reduce_ticks(self.xvalues)
+        else:
+            data = self._decimate(element, data, ranges)
 
         # Create line segments and apply style
         style = self.style[self.cyclic_index]
@@ -135,10 +148,28 @@ class CurvePlot(ChartPlot):
         return self._finalize_axis(self.keys[-1], ranges=ranges, xticks=xticks)
 
 
+    def _decimate(self, element, data, ranges):
+        """
+        Decimates the curve data to the resolution of the axes if
+        level-of-detail downsampling applies.
+        """
+        if (not self.lod or len(data) <= self.lod_threshold
+            or self.style[self.cyclic_index].get('marker')):
+            return data
+        x0, _, x1, _ = self.get_extents(element, ranges)
+        if x0 is None or x1 is None or not np.isfinite([x0, x1]).all():
+            x0, x1 = np.nanmin(data[:, 0]), np.nanmax(data[:, 0])
+        # Allow for rendering at up to twice the figure dpi
+        bins = 2 * int(np.ceil(self.handles['axis'].get_window_extent().width))
+        return data[minmax_decimate(data[:, 0], data[:, 1], x0, x1, bins)]
+
+
     def update_handles(self, axis, view, key, ranges=None):
         data = view.data
         if self.cyclic_range is not None:
             data = self._cyclic_curves(view)
+        else:
+            data = self._decimate(view, data, ranges)
         self.handles['line_segment'].set_xdata(data[:, 0])
         self.handles['line_segment'].set_ydata(data[:, 1])
 
@@ -523,6 +554,16 @@ class PointPlot(ChartPlot):
       allows for linear scaling of the area and a factor of 4 linear
       scaling of the point width.""")
 
+    lod = param.Boolean(default=False, doc="""
+        Whether to subsample elements with more than lod_threshold
+        points before drawing. A random subsample of lod_threshold
+        points is drawn, preserving the density of the points, along
+        with one point in every occupied marker sized cell of the
+        axes, so sparse regions and outliers remain visible.""")
+
+    lod_threshold = param.Integer(default=10000, bounds=(1, None), doc="""
+        The number of points above which elements are subsampled.""")
+
     style_opts = ['alpha', 'color', 'edgecolors', 'facecolors',
                   'linewidth', 'marker', 'size', 'visible',
                   'cmap', 'vmin', 'vmax']
@@ -534,11 +575,12 @@ class PointPlot(ChartPlot):
         ranges = self.compute_ranges(self.map, self.keys[-1], ranges)
         ranges = match_spec(points, ranges)
 
-        ndims = points.data.shape[1]
-        xs = points.data[:, 0] if len(points.data) else []
-        ys = points.data[:, 1] if len(points.data) else []
-        sz = points.data[:, self.size_index] if self.size_index < ndims else None
-        cs = points.data[:, self.color_index] if self.color_index < ndims else None
+        data = self._subsample(points, ranges)
+        ndims = data.shape[1]
+        xs = data[:, 0] if len(data) else []
+        ys = data[:, 1] if len(data) else []
+        sz = data[:, self.size_index] if self.size_index < ndims else None
+        cs = data[:, self.color_index] if self.color_index < ndims else None
 
         style = self.style[self.cyclic_index]
         if sz is not None and self.scaling_factor > 1:
@@ -569,13 +611,34 @@ class PointPlot(ChartPlot):
         return (ms*self.scaling_factor**sizes)
 
 
+    def _subsample(self, element, ranges):
+        """
+        Returns the data of the element, subsampled if level-of-detail
+        downsampling applies.
+        """
+        data = element.data
+        if not self.lod or len(data) <= self.lod_threshold:
+            return data
+        extents = self.get_extents(element, ranges)
+        if not all(v is not None and np.isfinite(v) for v in extents):
+            extents = (np.nanmin(data[:, 0]), np.nanmin(data[:, 1]),
+                       np.nanmax(data[:, 0]), np.nanmax(data[:, 1]))
+        # Retain a point in every marker sized cell of the axes
+        bbox = self.handles['axis'].get_window_extent()
+        cell = plt.rcParams['lines.markersize'] * self.handles['fig'].dpi / 72.
+        shape = (int(np.ceil(bbox.width/cell)), int(np.ceil(bbox.height/cell)))
+        return data[density_subsample(data[:, 0], data[:, 1], extents,
+                                      shape, self.lod_threshold)]
+
+
     def update_handles(self, axis, element, key, ranges=None):
         paths = self.handles['paths']
-        paths.set_offsets(element.data[:, 0:2])
-        ndims = element.data.shape[1]
+        data = self._subsample(element, ranges)
+        paths.set_offsets(data[:, 0:2])
+        ndims = data.shape[1]
         if ndims > 2:
-            sz = element.data[:, self.size_index] if self.size_index < ndims else None
-            cs = element.data[:, self.color_index] if self.color_index < ndims else None
+            sz = data[:, self.size_index] if self.size_index < ndims else None
+            cs = data[:, self.color_index] if self.color_index < ndims else None
             opts = self.style[0]
 
             if sz is not None and self.scaling_factor > 1:
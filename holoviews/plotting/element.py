@@ -137,6 +137,11 @@ class ElementPlot(Plot):
             else:
                 select = {d: key[dimensions.index(d)]
                           for d in key_dimensions}
+            # Look up the frame directly if the key matches, ensuring
+            # lazily generated frames are generated one at a time
+            map_key = tuple(select[d] for d in key_dimensions)
+            if map_key in self.map.data:
+                return self.map.data[map_key]
         elif isinstance(key, int):
             return self.map.values()[min([key, len(self.map)-1])]
         else:
@@ -210,8 +215,8 @@ class ElementPlot(Plot):
             if norm_opts.get('framewise', False):
                 extents = view.extents
             else:
-                extent_list = self.map.traverse(lambda x: x.extents, [Element])
-                extents = util.max_extents(extent_list, self.projection == '3d')
+                extents = self._cached(self.map, 'extents', lambda m: util.max_extents(
+                    m.traverse(lambda x: x.extents, [Element]), self.projection == '3d'))
         else:
             extents = (np.NaN,) * num
         return tuple(l2 if l2 is None or np.isfinite(l2) else l1 for l1, l2 in zip(range_extents, extents))
@@ -1,4 +1,5 @@
 from itertools import product, groupby
+from weakref import WeakKeyDictionary
 
 import numpy as np
 import matplotlib
@@ -16,6 +17,26 @@ from ..core.util import sanitize_identifier, int_to_roman,\
 from ..element import Raster, Table
 
 
+def _data_state(obj):
+    """
+    Returns the data of an object along with a cheap summary of its
+    state, used to detect whether cached results derived from the
+    data are stale. Arrays are summarized by the address, shape,
+    strides and dtype of their buffer, mappings by their length and
+    modification count. Modifying an array in place is not detected,
+    so elements updated in place (e.g. when streaming data) should be
+    replaced by a clone holding the new data to update their ranges.
+    """
+    data = obj.data
+    if isinstance(data, np.ndarray):
+        return data, (data.__array_interface__['data'][0], data.shape,
+                      data.strides, data.dtype.str)
+    try:
+        return data, (len(data), getattr(obj, '_modified', None))
+    except TypeError:
+        return data, None
+
+
 class Plot(param.Parameterized):
     """
     A Plot object returns either a matplotlib figure object (when
@@ -89,6 +110,14 @@ class Plot(param.Parameterized):
     # A mapping from ViewableElement types to their corresponding side plot types
     sideplots = {}
 
+    # Caches of the dimension ranges of each element and the ranges
+    # of each normalization group, shared between all plots
+    _element_ranges = WeakKeyDictionary()
+    _group_ranges = WeakKeyDictionary()
+
+    # Per plot cache of results derived from traversing an object
+    _obj_cache = None
+
 
     def __init__(self, figure=None, axis=None, dimensions=None, subplots=None,
                  layout_dimensions=None, uniform=True, keys=None, subplot=False,
@@ -123,33 +152,74 @@ class Plot(param.Parameterized):
         over the whole animation) and finally compute the dimension
         ranges in each group. The new set of ranges is returned.
         """
-        all_table = all(isinstance(el, Table) for el in obj.traverse(lambda x: x, [Element]))
-        if obj is None or not self.normalize or all_table:
+        if obj is None or not self.normalize:
+            return OrderedDict()
+        all_table = self._cached(obj, 'all_table', lambda o: all(
+            isinstance(el, Table) for el in o.traverse(lambda x: x, [Element])))
+        if all_table:
             return OrderedDict()
         # Get inherited ranges
         ranges = {} if ranges is None or self.adjoined else dict(ranges)
 
         # Get element identifiers from current object and resolve
         # with selected normalization options
-        norm_opts = self._get_norm_opts(obj)
+        norm_opts = self._cached(obj, 'norm_opts', self._get_norm_opts)
 
         # Traverse displayed object if normalization applies
         # at this level, and ranges for the group have not
         # been supplied from a composite plot
-        elements = []
-        return_fn = lambda x: x if isinstance(x, Element) else None
+        source = None
         for group, (axiswise, framewise) in norm_opts.items():
             if group in ranges:
                 continue # Skip if ranges are already computed
-            elif not framewise and not self.adjoined: # Traverse to get all elements
-                elements = obj.traverse(return_fn, [group])
-            elif key is not None: # Traverse to get elements for each frame
-                elements = self._get_frame(key).traverse(return_fn, [group])
+            elif not framewise and not self.adjoined: # Ranges over all elements
+                source = obj
+            elif key is not None: # Ranges over the elements in each frame
+                source = self._get_frame(key)
             if not axiswise or (not framewise and isinstance(obj, HoloMap)): # Compute new ranges
-                self._compute_group_range(group, elements, ranges)
+                ranges[group] = self._group_range(source, group)
         return ranges
 
 
+    def _cached(self, obj, name, fn):
+        """
+        Caches the result of calling fn on the supplied object for the
+        lifetime of the plot, recomputing it if the data of the object
+        is replaced or changes shape (see _data_state).
+        """
+        if self._obj_cache is None:
+            self._obj_cache = {}
+        data, state = _data_state(obj)
+        entry = self._obj_cache.get((id(obj), name))
+        if entry is None or entry[0] is not obj or entry[1] is not data or entry[2] != state:
+            entry = (obj, data, state, fn(obj))
+            self._obj_cache[(id(obj), name)] = entry
+        return entry[3]
+
+
+    @classmethod
+    def _group_range(cls, obj, group):
+        """
+        Returns the ranges of all elements in the normalization group
+        within the supplied object. The ranges are cached on the
+        object, allowing the reduction over all the frames of a
+        HoloMap to be reused across frames, plots and re-renders.
+        """
+        ranges = {}
+        if obj is None:
+            return OrderedDict()
+        data, state = _data_state(obj)
+        cached = cls._group_ranges.get(obj)
+        if cached is None or cached[0] is not data or cached[1] != state:
+            cached = (data, state, {})
+            cls._group_ranges[obj] = cached
+        if group not in cached[2]:
+            return_fn = lambda x: x if isinstance(x, Element) else None
+            cls._compute_group_range(group, obj.traverse(return_fn, [group]), ranges)
+            cached[2][group] = ranges[group]
+        return cached[2][group]
+
+
     def _get_norm_opts(self, obj):
         """
         Gets the normalization options for a LabelledData object by
@@ -193,20 +263,37 @@ class Plot(param.Parameterized):
         return norm_opts
 
 
-    @staticmethod
-    def _compute_group_range(group, elements, ranges):
+    @classmethod
+    def _compute_group_range(cls, group, elements, ranges):
         # Iterate over all elements in a normalization group
         # and accumulate their ranges into the supplied dictionary.
         elements = [el for el in elements if el is not None]
         group_ranges = OrderedDict()
         for el in elements:
             for dim in el.dimensions(label=True):
-                dim_range = el.range(dim)
+                dim_range = cls._element_range(el, dim)
                 if dim not in group_ranges:
                     group_ranges[dim] = []
                 group_ranges[dim].append(dim_range)
         ranges[group] = OrderedDict((k, max_range(v)) for k, v in group_ranges.items())
 
+
+    @classmethod
+    def _element_range(cls, element, dim):
+        """
+        Returns the range of an element along the supplied dimension,
+        caching the range until the element data is replaced or
+        changes shape (see _data_state).
+        """
+        data, state = _data_state(element)
+        cached = cls._element_ranges.get(element)
+        if cached is None or cached[0] is not data or cached[1] != state:
+            cached = (data, state, {})
+            cls._element_ranges[element] = cached
+        if dim not in cached[2]:
+            cached[2][dim] = element.range(dim)
+        return cached[2][dim]
+
     def _get_frame(self, key):
         """
         Required on each Plot type to get the data corresponding
@@ -26,6 +26,17 @@ class RasterPlot(ElementPlot):
     show_values = param.Boolean(default=False, doc="""
         Whether to annotate each pixel with its value.""")
 
+    subsample = param.Boolean(default=True, doc="""
+        Whether to only fetch the region of the array visible within
+        the plot extents, subsampled to the resolution of the axes.
+        Allows displaying large memory-mapped or chunked arrays
+        without loading them into memory in full.""")
+
+    oversample = param.Number(default=2, bounds=(1, None), doc="""
+        The number of array samples fetched along each dimension per
+        pixel of the axes when subsampling, ensuring the image remains
+        sharp when rendered at a higher dpi than the figure dpi.""")
+
     style_opts = ['alpha', 'cmap', 'interpolation', 'visible',
                   'filterrad', 'origin', 'clims']
 
@@ -72,6 +83,8 @@ class RasterPlot(ElementPlot):
 
         if isinstance(view, RGB):
             data = view.rgb.data
+        if not isinstance(view, HeatMap):
+            data, (l, r, b, t) = self._visible_data(view, data, (l, r, b, t), ranges)
         elif isinstance(view, HeatMap):
             data = view.data
             data = np.ma.array(data, mask=np.logical_not(np.isfinite(data)))
@@ -100,6 +113,47 @@ class RasterPlot(ElementPlot):
                                    xticks=xticks, yticks=yticks)
 
 
+    def _visible_data(self, view, data, extent, ranges):
+        """
+        Returns the region of the data visible within the plot
+        extents, subsampled to the resolution of the axes, along with
+        the (left, right, bottom, top) extent of the returned data.
+        Only the returned region is fetched from memory-mapped or
+        chunked arrays.
+        """
+        (l, r, b, t) = extent
+        (rows, cols) = data.shape[:2]
+        if not self.subsample or not rows or not cols or l == r or b == t:
+            return data, extent
+
+        x0, y0, x1, y1 = self.get_extents(view, ranges)
+        if not all(v is not None and np.isfinite(v) for v in (x0, y0, x1, y1)):
+            x0, y0, x1, y1 = l, b, r, t
+        # Row zero is at the top of the image extent
+        col_fn = lambda x: (x - l) / float(r - l) * cols
+        row_fn = lambda y: (t - y) / float(t - b) * rows
+        c0, c1 = sorted([col_fn(x0), col_fn(x1)])
+        r0, r1 = sorted([row_fn(y0), row_fn(y1)])
+        c0, c1 = max(0, int(np.floor(c0))), min(cols, int(np.ceil(c1)))
+        r0, r1 = max(0, int(np.floor(r0))), min(rows, int(np.ceil(r1)))
+        if c1 <= c0 or r1 <= r0:
+            return data, extent
+
+        bbox = self.handles['axis'].get_window_extent()
+        width = max(1, int(np.ceil(bbox.width * self.oversample)))
+        height = max(1, int(np.ceil(bbox.height * self.oversample)))
+        xstep, ystep = max(1, (c1-c0) // width), max(1, (r1-r0) // height)
+        # Drop any partial step at the edges (less than a pixel)
+        c1 = c0 + ((c1-c0) // xstep) * xstep
+        r1 = r0 + ((r1-r0) // ystep) * ystep
+        if (c0, c1, r0, r1, xstep, ystep) == (0, cols, 0, rows, 1, 1):
+            return data, extent
+
+        xscale, yscale = (r - l) / float(cols), (t - b) / float(rows)
+        extent = (l + c0*xscale, l + c1*xscale, t - r1*yscale, t - r0*yscale)
+        return data[r0:r1:ystep, c0:c1:xstep], extent
+
+
     def _compute_ticks(self, view, ranges):
         if isinstance(view, HeatMap):
             xdim, ydim = view.key_dimensions
@@ -152,13 +206,6 @@ class RasterPlot(ElementPlot):
 
     def update_handles(self, axis, view, key, ranges=None):
         im = self.handles.get('im', None)
-        im.set_data(view.data)
-
-        if isinstance(view, HeatMap) and self.show_values:
-           self._annotate_values(view)
-        if self.colorbar:
-            self._draw_colorbar(im)
-
         xdim, ydim = view.key_dimensions
         if isinstance(view, Image):
             l, b, r, t = view.bounds.lbrt()
@@ -167,6 +214,16 @@ class RasterPlot(ElementPlot):
             if type(view) == Raster:
                 b, t = t, b
 
+        data = view.data
+        if not isinstance(view, HeatMap):
+            data, (l, r, b, t) = self._visible_data(view, data, (l, r, b, t), ranges)
+        im.set_data(data)
+
+        if isinstance(view, HeatMap) and self.show_values:
+           self._annotate_values(view)
+        if self.colorbar:
+            self._draw_colorbar(im)
+
         val_dim = [d.name for d in view.value_dimensions][0]
         im.set_clim(ranges.get(val_dim))
         im.set_extent((l, r, b, t))
@@ -1,4 +1,3 @@
-from collections import defaultdict
 from matplotlib.font_manager import FontProperties
 from matplotlib.table import Table as mpl_Table
 
@@ -49,16 +48,22 @@ class TablePlot(ElementPlot):
 
     def __init__(self, table, **params):
         super(TablePlot, self).__init__(table, **params)
-        self.cell_values = self._format_table()
+        self.cell_values = {}
 
 
-    def _format_table(self):
-        cell_values = defaultdict(dict)
-        for key in self.keys:
-            frame = self._get_frame(key)
-            if frame is None:
-                continue
-
+    def _format_table(self, key):
+        """
+        Returns the formatted text of the displayed cells of the frame
+        at the given key, indexed by the cell coordinates. Only the
+        rows shown in the (possibly summarized) table are formatted
+        and the cells of each frame are only formatted once, when
+        the frame is first displayed.
+        """
+        if key in self.cell_values:
+            return self.cell_values[key]
+        cell_values = {}
+        frame = self._get_frame(key)
+        if frame is not None:
             # Mapping from the cell coordinates to the dictionary key.
             summarize = frame.rows > self.max_rows
             half_rows = self.max_rows/2
@@ -73,7 +78,8 @@ class TablePlot(ElementPlot):
                             adjusted_row = (frame.rows - self.max_rows + row)
                         value = frame.pprint_cell(adjusted_row, col)
                         cell_text = self.pprint_value(value)
-                    cell_values[key][(row, col)] = cell_text
+                    cell_values[(row, col)] = cell_text
+        self.cell_values[key] = cell_values
         return cell_values
 
 
@@ -108,6 +114,7 @@ class TablePlot(ElementPlot):
         width = size_factor / element.cols
         height = size_factor / element.rows
 
+        cell_values = self._format_table(self.keys[-1])
         summarize = element.rows > self.max_rows
         half_rows = self.max_rows/2
         rows = min([self.max_rows, element.rows])
@@ -116,7 +123,7 @@ class TablePlot(ElementPlot):
             for col in range(element.cols):
                 if summarize and row > half_rows:
                     adjusted_row = (element.rows - self.max_rows + row)
-                cell_value = self.cell_values[self.keys[-1]][(row, col)]
+                cell_value = cell_values[(row, col)]
                 cellfont = self.font_types.get(element.cell_type(adjusted_row,col), None)
                 font_kwargs = dict(fontproperties=cellfont) if cellfont else {}
                 table.add_cell(row, col, width, height, text=cell_value,  loc='center',
@@ -134,8 +141,9 @@ class TablePlot(ElementPlot):
     def update_handles(self, axis, view, key, ranges=None):
         table = self.handles['table']
 
+        cell_values = self._format_table(key)
         for coords, cell in table.get_celld().items():
-            value = self.cell_values[key][coords]
+            value = cell_values[coords]
             cell.set_text_props(text=value)
 
         # Resize fonts across table as necessary
@@ -9,7 +9,7 @@ import zipfile
 import tarfile
 import numpy as np
 from holoviews import Image
-from holoviews.core.io import Serializer, FileArchive
+from holoviews.core.io import Serializer, FileArchive, Unpickler
 from holoviews.element.comparison import ComparisonTestCase
 
 
@@ -43,6 +43,15 @@ class TestFileArchive(ComparisonTestCase):
         self.assertEqual(sorted(filenames), sorted(os.listdir(export_name)))
         self.assertEqual(archive.listing(), [])
 
+    def test_filearchive_image_pickle_stream(self):
+        export_name = 'archive_image'
+        archive = FileArchive(export_name=export_name, pack=False, stream=True)
+        archive.add(self.image1)
+        archive.add(self.image2)
+        archive.export()
+        fname = os.path.join(export_name, 'Group1-Im1.hvz')
+        self.assertEqual(Unpickler.load(fname), self.image1)
+
     def test_filearchive_image_pickle_zip(self):
         export_name = 'archive_image'
         filenames = ['Group1-Im1.hvz', 'Group2-Im2.hvz']
@@ -124,3 +133,73 @@ class TestFileArchive(ComparisonTestCase):
             raise AssertionError("No file %r created on export." % fname)
         self.assertEqual(json.load(open(fname, 'r')), data)
         self.assertEqual(archive.listing(), [])
+
+    def test_filearchive_image_pickle_flush(self):
+        export_name = 'archive_image'
+        archive = FileArchive(export_name=export_name, pack=False, flush=True)
+        archive.add(self.image1)
+        archive.add(self.image2)
+        staging = archive._staging
+        self.assertEqual(len(os.listdir(staging)), 2)
+        self.assertEqual(archive.listing(), ['Group1-Im1.hvz', 'Group2-Im2.hvz'])
+        archive.export()
+        self.assertFalse(os.path.exists(staging))
+        fname = os.path.join(export_name, 'Group2-Im2.hvz')
+        self.assertEqual(Unpickler.load(fname), self.image2)
+
+    def test_filearchive_image_pickle_flush_zip(self):
+        export_name = 'archive_image'
+        archive = FileArchive(export_name=export_name, pack=True,
+                              archive_format='zip', flush=True)
+        archive.add(self.image1)
+        archive.add(self.image2)
+        archive.export()
+        namelist = ['archive_image/Group1-Im1.hvz', 'archive_image/Group2-Im2.hvz']
+        with zipfile.ZipFile(export_name+'.zip', 'r') as f:
+            self.assertEqual(sorted(namelist), sorted(f.namelist()))
+
+    def test_filearchive_image_pickle_thread_executor(self):
+        export_name = 'archive_image'
+        filenames = ['Group1-Im1.hvz', 'Group2-Im2.hvz']
+        archive = FileArchive(export_name=export_name, pack=False,
+                              executor='thread', workers=2)
+        archive.add(self.image1)
+        archive.add(self.image2)
+        self.assertEqual(len(archive), 2)
+        self.assertEqual(archive.listing(), filenames)
+        archive.export()
+        fname = os.path.join(export_name, 'Group2-Im2.hvz')
+        self.assertEqual(Unpickler.load(fname), self.image2)
+
+    def test_filearchive_deduplicate(self):
+        export_name = 'archive_json'
+        data = json.dumps({'meta':'test'})
+        archive = FileArchive(export_name=export_name, pack=False, deduplicate=True)
+        archive.add(filename='a.json', data=data, info={'mime_type':'text/json'})
+        archive.add(filename='b.json', data=data, info={'mime_type':'text/json'})
+        self.assertEqual(archive._files['b.json', ''][0].target, ('a.json', ''))
+        archive.export()
+        self.assertEqual(json.load(open(os.path.join(export_name, 'b.json'))),
+                         {'meta':'test'})
+
+    def test_filearchive_no_deduplication_by_default(self):
+        export_name = 'archive_json'
+        data = json.dumps({'meta':'test'})
+        archive = FileArchive(export_name=export_name, pack=False)
+        archive.add(filename='a.json', data=data, info={'mime_type':'text/json'})
+        archive.add(filename='b.json', data=data, info={'mime_type':'text/json'})
+        archive.export()
+        self.assertEqual(os.stat(os.path.join(export_name, 'b.json')).st_nlink, 1)
+
+    def test_filearchive_deduplicate_tar(self):
+        export_name = 'archive_json'
+        data = json.dumps({'meta':'test'})
+        archive = FileArchive(export_name=export_name, pack=True, archive_format='tar',
+                              deduplicate=True)
+        archive.add(filename='a.json', data=data, info={'mime_type':'text/json'})
+        archive.add(filename='b.json', data=data, info={'mime_type':'text/json'})
+        archive.export()
+        with tarfile.TarFile(export_name+'.tar', 'r') as f:
+            self.assertTrue(f.getmember('archive_json/b.json').islnk())
+            self.assertEqual(f.extractfile('archive_json/b.json').read(),
+                             data.encode('utf-8'))
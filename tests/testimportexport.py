@@ -3,9 +3,14 @@ Unit test of the (non-rendering) exporters and importers.
 """
 
 import os
+import pickle
+import zipfile
 import numpy as np
-from holoviews import Image, Layout
-from holoviews.core.io import Serializer, Pickler, Unpickler, Deserializer
+from unittest import SkipTest
+from holoviews import Image, Layout, HoloMap
+from holoviews.core.element import LazyHoloMap
+from holoviews.core.io import (Serializer, Pickler, Unpickler, Deserializer,
+                               HDF5Exporter, HDF5Importer)
 from holoviews.element.comparison import ComparisonTestCase
 
 
@@ -187,3 +192,242 @@ class TestPicklerAdvanced(ComparisonTestCase):
                                 entries=['Image.I(L)'])
         self.assertEqual(single_layout, loaded)
 
+
+
+
+class TestPicklerArrays(ComparisonTestCase):
+    """
+    Test version 2 of the .hvz format, which stores the arrays of the
+    components as separate .npy members.
+    """
+
+    def setUp(self):
+        self.image1 = Image(np.random.rand(20, 30))
+        self.image2 = Image(np.random.rand(10, 10))
+
+    def tearDown(self):
+        for f in os.listdir('.'):
+            if f.endswith('.hvz'):
+                os.remove(f)
+
+    def test_pickler_arrays_entries(self):
+        Pickler.save(self.image1+self.image2, 'test_pickler_arrays_entries', version=2)
+        entries = Unpickler.entries('test_pickler_arrays_entries.hvz')
+        self.assertEqual(entries, ['Image.I', 'Image.II'])
+
+    def test_pickler_arrays_save_load_mmap(self):
+        Pickler.save(self.image1, 'test_pickler_arrays_mmap', version=2, compress=False)
+        loaded = Unpickler.load('test_pickler_arrays_mmap.hvz')
+        self.assertTrue(isinstance(loaded.data, np.memmap))
+        self.assertEqual(loaded, self.image1)
+
+    def test_pickler_arrays_save_load_compressed(self):
+        Pickler.save(self.image1+self.image2, 'test_pickler_arrays_compressed', version=2)
+        loaded = Unpickler.load('test_pickler_arrays_compressed.hvz', entries=['Image.II'])
+        self.assertFalse(isinstance(loaded.data, np.memmap))
+        self.assertEqual(loaded, self.image2)
+
+    def test_pickler_arrays_in_memory(self):
+        data, _ = Pickler(self.image1, version=2)
+        self.assertEqual(Unpickler(data), self.image1)
+
+    def test_pickler_arrays_version_metadata(self):
+        Pickler.save(self.image1, 'test_pickler_arrays_version', version=2)
+        self.assertEqual(Unpickler._load_metadata('test_pickler_arrays_version.hvz',
+                                                  'version'), 2)
+
+
+
+class TestPicklerFrames(ComparisonTestCase):
+    """
+    Test loading selected frames of HoloMaps stored in version 2 of
+    the .hvz format.
+    """
+
+    def setUp(self):
+        self.hmap = HoloMap({i: Image(np.random.rand(5, 5)) for i in range(10)},
+                            key_dimensions=['Time'])
+        Pickler.save(self.hmap, 'test_pickler_frames', version=2)
+        self.filename = 'test_pickler_frames.hvz'
+
+    def tearDown(self):
+        for f in os.listdir('.'):
+            if f.endswith('.hvz'):
+                os.remove(f)
+
+    def test_pickler_frames_index(self):
+        [(entry, keys)] = Unpickler.index(self.filename).items()
+        self.assertEqual(Unpickler.entries(self.filename), [entry])
+        self.assertEqual(keys, [(i,) for i in range(10)])
+
+    def test_pickler_frames_stored_separately(self):
+        with zipfile.ZipFile(self.filename, 'r') as f:
+            frames = [n for n in f.namelist() if n.startswith('frames/')]
+        self.assertEqual(len(frames), 10)
+
+    def test_pickler_frames_load_all(self):
+        self.assertEqual(Unpickler.load(self.filename), self.hmap)
+
+    def test_pickler_frames_load_keys(self):
+        loaded = Unpickler.load(self.filename, keys=[3, 7])
+        self.assertEqual(loaded.keys(), [3, 7])
+        self.assertEqual(loaded[7], self.hmap[7])
+
+    def test_pickler_frames_load_slice(self):
+        loaded = Unpickler.load(self.filename, keys=slice(2, 5))
+        self.assertEqual(loaded.keys(), [2, 3, 4])
+
+    def test_pickler_frames_load_missing_key(self):
+        self.assertRaises(KeyError, Unpickler.load, self.filename, keys=[11])
+
+    def test_pickler_frames_lazy(self):
+        lazy = Unpickler.lazy(self.filename)
+        self.assertTrue(isinstance(lazy, LazyHoloMap))
+        self.assertEqual(lazy.keys(), self.hmap.keys())
+        self.assertEqual(lazy[5], self.hmap[5])
+
+
+
+class TestPicklerAppend(ComparisonTestCase):
+    """
+    Test appending objects and HoloMap frames to .hvz archives.
+    """
+
+    def setUp(self):
+        self.hmap = HoloMap({i: Image(np.random.rand(5, 5)) for i in range(6)},
+                            key_dimensions=['Time'])
+        self.filename = 'test_pickler_append.hvz'
+
+    def tearDown(self):
+        for f in os.listdir('.'):
+            if f.endswith('.hvz'):
+                os.remove(f)
+
+    def test_pickler_append_creates_archive(self):
+        Pickler.append(self.hmap, self.filename, version=2)
+        self.assertEqual(Unpickler.load(self.filename), self.hmap)
+
+    def test_pickler_append_frames(self):
+        Pickler.save(self.hmap[0:3], self.filename, version=2)
+        Pickler.append(self.hmap[3:6], self.filename, version=2)
+        self.assertEqual(Unpickler.load(self.filename), self.hmap)
+        self.assertEqual(Unpickler.load(self.filename, keys=[4])[4], self.hmap[4])
+
+    def test_pickler_append_writes_index_updates(self):
+        Pickler.save(self.hmap[0:1], self.filename, version=2)
+        for i in range(1, 6):
+            Pickler.append(self.hmap[i:i+1], self.filename, version=2)
+        with zipfile.ZipFile(self.filename) as f:
+            names = f.namelist()
+            updates = [pickle.loads(f.read(n)) for n in names if n.startswith('appended/')]
+        self.assertEqual(names.count('metadata'), 1)
+        self.assertEqual([u['index'] for u in updates],
+                         [{'HoloMap.': [(i,)]} for i in range(1, 6)])
+        self.assertEqual(Unpickler.index(self.filename), {'HoloMap.': list(self.hmap.data.keys())})
+        self.assertEqual(Unpickler.lazy(self.filename)[5], self.hmap[5])
+
+    def test_pickler_append_duplicate_frames(self):
+        Pickler.save(self.hmap, self.filename, version=2)
+        self.assertRaises(ValueError, Pickler.append, self.hmap[0:1],
+                          self.filename, version=2)
+
+    def test_pickler_append_version1_entry(self):
+        Pickler.save(self.hmap[0:3], self.filename)
+        self.assertRaises(ValueError, Pickler.append, self.hmap[3:6], self.filename)
+
+    def test_pickler_append_entry_and_metadata(self):
+        image = Image(np.random.rand(3, 3), group='Other')
+        Pickler.save(self.hmap, self.filename, version=2, key={'a': 1})
+        Pickler.append(image, self.filename, key={'b': 2})
+        self.assertEqual(len(Unpickler.entries(self.filename)), 2)
+        self.assertEqual(Unpickler.load(self.filename, entries=['Other.']), image)
+        self.assertEqual(Unpickler.key(self.filename), {'a': 1, 'b': 2})
+
+
+
+class TestHDF5(ComparisonTestCase):
+    """
+    Test saving HoloMaps to HDF5 files and loading selected frames and
+    regions of them.
+    """
+
+    def setUp(self):
+        try:
+            import h5py # noqa (Availability check)
+        except ImportError:
+            raise SkipTest("h5py required to test the HDF5 exporter")
+        self.hmap = HoloMap({(i, j): Image(np.random.rand(8, 8))
+                             for i in range(4) for j in range(2)},
+                            key_dimensions=['Time', 'Trial'])
+        HDF5Exporter.save(self.hmap, 'test_hdf5', key={'a': 1})
+        self.filename = 'test_hdf5.h5'
+
+    def tearDown(self):
+        for f in os.listdir('.'):
+            if f.endswith('.h5'):
+                os.remove(f)
+
+    def test_hdf5_load(self):
+        self.assertEqual(HDF5Importer.load(self.filename), self.hmap)
+
+    def test_hdf5_metadata(self):
+        self.assertEqual(HDF5Importer.key(self.filename), {'a': 1})
+        self.assertEqual(HDF5Importer.info(self.filename)['file-ext'], 'h5')
+
+    def test_hdf5_index(self):
+        [(entry, keys)] = HDF5Importer.index(self.filename).items()
+        self.assertEqual(HDF5Importer.entries(self.filename), [entry])
+        self.assertEqual(keys, self.hmap.keys())
+
+    def test_hdf5_load_key_range(self):
+        loaded = HDF5Importer.load(self.filename, keys={'Time': (1, 3), 'Trial': (1, None)})
+        self.assertEqual(loaded.keys(), [(1, 1), (2, 1)])
+        self.assertEqual(loaded[2, 1], self.hmap[2, 1])
+
+    def test_hdf5_load_region(self):
+        loaded = HDF5Importer.load(self.filename, keys=[(0, 0)], region=(-0.5, 0, 0, 0.5))
+        self.assertEqual(loaded[0, 0], self.hmap[0, 0][-0.5:0, 0:0.5])
+
+    def test_hdf5_layout(self):
+        image = Image(np.random.rand(3, 3), group='Other')
+        layout = self.hmap + image
+        HDF5Exporter.save(layout, 'test_hdf5_layout')
+        self.assertEqual(HDF5Importer.load('test_hdf5_layout.h5'), layout)
+
+    def test_hdf5_layout_key_range(self):
+        image = Image(np.random.rand(3, 3), group='Other')
+        HDF5Exporter.save(self.hmap + image, 'test_hdf5_layout')
+        loaded = HDF5Importer.load('test_hdf5_layout.h5', keys={'Time': (2, None)})
+        self.assertEqual(loaded.HoloMap.I.keys(), [(2, 0), (2, 1), (3, 0), (3, 1)])
+        self.assertEqual(loaded.Other.I, image)
+
+    def test_hdf5_load_key_range_categorical(self):
+        hmap = HoloMap({(c,): Image(np.random.rand(8, 8)) for c in 'abc'},
+                       key_dimensions=['Name'])
+        HDF5Exporter.save(hmap, 'test_hdf5_names')
+        loaded = HDF5Importer.load('test_hdf5_names.h5', keys={'Name': ('b', None)})
+        self.assertEqual(loaded.keys(), ['b', 'c'])
+
+    def test_hdf5_lazy(self):
+        lazy = HDF5Importer.lazy(self.filename)
+        self.assertTrue(isinstance(lazy, LazyHoloMap))
+        self.assertEqual(lazy.keys(), self.hmap.keys())
+        self.assertEqual(lazy[3, 1], self.hmap[3, 1])
+
+    def test_hdf5_lazy_shares_file(self):
+        lazy = HDF5Importer.lazy(self.filename)
+        frames = lazy.data.function
+        lazy[0, 0], lazy[1, 0]
+        handle = frames._file
+        lazy[2, 0]
+        self.assertIs(frames._file, handle)
+        frames.close()
+        self.assertIs(frames._file, None)
+
+    def test_hdf5_save_compression_override(self):
+        import h5py
+        HDF5Exporter.save(self.hmap, 'test_hdf5_uncompressed', compression=None,
+                          array_nbytes=0)
+        with h5py.File('test_hdf5_uncompressed.h5', 'r') as f:
+            entry = HDF5Importer._entries(f)[0]
+            self.assertEqual(f[entry]['frames']['0']['0'].compression, None)
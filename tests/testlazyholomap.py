@@ -0,0 +1,151 @@
+"""
+Tests of the LazyHoloMap, which generates its frames on demand.
+"""
+
+from unittest import SkipTest
+import numpy as np
+
+from holoviews import Image, Curve, HoloMap
+from holoviews.core import LazyHoloMap
+from holoviews.core.util import FrameCache
+from holoviews.element.comparison import ComparisonTestCase
+
+try:
+    from matplotlib import pyplot
+    pyplot.switch_backend('agg')
+    from holoviews.plotting import CurvePlot
+except:
+    pyplot = None
+
+
+class LazyHoloMapTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.generated = []
+
+    def image(self, t):
+        self.generated.append(t)
+        return Image(np.ones((10, 10))*t)
+
+    def test_lazy_construct_generates_nothing(self):
+        hmap = LazyHoloMap(self.image, keys=[2, 0, 1], key_dimensions=['Time'])
+        self.assertEqual(hmap.keys(), [0, 1, 2])
+        self.assertEqual(self.generated, [])
+
+    def test_lazy_getitem(self):
+        hmap = LazyHoloMap(self.image, keys=range(10), key_dimensions=['Time'])
+        self.assertEqual(hmap[3].data, np.ones((10, 10))*3)
+        self.assertEqual(self.generated, [3])
+
+    def test_lazy_getitem_cached(self):
+        hmap = LazyHoloMap(self.image, keys=range(10), key_dimensions=['Time'])
+        hmap[3], hmap[3]
+        self.assertEqual(self.generated, [3])
+
+    def test_lazy_cache_budget(self):
+        hmap = LazyHoloMap(self.image, keys=range(10), key_dimensions=['Time'],
+                           cache_budget=2*800)
+        for t in [0, 1, 2, 0]:
+            hmap[t]
+        self.assertEqual(self.generated, [0, 1, 2, 0])
+        self.assertEqual(len(hmap.data.cache), 2)
+
+    def test_lazy_last(self):
+        hmap = LazyHoloMap(self.image, keys=range(10), key_dimensions=['Time'])
+        self.assertEqual(hmap.last.data, np.ones((10, 10))*9)
+        self.assertEqual(self.generated, [9])
+
+    def test_lazy_type_and_group(self):
+        hmap = LazyHoloMap(self.image, keys=range(10), key_dimensions=['Time'])
+        self.assertEqual(hmap.type, Image)
+        self.assertEqual(hmap.group, 'LazyHoloMap')
+        self.assertEqual(self.generated, [0])
+
+    def test_lazy_slice(self):
+        hmap = LazyHoloMap(self.image, keys=range(10), key_dimensions=['Time'])
+        sliced = hmap[2:5]
+        self.assertEqual(type(sliced), LazyHoloMap)
+        self.assertEqual(sliced.keys(), [2, 3, 4])
+        self.assertEqual(self.generated, [0])
+
+    def test_lazy_map(self):
+        hmap = LazyHoloMap(self.image, keys=range(10), key_dimensions=['Time'])
+        mapped = hmap.map(lambda x: x.clone(group='Mapped'), [Image])
+        self.assertEqual(mapped[4].group, 'Mapped')
+        self.assertEqual(self.generated, [0, 4])
+
+    def test_lazy_setitem(self):
+        hmap = LazyHoloMap(self.image, keys=[0, 2], key_dimensions=['Time'])
+        hmap[1] = Image(np.zeros((10, 10)))
+        self.assertEqual(hmap.keys(), [0, 1, 2])
+        self.assertEqual(hmap[1].data, np.zeros((10, 10)))
+        self.assertEqual(self.generated, [0])
+
+    def test_lazy_items(self):
+        hmap = LazyHoloMap(self.image, keys=range(3), key_dimensions=['Time'])
+        self.assertEqual([k for k, v in hmap.items()], [0, 1, 2])
+
+    def test_lazy_equals_holomap(self):
+        hmap = LazyHoloMap(self.image, keys=range(3), key_dimensions=['Time'])
+        holomap = HoloMap([(t, self.image(t)) for t in range(3)],
+                          key_dimensions=['Time'])
+        self.assertEqual(HoloMap(hmap), holomap)
+
+    def test_lazy_multi_dimensional(self):
+        hmap = LazyHoloMap(lambda a, b: Image(np.ones((2, 2))*a*b),
+                           keys=[(a, b) for a in range(3) for b in range(3)],
+                           key_dimensions=['A', 'B'])
+        self.assertEqual(hmap[2, 2].data, np.ones((2, 2))*4)
+
+
+
+class FrameCacheTest(ComparisonTestCase):
+
+    def test_frame_cache_lru(self):
+        cache = FrameCache(budget=2, size_fn=lambda x: 1)
+        cache['a'], cache['b'] = 1, 2
+        cache.get('a')
+        cache['c'] = 3
+        self.assertEqual(cache.keys(), ['a', 'c'])
+        self.assertEqual(cache.nbytes, 2)
+
+    def test_frame_cache_max_items(self):
+        cache = FrameCache(max_items=2)
+        cache['a'], cache['b'] = 1, 2
+        cache.get('a')
+        cache['c'] = 3
+        self.assertEqual(cache.keys(), ['a', 'c'])
+
+    def test_frame_cache_keeps_oversized_item(self):
+        cache = FrameCache(budget=1, size_fn=lambda x: 10)
+        cache['a'] = 1
+        self.assertEqual(cache.keys(), ['a'])
+
+
+
+class LazyHoloMapPlotTest(ComparisonTestCase):
+
+    def setUp(self):
+        if pyplot is None:
+            raise SkipTest("Matplotlib required to test plotting")
+
+    def test_lazy_plot_frames_on_demand(self):
+        hmap = LazyHoloMap(lambda t: Curve([(0, t), (1, t)]), keys=range(5),
+                           key_dimensions=['Time'], cache_budget=0)
+        plot = CurvePlot(hmap)
+        plot[3]
+        self.assertEqual(plot.handles['line_segment'].get_ydata(), np.array([3, 3]))
+        self.assertEqual(len(hmap.data.cache), 1)
+
+    def test_lazy_plot_update_generates_single_frame(self):
+        generated = []
+        def curve(t):
+            generated.append(t)
+            return Curve([(0, t), (1, t)])
+        hmap = LazyHoloMap(curve, keys=range(5), key_dimensions=['Time'],
+                           cache_budget=0)
+        plot = CurvePlot(hmap)
+        plot[3]
+        del generated[:]
+        plot[2]
+        self.assertEqual(generated, [2])
@@ -1,7 +1,7 @@
 from collections import OrderedDict
 
 from holoviews.core import Dimension
-from holoviews.core.ndmapping import MultiDimensionalMapping
+from holoviews.core.ndmapping import MultiDimensionalMapping, NdMapping
 from holoviews.element.comparison import ComparisonTestCase
 
 
@@ -108,3 +108,102 @@ class NdIndexableMappingTest(ComparisonTestCase):
         ndmap = MultiDimensionalMapping(data, key_dimensions=[self.dim1])
 
         self.assertEqual(list(ndmap.keys()), [0, 1])
+
+    def test_idxmapping_setitem_sorted_insert(self):
+        ndmap = MultiDimensionalMapping(key_dimensions=[self.dim1])
+        for k in [3, 1, 4, 0, 2]:
+            ndmap[k] = str(k)
+        self.assertEqual(list(ndmap.keys()), [0, 1, 2, 3, 4])
+        self.assertEqual(list(ndmap.values()), ['0', '1', '2', '3', '4'])
+
+    def test_idxmapping_setitem_sorted_insert_after_pop(self):
+        ndmap = MultiDimensionalMapping([(0, 'a'), (2, 'c')], key_dimensions=[self.dim1])
+        ndmap.pop(0)
+        ndmap[1] = 'b'
+        ndmap[3] = 'd'
+        self.assertEqual(list(ndmap.keys()), [1, 2, 3])
+
+    def test_idxmapping_categorical_sorted_insert(self):
+        dim = Dimension('strdim', values=['z', 'b', 'a'])
+        ndmap = MultiDimensionalMapping(key_dimensions=[dim])
+        for k in ['a', 'z', 'b']:
+            ndmap[k] = k
+        self.assertEqual(list(ndmap.keys()), ['z', 'b', 'a'])
+
+    def test_idxmapping_groupby(self):
+        data = [((0, 0.5), 'a'), ((1, 0.5), 'b'), ((0, 1.5), 'c')]
+        ndmap = MultiDimensionalMapping(data, key_dimensions=[self.dim1, self.dim2])
+        grouped = ndmap.groupby(['floatdim'])
+        self.assertEqual(list(grouped.keys()), [0.5, 1.5])
+        self.assertEqual(list(grouped[0.5].items()), [(0, 'a'), (1, 'b')])
+
+    def test_idxmapping_pickle_categorical(self):
+        import pickle
+        dim = Dimension('strdim', values=['z', 'b', 'a'])
+        ndmap = MultiDimensionalMapping([('a', 1), ('z', 2)], key_dimensions=[dim])
+        unpickled = pickle.loads(pickle.dumps(ndmap))
+        unpickled['b'] = 3
+        self.assertEqual(list(unpickled.keys()), ['z', 'b', 'a'])
+
+
+
+class NdMappingSlicingTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.dim1 = Dimension('intdim')
+        self.dim2 = Dimension('strdim', values=['c', 'b', 'a'])
+        items = [((i, s), i) for i in range(10) for s in ['a', 'b', 'c']]
+        self.ndmap = NdMapping(items, key_dimensions=[self.dim1, self.dim2])
+
+    def test_ndmapping_slice_range(self):
+        sliced = self.ndmap[2:4, 'b']
+        self.assertEqual(sliced.keys(), [(2, 'b'), (3, 'b')])
+
+    def test_ndmapping_slice_upto_from(self):
+        self.assertEqual(self.ndmap[:1, 'a'].keys(), [(0, 'a')])
+        self.assertEqual(self.ndmap[8:, 'a'].keys(), [(9, 'a')])
+
+    def test_ndmapping_slice_set(self):
+        sliced = self.ndmap[{1, 5}, {'a', 'c'}]
+        self.assertEqual(sliced.keys(), [(1, 'c'), (1, 'a'), (5, 'c'), (5, 'a')])
+
+    def test_ndmapping_slice_step(self):
+        sliced = self.ndmap[0:6:2, 'c']
+        self.assertEqual(sliced.keys(), [(0, 'c'), (2, 'c'), (4, 'c')])
+
+    def test_ndmapping_slice_categorical_range(self):
+        sliced = self.ndmap[0, 'c':'a']
+        self.assertEqual(sliced.keys(), [(0, 'c'), (0, 'b')])
+
+    def test_ndmapping_slice_after_setitem(self):
+        self.ndmap[:2, 'a']
+        self.ndmap[10, 'a'] = 10
+        self.assertEqual(self.ndmap[9:, 'a'].keys(), [(10, 'a')])
+
+    def test_ndmapping_slice_string_dimension(self):
+        ndmap = NdMapping([('x', 1), ('y', 2), ('z', 3)], key_dimensions=['string'])
+        self.assertEqual(ndmap['x':'z'].keys(), ['x', 'y'])
+
+    def test_idxmapping_setitem_reorders_once_on_access(self):
+        ndmap = MultiDimensionalMapping([(5, 'f')], key_dimensions=[self.dim1])
+        for k in [4, 3, 2]:
+            ndmap[k] = str(k)
+        self.assertEqual(list(ndmap.__dict__['data'].keys()), [(5,), (4,), (3,), (2,)])
+        self.assertEqual(list(ndmap.keys()), [2, 3, 4, 5])
+        self.assertEqual(list(ndmap.__dict__['data'].keys()), [(2,), (3,), (4,), (5,)])
+
+    def test_idxmapping_pop_pending_reorder(self):
+        ndmap = MultiDimensionalMapping([(2, 'c')], key_dimensions=[self.dim1])
+        ndmap[0] = 'a'
+        self.assertEqual(ndmap.pop((2,)), 'c')
+        ndmap[1] = 'b'
+        self.assertEqual(list(ndmap.items()), [(0, 'a'), (1, 'b')])
+
+    def test_idxmapping_pickle_pending_reorder(self):
+        import pickle
+        ndmap = MultiDimensionalMapping([(2, 'c')], key_dimensions=[self.dim1])
+        ndmap[0] = 'a'
+        unpickled = pickle.loads(pickle.dumps(ndmap))
+        self.assertEqual(list(unpickled.keys()), [0, 2])
+        unpickled[1] = 'b'
+        self.assertEqual(list(unpickled.keys()), [0, 1, 2])
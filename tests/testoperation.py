@@ -0,0 +1,353 @@
+"""
+Tests of the memoization, batched and parallel processing of
+operations and
+of the contours (including marching squares), convolve and histogram
+operations.
+"""
+import pickle
+import shutil
+import tempfile
+import numpy as np
+
+from holoviews import Image, HoloMap, Curve, Layout, NdOverlay, Histogram
+from holoviews.core.operation import ElementOperation, MapOperation, TreeOperation
+from holoviews.core.util import FrameCache, FileCache
+from holoviews.operation.element import (threshold, gradient, contours, convolve,
+                                          histogram, transform, marching_squares)
+from holoviews.element.comparison import ComparisonTestCase
+
+
+class counted_threshold(threshold):
+
+    calls = 0
+
+    def _process(self, matrix, key=None):
+        counted_threshold.calls += 1
+        return super(counted_threshold, self)._process(matrix, key)
+
+
+
+class stacked_threshold(threshold):
+
+    stacks = []
+
+    def _process_stack(self, stack, matrix):
+        stacked_threshold.stacks.append(stack.shape)
+        return super(stacked_threshold, self)._process_stack(stack, matrix)
+
+
+
+class curve_sum(MapOperation):
+
+    def _process(self, holomap):
+        return Curve([(0, sum(el.data[0, 1] for el in holomap))], group=self.p.group)
+
+
+
+class recorded_curve_sum(curve_sum):
+
+    def _process(self, holomap):
+        self.calls.append(dict(self.p))
+        return super(recorded_curve_sum, self)._process(holomap)
+
+
+
+class negate_tree(TreeOperation):
+
+    def _process(self, tree, key=None):
+        return [el.clone(-el.data) for el in tree]
+
+
+
+class MemoizedOperationTest(ComparisonTestCase):
+
+    def setUp(self):
+        counted_threshold.calls = 0
+        self.memo_cache = ElementOperation.memo_cache
+        ElementOperation.memo_cache = FrameCache(budget=None)
+        self.image = Image(np.arange(9.).reshape(3, 3) / 9.)
+
+    def tearDown(self):
+        ElementOperation.memo_cache = self.memo_cache
+        ElementOperation.disk_cache = None
+
+    def test_memoize_disabled_by_default(self):
+        counted_threshold(self.image)
+        counted_threshold(self.image)
+        self.assertEqual(counted_threshold.calls, 2)
+
+    def test_memoize_same_element(self):
+        first = counted_threshold(self.image, memoize=True)
+        second = counted_threshold(self.image.clone(), memoize=True)
+        self.assertEqual(counted_threshold.calls, 1)
+        self.assertEqual(first, second)
+
+    def test_memoize_param_override(self):
+        low = counted_threshold(self.image, memoize=True, level=0.1)
+        high = counted_threshold(self.image, memoize=True, level=0.85)
+        self.assertEqual(counted_threshold.calls, 2)
+        self.assertEqual(low.data.sum(), 8)
+        self.assertEqual(high.data.sum(), 1)
+
+    def test_memoize_lambda_operators(self):
+        first = transform(self.image, operator=lambda x: x+1, memoize=True)
+        second = transform(self.image, operator=lambda x: x*100, memoize=True)
+        self.assertEqual(first.data[0, 0], 1.)
+        self.assertEqual(second.data[1, 1], self.image.data[1, 1]*100)
+
+    def test_memoize_returns_clones(self):
+        first = counted_threshold(self.image, memoize=True)
+        second = counted_threshold(self.image, memoize=True)
+        self.assertFalse(first is second)
+        self.assertEqual(first, second)
+
+    def test_memoize_data_changes(self):
+        counted_threshold(self.image, memoize=True)
+        counted_threshold(self.image.clone(self.image.data*2), memoize=True)
+        self.assertEqual(counted_threshold.calls, 2)
+
+    def test_memoize_holomap(self):
+        hmap = HoloMap({0: self.image, 1: self.image.clone()})
+        counted_threshold(hmap, memoize=True)
+        counted_threshold(hmap, memoize=True)
+        self.assertEqual(counted_threshold.calls, 2)
+
+    def test_memoize_process_element(self):
+        op = counted_threshold.instance()
+        op.process_element(self.image, None, memoize=True)
+        op.process_element(self.image, None, memoize=True)
+        self.assertEqual(counted_threshold.calls, 1)
+
+    def test_memoize_disk_cache(self):
+        path = tempfile.mkdtemp()
+        try:
+            ElementOperation.disk_cache = FileCache(path)
+            first = counted_threshold(self.image, memoize=True)
+            ElementOperation.memo_cache.clear()
+            second = counted_threshold(self.image, memoize=True)
+            self.assertEqual(counted_threshold.calls, 1)
+            self.assertEqual(first, second)
+        finally:
+            shutil.rmtree(path)
+
+
+
+class StackedOperationTest(ComparisonTestCase):
+
+    def setUp(self):
+        stacked_threshold.stacks = []
+        self.hmap = HoloMap({i: Image(np.random.rand(4, 5)*i, bounds=(0, 0, 5, 4))
+                             for i in range(5)}, key_dimensions=['Time'])
+
+    def assert_matches_serial(self, operation, hmap, **params):
+        serial = type('serial', (operation,), {'stackable': ()})
+        self.assertEqual(operation(hmap, **params), serial(hmap, **params))
+
+    def test_threshold_stacked(self):
+        self.assert_matches_serial(threshold, self.hmap, level=1)
+
+    def test_gradient_stacked(self):
+        self.assert_matches_serial(gradient, self.hmap)
+
+    def test_stacked_batches(self):
+        stacked_threshold(self.hmap)
+        self.assertEqual(stacked_threshold.stacks, [(4, 5), (4, 4, 5)])
+
+    def test_stacked_batches_split_on_frame_state(self):
+        self.hmap[5] = Image(np.random.rand(2, 2))
+        self.hmap[6] = Image(np.random.rand(2, 2))
+        self.hmap[7] = Image(np.random.rand(4, 5), bounds=(0, 0, 1, 1))
+        processed = stacked_threshold(self.hmap)
+        self.assertEqual(stacked_threshold.stacks,
+                         [(4, 5), (4, 4, 5), (2, 2), (1, 2, 2), (4, 5)])
+        self.assertEqual(processed.keys(), list(range(8)))
+        self.assertEqual(processed[7].bounds.lbrt(), (0, 0, 1, 1))
+
+    def test_stacked_batch_size(self):
+        stacked = type('stacked', (stacked_threshold,), {'stack_nbytes': 2*4*5*8})
+        stacked(self.hmap)
+        self.assertEqual(stacked_threshold.stacks, [(4, 5), (2, 4, 5), (2, 4, 5)])
+
+    def test_stacked_frames_do_not_share_dimensions(self):
+        processed = threshold(self.hmap)
+        self.assertIsNot(processed[1].key_dimensions, processed[2].key_dimensions)
+        self.assertEqual(processed[1].key_dimensions, processed[2].key_dimensions)
+
+    def test_stacked_unstackable_type_error(self):
+        hmap = HoloMap({i: Curve([(0, i)]) for i in range(2)})
+        self.assertRaises(TypeError, threshold, hmap)
+
+
+
+class ParallelOperationTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.hmap = HoloMap({i: Image(np.random.rand(4, 5)*i) for i in range(8)},
+                            key_dimensions=['Time'])
+
+    def test_threshold_thread_executor(self):
+        self.assertEqual(threshold(self.hmap, executor='thread', workers=3, level=1),
+                         threshold(self.hmap, level=1))
+
+    def test_threshold_process_executor(self):
+        self.assertEqual(threshold(self.hmap, executor='process', workers=2, level=1),
+                         threshold(self.hmap, level=1))
+
+    def test_operation_pickle_omits_overrides(self):
+        op = threshold.instance(level=0.5)
+        op(self.hmap.last, level=2)
+        unpickled = pickle.loads(pickle.dumps(op))
+        self.assertFalse('p' in unpickled.__dict__)
+        self.assertEqual(unpickled.level, 0.5)
+
+    def test_thread_executor_leaves_overrides(self):
+        op = threshold.instance(executor='thread', workers=3)
+        op(self.hmap, level=1)
+        self.assertEqual(dict(op.p), {'level': 1})
+
+    def test_parallel_executor_preserves_key_order(self):
+        processed = gradient(self.hmap, executor='thread', workers=3)
+        self.assertEqual(processed.keys(), self.hmap.keys())
+
+    def test_tree_operation_thread_executor(self):
+        layout = self.hmap + self.hmap.clone(group='Other')
+        self.assertEqual(negate_tree(layout, executor='thread'), negate_tree(layout))
+
+    def test_collapse_map_operation_thread_executor(self):
+        hmap = HoloMap({(a, b): Curve([(0, a*b)]) for a in range(3) for b in range(3)},
+                       key_dimensions=['A', 'B'])
+        collapsed = hmap.collapse(['B'], curve_sum.instance(executor='thread'))
+        self.assertEqual(collapsed.keys(), [0, 1, 2])
+        self.assertEqual([el.data[0, 1] for el in collapsed.values()], [0, 3, 6])
+
+    def test_serial_executor_uses_operation_instance(self):
+        op = recorded_curve_sum.instance()
+        op.calls = []
+        hmap = HoloMap({(a, b): Curve([(0, a*b)]) for a in range(2) for b in range(2)},
+                       key_dimensions=['A', 'B'])
+        hmap.collapse(['B'], op)
+        self.assertEqual(len(op.calls), 2)
+
+    def test_collapse_does_not_forward_executor_params(self):
+        op = recorded_curve_sum.instance()
+        op.calls = []
+        hmap = HoloMap({(a, b): Curve([(0, a*b)]) for a in range(2) for b in range(2)},
+                       key_dimensions=['A', 'B'])
+        hmap.collapse(['B'], op, executor='serial', workers=2, timeout=10, group='Sum')
+        self.assertEqual(op.calls, [{'group': 'Sum'}] * 2)
+
+
+
+class TestMarchingSquares(ComparisonTestCase):
+
+    def test_marching_squares_open_contour(self):
+        arr = np.tile(np.arange(5.), (4, 1))
+        [path] = marching_squares(arr, 2.5)
+        self.assertEqual(path, np.array([[0, 2.5], [1, 2.5], [2, 2.5], [3, 2.5]]))
+
+    def test_marching_squares_closed_contour(self):
+        ys, xs = np.mgrid[-1:1:41j, -1:1:41j]
+        [path] = marching_squares(np.sqrt(xs**2 + ys**2), 0.5)
+        self.assertEqual(path[0], path[-1])
+        radii = np.hypot(path[:, 0]-20, path[:, 1]-20) / 20.
+        self.assertTrue(np.allclose(radii, 0.5, atol=1e-3))
+
+    def test_marching_squares_saddle_joins_corners_above_mean(self):
+        paths = marching_squares(np.array([[1., 0], [0, 1]]), 0.5)
+        self.assertEqual(paths[0], np.array([[0, 0.5], [0.5, 1]]))
+        self.assertEqual(paths[1], np.array([[1, 0.5], [0.5, 0]]))
+
+    def test_marching_squares_skips_nan_cells(self):
+        arr = np.tile(np.arange(5.), (6, 1))
+        arr[2, 2] = np.nan
+        self.assertEqual([len(p) for p in marching_squares(arr, 2.5)], [2, 3])
+
+    def test_marching_squares_no_crossings(self):
+        self.assertEqual(marching_squares(np.ones((3, 3)), 2), [])
+
+
+
+class ContoursOperationTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.image = Image(np.tile(np.arange(4.), (3, 1)), bounds=(0, 0, 4, 3))
+
+    def test_contours_sheet_coordinates(self):
+        contour = contours(self.image, levels=(1.5,)).get(1).last
+        self.assertEqual(contour.data[0], np.array([[2, 2.5], [2, 1.5], [2, 0.5]]))
+        self.assertEqual(contour.level, 1.5)
+
+    def test_contours_multiple_levels(self):
+        overlay = contours(self.image, levels=(0.5, 1.5, 5))
+        self.assertEqual(overlay.get(1).keys(), [0.5, 1.5, 5])
+        self.assertEqual(len(overlay.get(1)[5].data), 0)
+
+    def test_contours_process_executor(self):
+        hmap = HoloMap({i: self.image.clone(self.image.data*i) for i in range(1, 4)})
+        self.assertEqual(contours(hmap, executor='process', workers=2),
+                         contours(hmap))
+
+
+
+class ConvolveOperationTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.target = Image(np.random.rand(8, 9))
+        self.kernel = Image(np.random.rand(3, 3))
+        convolve.spectrum_cache.clear()
+
+    def test_convolve_direct_matches_fft(self):
+        overlay = self.target * self.kernel
+        self.assertEqual(convolve(overlay, direct_size=0), convolve(overlay))
+
+    def test_convolve_caches_kernel_spectrum(self):
+        convolve(self.target * self.kernel, direct_size=0)
+        convolve(self.target.clone(self.target.data*2) * self.kernel, direct_size=0)
+        self.assertEqual(len(convolve.spectrum_cache), 1)
+
+    def test_convolve_holomap_batches_frames(self):
+        hmap = HoloMap({i: self.target.clone(self.target.data*i) * self.kernel
+                        for i in range(5)})
+        batched = convolve(hmap, direct_size=0)
+        self.assertEqual(batched.keys(), hmap.keys())
+        for key, overlay in hmap.items():
+            self.assertEqual(batched[key], convolve(overlay, direct_size=0))
+
+
+
+class HistogramOperationTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.hmap = HoloMap({i: Image(np.random.rand(10, 10) + i) for i in range(3)})
+
+    def test_histogram_image_matches_numpy(self):
+        image = self.hmap.last
+        hist = histogram(image, adjoin=False, normed=False, bin_range=(0, 3), num_bins=6)
+        counts, edges = np.histogram(image.data, range=(0, 3), bins=6)
+        self.assertEqual(hist.values, counts.astype(np.float64))
+        self.assertEqual(hist.edges, edges)
+
+    def test_histogram_holomap_shares_bins(self):
+        histmap = self.hmap.hist(adjoin=False, individually=False)
+        edges = [hist.edges for hist in histmap.values()]
+        self.assertEqual(edges[0], edges[1])
+        self.assertEqual(edges[0], edges[2])
+        self.assertEqual(edges[0][-1], self.hmap.last.data.max())
+
+    def test_histogram_holomap_individual_bins(self):
+        histmap = self.hmap.hist(adjoin=False, individually=True)
+        self.assertEqual(histmap.last.edges[-1], self.hmap.last.data.max())
+        self.assertEqual(histmap[0].edges[-1], self.hmap[0].data.max())
+
+    def test_histogram_holomap_keeps_map_group(self):
+        histmap = self.hmap.hist(adjoin=False)
+        self.assertEqual(histmap.group, self.hmap.group)
+
+    def test_histogram_holomap_ndoverlay(self):
+        hmap = HoloMap({i: NdOverlay({5: Curve([(0, i), (1, 2*i)]),
+                                      7: Curve([(0, 1), (1, 3)])})
+                        for i in range(2)})
+        histmap = hmap.hist(adjoin=False)
+        self.assertEqual(histmap.keys(), [0, 1])
+        self.assertTrue(all(isinstance(h, Histogram) for h in histmap.values()))
+        self.assertEqual(histmap[1], hmap[1].hist(adjoin=False))
@@ -4,14 +4,14 @@ Tests of plot instantiation (not display tests, just instantiation)
 
 from unittest import SkipTest
 import numpy as np
-from holoviews import Curve, Scatter, Overlay
+from holoviews import Curve, Scatter, Points, Overlay, HoloMap, Image, Table
 from holoviews.element.comparison import ComparisonTestCase
 
 try:
     # Standardize backend due to random inconsistencies
     from matplotlib import pyplot
     pyplot.switch_backend('agg')
-    from holoviews.plotting import OverlayPlot
+    from holoviews.plotting import OverlayPlot, CurvePlot, PointPlot, RasterPlot, TablePlot
 except:
     pyplot = None
 
@@ -29,3 +29,82 @@ class TestPlotInstantiation(ComparisonTestCase):
         o = Overlay([Curve(np.array([[0, 1]])) , Scatter([[1,1]]) , Curve(np.array([[0, 1]]))])
         OverlayPlot(o)
 
+    def test_holomap_ranges_cached(self):
+        hmap = HoloMap({i: Curve([(0, i), (1, i)]) for i in range(3)})
+        plot = CurvePlot(hmap)
+        ranges = plot.compute_ranges(hmap, None, None)
+        self.assertIs(plot.compute_ranges(hmap, None, None)[('Curve',)], ranges[('Curve',)])
+        self.assertEqual(ranges[('Curve',)]['y'], (0, 2))
+
+    def test_holomap_ranges_updated(self):
+        hmap = HoloMap({i: Curve([(0, i), (1, i)]) for i in range(3)})
+        plot = CurvePlot(hmap)
+        plot.compute_ranges(hmap, None, None)
+        hmap[3] = Curve([(0, 5), (1, 5)])
+        ranges = plot.compute_ranges(hmap, None, None)
+        self.assertEqual(ranges[('Curve',)]['y'], (0, 5))
+
+    def test_raster_plot_subsampled(self):
+        plot = RasterPlot(Image(np.random.rand(4000, 4000)))
+        plot()
+        self.assertTrue(plot.handles['im'].get_array().shape[0] < 4000)
+        (l, r, b, t) = plot.handles['im'].get_extent()
+        self.assertEqual((l, t), (-0.5, 0.5))
+
+    def test_raster_plot_visible_region(self):
+        image = Image(np.random.rand(100, 100))
+        plot = RasterPlot(image, situate_axes=True, apply_extents=False)
+        plot(ranges={('Image',): {'x': (0, 0.5), 'y': (0, 0.5), 'z': (0, 1)}})
+        self.assertEqual(plot.handles['im'].get_array().shape, (50, 50))
+
+    def test_curve_plot_decimated(self):
+        xs = np.linspace(0, 1, 100000)
+        ys = np.sin(xs*100)
+        plot = CurvePlot(Curve(np.column_stack([xs, ys])), lod=True)
+        plot()
+        ydata = plot.handles['line_segment'].get_ydata()
+        self.assertTrue(len(ydata) < 100000)
+        self.assertEqual((ydata.min(), ydata.max()), (ys.min(), ys.max()))
+
+    def test_curve_plot_not_decimated_by_default(self):
+        xs = np.linspace(0, 1, 20000)
+        plot = CurvePlot(Curve(np.column_stack([xs, xs])))
+        plot()
+        self.assertEqual(len(plot.handles['line_segment'].get_ydata()), 20000)
+
+    def test_curve_plot_decimation_sliced(self):
+        xs = np.linspace(0, 1, 100000)
+        curve = Curve(np.column_stack([xs, xs]))
+        full = CurvePlot(curve, lod=True)
+        sliced = CurvePlot(curve[0.4:0.5], lod=True, lod_threshold=1000)
+        full(), sliced()
+        xdata = sliced.handles['line_segment'].get_xdata()
+        self.assertTrue(xdata.min() >= 0.4 and xdata.max() < 0.5)
+        # The decimation is recomputed at the resolution of the slice
+        full_xdata = full.handles['line_segment'].get_xdata()
+        visible = (full_xdata >= 0.4) & (full_xdata < 0.5)
+        self.assertTrue(len(xdata) > 5 * visible.sum())
+
+    def test_point_plot_subsampled(self):
+        plot = PointPlot(Points(np.random.randn(50000, 2)), lod=True, lod_threshold=1000)
+        plot()
+        self.assertTrue(len(plot.handles['paths'].get_offsets()) < 50000)
+
+    def test_table_plot_formats_displayed_frames(self):
+        hmap = HoloMap({i: Table([((j,), (i*j,)) for j in range(100)])
+                        for i in range(3)})
+        plot = TablePlot(hmap, max_rows=10)
+        self.assertEqual(plot.cell_values, {})
+        plot()
+        self.assertEqual(list(plot.cell_values.keys()), [(2,)])
+        self.assertEqual(len(plot.cell_values[(2,)]), 20)
+        plot.update_frame((1,))
+        self.assertEqual(plot.cell_values[(1,)][(9, 1)], '99')
+
+    def test_holomap_ranges_replaced_frame(self):
+        hmap = HoloMap({i: Curve([(0, i), (1, i)]) for i in range(3)})
+        plot = CurvePlot(hmap)
+        plot.compute_ranges(hmap, None, None)
+        hmap[2] = Curve([(0, 7), (1, 7)])
+        ranges = plot.compute_ranges(hmap, None, None)
+        self.assertEqual(ranges[('Curve',)]['y'], (0, 7))
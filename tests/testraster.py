@@ -2,6 +2,8 @@
 Unit tests of Raster elements
 """
 
+import os
+import tempfile
 import numpy as np
 from holoviews.element import Raster, Image
 from holoviews.element.comparison import ComparisonTestCase
@@ -36,3 +38,37 @@ class TestRaster(ComparisonTestCase):
         image = Image(self.array1)
         self.assertEqual(image.sample(y=0.25).data,
                          np.array([(-0.333333, 0), (0, 1), (0.333333, 2)]))
+
+
+
+class TestMemmapRaster(ComparisonTestCase):
+
+    def setUp(self):
+        (fd, self.filename) = tempfile.mkstemp()
+        os.close(fd)
+        memmap = np.memmap(self.filename, dtype='float32', mode='w+', shape=(40, 20))
+        memmap[:] = np.arange(800).reshape(40, 20)
+        memmap.flush()
+        del memmap
+        self.memmap = np.memmap(self.filename, dtype='float32', mode='r', shape=(40, 20))
+
+    def tearDown(self):
+        del self.memmap
+        os.remove(self.filename)
+
+    def test_image_memmap_slice_view(self):
+        image = Image(self.memmap, bounds=(0, 0, 2, 4))
+        sliced = image[0:1, 0:1]
+        self.assertEqual(sliced.data.shape, (10, 10))
+        self.assertTrue(np.may_share_memory(sliced.data, self.memmap))
+
+    def test_image_memmap_range(self):
+        image = Image(self.memmap, bounds=(0, 0, 2, 4))
+        self.assertEqual(image.range(2), (0, 799))
+
+    def test_raster_memmap_ranges(self):
+        raster = Raster(self.memmap)
+        self.assertEqual(raster.range(0), (0, 19))
+        self.assertEqual(raster.range(1), (0, 39))
+        self.assertEqual(raster.range(2), (0, 799))
+
@@ -2,12 +2,17 @@
 """
 Test cases for rendering exporters
 """
+import os
+import stat
+import tempfile
+from io import BytesIO
 from hashlib import sha256
 from unittest import SkipTest
 import numpy as np
 
 from holoviews import plotting  # pyflakes:ignore (Sets Store.renderer)
-from holoviews import HoloMap, Store, Image, ItemTable
+from holoviews import HoloMap, Store, Image, ItemTable, Curve
+from holoviews.plotting import image_patches
 from holoviews.element.comparison import ComparisonTestCase
 
 from nose.plugins.attrib import attr
@@ -16,6 +21,7 @@ try:
     # Standardize backend due to random inconsistencies
     from matplotlib import pyplot
     pyplot.switch_backend('agg')
+    from matplotlib import rcParams
 except:
     pyplot = None
 
@@ -86,3 +92,121 @@ class MPLPlotRendererTest(ComparisonTestCase):
         data = self.renderer.instance(size=200)(self.unicode_table, fmt='png')[0]
         self.assertEqual(digest_data(data),
                          'f1b0a7d76e0ebf5253ed51ee430d8c15c26bd285db88dc9249d5a4ae2ea4fb79')
+
+    def test_parallel_frame_data(self):
+        renderer = self.renderer.instance(processes=2)
+        frames = list(renderer.frame_data(self.map1, range(2)))
+        plot = renderer.get_plot(self.map1)
+        serial = [renderer.figure_data(plot[i], 'png', bbox_inches=None)
+                  for i in range(2)]
+        self.assertEqual([digest_data(f) for f in frames],
+                         [digest_data(f) for f in serial])
+
+    def test_plot_frames_closes_figure_on_early_stop(self):
+        plot = self.renderer.get_plot(self.map1)
+        frames = self.renderer._plot_frames(plot)
+        next(frames)
+        frames.close()
+        self.assertNotIn(plot.handles['fig'].number, pyplot.get_fignums())
+
+    def test_save_file_like(self):
+        buf = BytesIO()
+        self.renderer.save(self.image1, buf, fmt='png')
+        data = self.renderer(self.image1, fmt='png')[0]
+        self.assertEqual(digest_data(buf.getvalue()), digest_data(data))
+
+    def test_encode_frames_streams_output(self):
+        if os.name != 'posix':
+            raise SkipTest("Stand-in encoder requires a POSIX shell")
+        # Stand in for ffmpeg, echoing the frames piped to it
+        (fd, path) = tempfile.mkstemp(suffix='.sh')
+        os.write(fd, b'#!/bin/sh\ncat\n')
+        os.close(fd)
+        os.chmod(path, stat.S_IRWXU)
+        ffmpeg_path = rcParams['animation.ffmpeg_path']
+        rcParams['animation.ffmpeg_path'] = path
+        try:
+            frames = [b'frame1', b'frame2']
+            chunks = self.renderer.encode_frames(iter(frames), 'webm')
+            self.assertEqual(b''.join(chunks), b''.join(frames))
+        finally:
+            rcParams['animation.ffmpeg_path'] = ffmpeg_path
+            os.remove(path)
+
+    def test_encode_frames_failure(self):
+        if os.name != 'posix':
+            raise SkipTest("Stand-in encoder requires a POSIX shell")
+        ffmpeg_path = rcParams['animation.ffmpeg_path']
+        rcParams['animation.ffmpeg_path'] = 'false'
+        try:
+            chunks = self.renderer.encode_frames(iter([b'frame']), 'webm')
+            self.assertRaises(IOError, list, chunks)
+        finally:
+            rcParams['animation.ffmpeg_path'] = ffmpeg_path
+
+    def test_encode_frames_verbose_log(self):
+        if os.name != 'posix':
+            raise SkipTest("Stand-in encoder requires a POSIX shell")
+        # Stand in for ffmpeg logging more than a pipe buffer holds
+        (fd, path) = tempfile.mkstemp(suffix='.sh')
+        os.write(fd, b'#!/bin/sh\nhead -c 1000000 /dev/zero >&2\necho failed >&2\n'
+                 b'cat > /dev/null\nexit 1\n')
+        os.close(fd)
+        os.chmod(path, stat.S_IRWXU)
+        ffmpeg_path = rcParams['animation.ffmpeg_path']
+        rcParams['animation.ffmpeg_path'] = path
+        try:
+            chunks = self.renderer.encode_frames(iter([b'frame']*10), 'webm')
+            try:
+                list(chunks)
+            except IOError as e:
+                self.assertTrue('failed' in str(e))
+            else:
+                raise AssertionError("No IOError raised by failed encoder")
+        finally:
+            rcParams['animation.ffmpeg_path'] = ffmpeg_path
+            os.remove(path)
+
+    def test_delta_frames_reconstruct(self):
+        hmap = HoloMap({i: Curve([(0, 0), (1, i)]) for i in range(3)})
+        plot = self.renderer.get_plot(hmap)
+        frames = list(self.renderer.delta_frames(plot, range(3), max_delta=1))
+        self.assertEqual([f[1] for f in frames], [0, 0, 0])
+        self.assertEqual([f[2] is None for f in frames], [False, True, True])
+        keyframe = pyplot.imread(BytesIO(frames[0][2]))
+        for x, y, w, h, data in frames[2][3]:
+            keyframe[y:y+h, x:x+w] = pyplot.imread(BytesIO(data))
+        rendered = self.renderer.figure_data(plot[2], 'png')
+        self.assertEqual(keyframe, pyplot.imread(BytesIO(rendered)))
+
+    def test_delta_frames_keyframe_interval(self):
+        hmap = HoloMap({i: Curve([(0, 0), (1, i)]) for i in range(3)})
+        plot = self.renderer.get_plot(hmap)
+        frames = self.renderer.delta_frames(plot, range(3), keyframe_interval=1)
+        self.assertEqual([f[1] for f in frames], [0, 0, 2])
+
+
+
+class ImagePatchesTest(ComparisonTestCase):
+
+    def setUp(self):
+        self.reference = np.zeros((20, 20, 4))
+
+    def test_image_patches_unchanged(self):
+        self.assertEqual(image_patches(self.reference, self.reference.copy()), [])
+
+    def test_image_patches_bands(self):
+        image = self.reference.copy()
+        image[2:4, 5] = 1
+        image[15, 10:13] = 1
+        patches = image_patches(self.reference, image, gap=2)
+        self.assertEqual([(x, y, p.shape[:2]) for x, y, p in patches],
+                         [(5, 2, (2, 1)), (10, 15, (1, 3))])
+
+    def test_image_patches_merges_nearby_rows(self):
+        image = self.reference.copy()
+        image[2, 5] = 1
+        image[5, 8] = 1
+        patches = image_patches(self.reference, image, gap=4)
+        self.assertEqual([(x, y, p.shape[:2]) for x, y, p in patches],
+                         [(5, 2, (4, 4))])
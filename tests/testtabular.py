@@ -3,7 +3,10 @@ Unit tests of tabular elements
 """
 
 from collections import OrderedDict
-from holoviews import Table, ItemTable
+
+import numpy as np
+
+from holoviews import Table, ItemTable, HoloMap
 from holoviews.element.comparison import ComparisonTestCase
 
 class TestTable(ComparisonTestCase):
@@ -66,3 +69,123 @@ class TestTable(ComparisonTestCase):
                       value_dimensions = self.val_dims1)
         self.assertEquals(table['F', 12, 'Height'], 0.8)
 
+
+    def test_table_columns(self):
+        table =Table(zip(self.keys1, self.values1),
+                      key_dimensions = self.key_dims1,
+                      value_dimensions = self.val_dims1)
+        columns = table.columns()
+        self.assertEquals(list(columns.keys()), self.key_dims1 + self.val_dims1)
+        self.assertEquals(list(columns['Age']), [12, 10, 16])
+        self.assertEquals(list(columns['Weight']), [10, 15, 18])
+
+    def test_table_dimension_values_after_setitem(self):
+        table =Table(zip(self.keys1, self.values1),
+                      key_dimensions = self.key_dims1,
+                      value_dimensions = self.val_dims1)
+        table.dimension_values('Height')
+        table[('F', 20)] = (11, 0.7)
+        self.assertEquals(list(table.dimension_values('Height')), [0.8, 0.8, 0.6, 0.7])
+
+    def test_table_columns_after_update(self):
+        table =Table(zip(self.keys1, self.values1),
+                      key_dimensions = self.key_dims1,
+                      value_dimensions = self.val_dims1)
+        table.columns()
+        table.update(Table({('M', 10): (99, 0.1)}, key_dimensions = self.key_dims1,
+                           value_dimensions = self.val_dims1))
+        self.assertEquals(list(table.columns()['Weight']), [10, 99, 18])
+        self.assertEquals(list(table.dimension_values('Weight')), [10, 99, 18])
+
+    def test_table_dimension_values_copy(self):
+        table =Table(zip(self.keys1, self.values1),
+                      key_dimensions = self.key_dims1,
+                      value_dimensions = self.val_dims1)
+        table.dimension_values('Weight')[:] = 0
+        self.assertEquals(list(table.dimension_values('Weight')), [10, 15, 18])
+
+    def test_table_reduce_all(self):
+        table =Table(zip(self.keys1, self.values1),
+                      key_dimensions = self.key_dims1,
+                      value_dimensions = self.val_dims1)
+        reduced = table.reduce(['Gender', 'Age'], np.mean)
+        self.assertEquals(reduced.data[()], (np.mean([15, 18, 10]), np.mean([0.8, 0.6, 0.8])))
+
+    def test_table_to_curve(self):
+        table = Table([(0, 1), (1, 3), (2, 2)], key_dimensions=['x'],
+                      value_dimensions=['y'])
+        curve = table.to.curve(['x'], ['y'])
+        self.assertEquals(curve.data, np.array([[0, 1], [1, 3], [2, 2]], dtype=float))
+
+    def test_table_reduce_grouped(self):
+        table =Table(zip(self.keys1, self.values1),
+                      key_dimensions = self.key_dims1,
+                      value_dimensions = self.val_dims1)
+        reduced = table.reduce(['Age'], np.mean)
+        self.assertEquals(reduced.key_dimensions, [table.get_dimension('Gender')])
+        self.assertEquals(reduced.data, OrderedDict([(('F',), (10, 0.8)),
+                                                     (('M',), (16.5, 0.7))]))
+
+    def test_table_reduce_grouped_callable(self):
+        table =Table(zip(self.keys1, self.values1),
+                      key_dimensions = self.key_dims1,
+                      value_dimensions = self.val_dims1)
+        reduced = table.reduce(Age=len)
+        self.assertEquals(reduced.data, OrderedDict([(('F',), (1, 1)),
+                                                     (('M',), (2, 2))]))
+
+    def test_table_groupby(self):
+        table =Table(zip(self.keys1, self.values1),
+                      key_dimensions = self.key_dims1,
+                      value_dimensions = self.val_dims1)
+        grouped = table.groupby(['Gender'], container_type=HoloMap)
+        self.assertEquals(grouped.keys(), ['F', 'M'])
+        self.assertEquals(grouped['M'].data, OrderedDict([((10,), (15, 0.8)),
+                                                          ((16,), (18, 0.6))]))
+
+    def test_table_row(self):
+        table =Table(zip(self.keys1, self.values1),
+                      key_dimensions = self.key_dims1,
+                      value_dimensions = self.val_dims1)
+        self.assertEquals(table.row(2), ('M', 16, 18, 0.6))
+
+    def test_table_row_updated(self):
+        table =Table(zip(self.keys1, self.values1),
+                      key_dimensions = self.key_dims1,
+                      value_dimensions = self.val_dims1)
+        table.row(1)
+        table[('M', 10)] = (20, 0.9)
+        self.assertEquals(table.row(1), ('M', 10, 20, 0.9))
+
+    def test_table_row_after_update(self):
+        table =Table(zip(self.keys1, self.values1),
+                      key_dimensions = self.key_dims1,
+                      value_dimensions = self.val_dims1)
+        table.row(1)
+        table.update(Table({('M', 10): (99, 0.1)}, key_dimensions = self.key_dims1,
+                           value_dimensions = self.val_dims1))
+        self.assertEquals(table.row(1), ('M', 10, 99, 0.1))
+        self.assertEquals(table.pprint_cell(2, 2), '99')
+
+    def test_table_column(self):
+        table =Table(zip(self.keys1, self.values1),
+                      key_dimensions = self.key_dims1,
+                      value_dimensions = self.val_dims1)
+        self.assertEquals(list(table.column('Weight')), [10, 15, 18])
+        self.assertEquals(list(table.column(1)), [12, 10, 16])
+
+    def test_table_pprint_cell(self):
+        table =Table(zip(self.keys1, self.values1),
+                      key_dimensions = self.key_dims1,
+                      value_dimensions = self.val_dims1)
+        self.assertEquals(table.pprint_cell(0, 2), 'Weight')
+        self.assertEquals(table.pprint_cell(1, 0), 'F')
+        self.assertEquals(table.pprint_cell(3, 3), '0.6')
+
+    def test_itemtable_row(self):
+        table = ItemTable([('A', 1), ('B', 2)])
+        dim, value = table.row(1)
+        self.assertEquals((dim.name, value), ('B', 2))
+        self.assertEquals(table.pprint_cell(1, 0), 'B')
+        self.assertEquals(table.pprint_cell(1, 1), '2')
+
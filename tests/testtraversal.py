@@ -0,0 +1,55 @@
+"""
+Tests of the traversal utilities used to unify the keys of composite
+objects.
+"""
+
+import numpy as np
+
+from holoviews import HoloMap, Curve, Image
+from holoviews.core import LazyHoloMap
+from holoviews.core.traversal import unique_dimkeys, bijective
+from holoviews.element.comparison import ComparisonTestCase
+
+
+class TestUniqueDimkeys(ComparisonTestCase):
+
+    def setUp(self):
+        self.curve = Curve([(0, 0), (1, 1)])
+
+    def test_unique_dimkeys_single_holomap(self):
+        hmap = HoloMap([((i, j), self.curve) for i in range(2) for j in range(2)],
+                       key_dimensions=['A', 'B'])
+        dims, keys = unique_dimkeys(hmap)
+        self.assertEqual([d.name for d in dims], ['A', 'B'])
+        self.assertEqual(keys, [(0, 0), (0, 1), (1, 0), (1, 1)])
+
+    def test_unique_dimkeys_partial_keys_matched(self):
+        hmap1 = HoloMap([((i, j), self.curve) for i in range(2) for j in range(2)],
+                        key_dimensions=['A', 'B'])
+        hmap2 = HoloMap([(i, self.curve) for i in range(2)], key_dimensions=['A'])
+        dims, keys = unique_dimkeys(hmap1 + hmap2)
+        self.assertEqual(keys, [(0, 0), (0, 1), (1, 0), (1, 1)])
+
+    def test_unique_dimkeys_partial_keys_unmatched(self):
+        hmap1 = HoloMap([((0, j), self.curve) for j in range(2)],
+                        key_dimensions=['A', 'B'])
+        hmap2 = HoloMap([(i, self.curve) for i in range(2)], key_dimensions=['A'])
+        dims, keys = unique_dimkeys(hmap1 + hmap2)
+        self.assertEqual(keys, [(0, 0), (0, 1), (1, None)])
+
+    def test_unique_dimkeys_lazy_frames_not_generated(self):
+        generated = []
+        def image(t):
+            generated.append(t)
+            return Image(np.ones((2, 2))*t)
+        lazy = LazyHoloMap(image, keys=range(3), key_dimensions=['Time'])
+        dims, keys = unique_dimkeys(lazy + HoloMap({0: self.curve},
+                                                  key_dimensions=['Time']))
+        self.assertEqual(keys, [(0,), (1,), (2,)])
+        self.assertEqual(generated, [0])
+
+    def test_bijective(self):
+        self.assertTrue(bijective([(0, 0), (1, 1), (2, 2)]))
+
+    def test_not_bijective(self):
+        self.assertFalse(bijective([(0, 0), (0, 1), (1, 1)]))
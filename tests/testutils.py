@@ -2,13 +2,17 @@
 """
 Unit tests of the helper functions in core.utils
 """
-import sys, math
+import sys, math, shutil, tempfile
 import unittest
 from unittest import SkipTest
 
 import numpy as np
 
-from holoviews.core.util import sanitize_identifier, find_range, max_range
+from holoviews.core.util import (sanitize_identifier, find_range, max_range,
+                                 factorize, reduce_groups, array_range,
+                                 minmax_decimate, density_subsample, deephash,
+                                 FileCache, parallel_map, HistogramAccumulator)
+from holoviews import Image, Curve, Overlay, Store
 from holoviews.element.comparison import ComparisonTestCase
 
 py_version = sys.version_info.major
@@ -285,3 +289,256 @@ class TestMaxRange(unittest.TestCase):
         lower, upper = max_range(self.ranges2)
         self.assertTrue(math.isnan(lower))
         self.assertTrue(math.isnan(upper))
+
+
+
+class TestGroupReductions(ComparisonTestCase):
+    """
+    Tests of the factorize and reduce_groups utilities.
+    """
+
+    def setUp(self):
+        self.columns = [np.array([1, 0, 1, 0, 2]), ['a', 'a', 'a', 'b', 'a']]
+        self.values = np.array([1., 2., 3., 4., 5.])
+
+    def test_factorize_single_column(self):
+        codes, first = factorize(self.columns[:1])
+        self.assertEqual(list(codes), [0, 1, 0, 1, 2])
+        self.assertEqual(list(first), [0, 1, 4])
+
+    def test_factorize_multiple_columns(self):
+        codes, first = factorize(self.columns)
+        self.assertEqual(list(codes), [0, 1, 0, 2, 3])
+        self.assertEqual(list(first), [0, 1, 3, 4])
+
+    def test_reduce_groups_sum(self):
+        codes, first = factorize(self.columns[:1])
+        reduced = reduce_groups(np.sum, self.values, codes, len(first))
+        self.assertEqual(list(reduced), [4., 6., 5.])
+
+    def test_reduce_groups_std(self):
+        codes, first = factorize(self.columns[:1])
+        reduced = reduce_groups(np.std, self.values, codes, len(first))
+        self.assertEqual(list(reduced), [1., 1., 0.])
+
+    def test_reduce_groups_max(self):
+        codes, first = factorize(self.columns[:1])
+        reduced = reduce_groups(np.max, self.values, codes, len(first))
+        self.assertEqual(list(reduced), [3., 4., 5.])
+
+    def test_factorize_mixed_types(self):
+        codes, first = factorize([np.array([1, 'a', None, 'a'], dtype=object)])
+        self.assertEqual(list(codes), [0, 1, 2, 1])
+
+    def test_reduce_groups_integer_sum(self):
+        codes, first = factorize(self.columns[:1])
+        reduced = reduce_groups(np.sum, np.array([1, 2, 3, 4, 5]), codes, len(first))
+        self.assertEqual(reduced.dtype.kind, 'i')
+        self.assertEqual(list(reduced), [4, 6, 5])
+
+    def test_reduce_groups_unary_ufunc(self):
+        codes, first = factorize(self.columns[:1])
+        reduced = reduce_groups(np.negative, self.values, codes, len(first))
+        self.assertEqual(list(reduced[0]), [-1., -3.])
+        self.assertEqual(list(reduced[2]), [-5.])
+
+    def test_reduce_groups_callable(self):
+        codes, first = factorize(self.columns[:1])
+        reduced = reduce_groups(np.median, self.values, codes, len(first))
+        self.assertEqual(list(reduced), [2., 3., 5.])
+
+
+
+class TestArrayRange(ComparisonTestCase):
+    """
+    Tests of the chunked array_range function.
+    """
+
+    def setUp(self):
+        self.array = np.arange(100.).reshape(20, 5)
+
+    def test_array_range(self):
+        self.assertEqual(array_range(self.array, chunk_size=10), (0, 99))
+
+    def test_array_range_nan(self):
+        self.array[0, 0] = np.NaN
+        self.assertEqual(array_range(self.array, chunk_size=10), (1, 99))
+
+    def test_array_range_channel(self):
+        array = np.dstack([self.array, -self.array])
+        self.assertEqual(array_range(array, 1, chunk_size=10), (-99, 0))
+
+    def test_array_range_readonly_cached(self):
+        self.array.flags.writeable = False
+        self.assertEqual(array_range(self.array, chunk_size=10), (0, 99))
+        # Cached block ranges are reused for read-only arrays
+        self.array.flags.writeable = True
+        self.array[:] = 0
+        self.array.flags.writeable = False
+        self.assertEqual(array_range(self.array, chunk_size=10), (0, 99))
+
+
+
+class TestLevelOfDetail(ComparisonTestCase):
+    """
+    Tests of the minmax_decimate and density_subsample functions.
+    """
+
+    def test_minmax_decimate(self):
+        xs = np.arange(8.)
+        ys = np.array([0, 3, -1, 1, 2, 5, 4, 2.])
+        indices = minmax_decimate(xs, ys, 0, 8, 2)
+        self.assertEqual(list(indices), [0, 1, 2, 3, 4, 5, 7])
+
+    def test_minmax_decimate_outside_range(self):
+        xs = np.arange(10.)
+        indices = minmax_decimate(xs, xs, 2, 8, 1)
+        self.assertEqual(list(indices), [0, 1, 2, 7, 8, 9])
+
+    def test_minmax_decimate_keeps_gaps(self):
+        xs = np.arange(6.)
+        ys = np.array([0, 1, np.NaN, 1, 2, 0])
+        self.assertEqual(list(minmax_decimate(xs, ys, 0, 6, 1)), [0, 2, 4, 5])
+
+    def test_density_subsample(self):
+        xs = np.concatenate([np.zeros(1000), [10]])
+        indices = density_subsample(xs, xs, (0, 0, 10, 10), (10, 10), 100)
+        self.assertTrue(len(indices) <= 102)
+        self.assertEqual(indices[-1], 1000)
+
+    def test_density_subsample_below_samples(self):
+        xs = np.arange(5.)
+        self.assertEqual(list(density_subsample(xs, xs, (0, 0, 5, 5), (5, 5), 10)),
+                         list(range(5)))
+
+
+
+class TestDeepHash(ComparisonTestCase):
+
+    def test_deephash_equal_elements(self):
+        self.assertEqual(deephash(Image(np.arange(4.).reshape(2, 2))),
+                         deephash(Image(np.arange(4.).reshape(2, 2))))
+
+    def test_deephash_data_changes(self):
+        self.assertNotEqual(deephash(Image(np.arange(4.).reshape(2, 2))),
+                            deephash(Image(np.ones((2, 2)))))
+
+    def test_deephash_dtype_changes(self):
+        self.assertNotEqual(deephash(np.zeros(4, dtype=np.int32)),
+                            deephash(np.zeros(2, dtype=np.int64)))
+
+    def test_deephash_params_change(self):
+        self.assertNotEqual(deephash(Curve([(0, 1)], group='A')),
+                            deephash(Curve([(0, 1)], group='B')))
+
+    def test_deephash_dimensions_change(self):
+        self.assertNotEqual(deephash(Curve([(0, 1)], key_dimensions=['x'])),
+                            deephash(Curve([(0, 1)], key_dimensions=['t'])))
+
+    def test_deephash_lambdas(self):
+        self.assertNotEqual(deephash(lambda x: x+1), deephash(lambda x: x*100))
+        self.assertEqual(deephash(lambda x: x+1), deephash(lambda x: x+1))
+
+    def test_deephash_closures(self):
+        scale = lambda factor: (lambda x: x*factor)
+        self.assertNotEqual(deephash(scale(2)), deephash(scale(3)))
+        self.assertEqual(deephash(scale(2)), deephash(scale(2)))
+
+    def test_deephash_overlay(self):
+        overlay = lambda y: Curve([(0, 1)]) * Curve([(0, y)])
+        self.assertEqual(deephash(overlay(2)), deephash(overlay(2)))
+        self.assertNotEqual(deephash(overlay(2)), deephash(overlay(3)))
+
+
+
+class TestFileCache(ComparisonTestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_file_cache_roundtrip(self):
+        cache = FileCache(self.path)
+        cache['a'] = np.arange(3)
+        self.assertEqual(FileCache(self.path)['a'], np.arange(3))
+
+    def test_file_cache_custom_options(self):
+        image = Image(np.random.rand(2, 2))
+        image.id = max(Store.custom_options or [0]) + 1
+        Store.custom_options[image.id] = {'style': 'custom'}
+        ids = set(Store.custom_options)
+        try:
+            FileCache(self.path)['a'] = image
+            loaded = FileCache(self.path)['a']
+            self.assertEqual(Store.custom_options[loaded.id], {'style': 'custom'})
+        finally:
+            for custom_id in set(Store.custom_options) - ids | {image.id}:
+                Store.custom_options.pop(custom_id)
+
+    def test_file_cache_missing(self):
+        self.assertEqual(FileCache(self.path).get('a'), None)
+
+    def test_file_cache_budget(self):
+        cache = FileCache(self.path, budget=1)
+        cache['a'], cache['b'] = 1, 2
+        self.assertEqual(cache.keys(), ['b'])
+
+
+
+class TestParallelMap(ComparisonTestCase):
+
+    def test_parallel_map_serial(self):
+        self.assertEqual(parallel_map(abs, [-1, 2, -3]), [1, 2, 3])
+
+    def test_parallel_map_thread(self):
+        self.assertEqual(parallel_map(abs, range(-10, 0), 'thread', 3),
+                         list(range(10, 0, -1)))
+
+    def test_parallel_map_process(self):
+        self.assertEqual(parallel_map(abs, range(-10, 0), 'process', 2),
+                         list(range(10, 0, -1)))
+
+    def test_parallel_map_invalid_executor(self):
+        self.assertRaises(ValueError, parallel_map, abs, [1, 2], 'cluster')
+
+
+
+class TestHistogramAccumulator(ComparisonTestCase):
+
+    def setUp(self):
+        self.values = np.random.randn(1000)
+        self.values[::50] = np.nan
+        self.finite = self.values[~np.isnan(self.values)]
+
+    def test_histogram_accumulator_matches_numpy(self):
+        accumulator = HistogramAccumulator.from_range((-2, 2), 15).add(self.values)
+        counts, edges = np.histogram(self.finite, range=(-2, 2), bins=15)
+        self.assertEqual(accumulator.counts, counts)
+        self.assertEqual(accumulator.edges, edges)
+
+    def test_histogram_accumulator_includes_last_edge(self):
+        accumulator = HistogramAccumulator([0, 1, 2]).add([-1, 0, 1, 2, 2.5])
+        self.assertEqual(accumulator.counts, np.array([1, 2]))
+
+    def test_histogram_accumulator_add_array_in_blocks(self):
+        accumulator = HistogramAccumulator.from_range((-2, 2), 15)
+        accumulator.add_array(self.values.reshape(100, 10), chunk_size=100)
+        self.assertEqual(accumulator.counts,
+                         np.histogram(self.finite, range=(-2, 2), bins=15)[0])
+
+    def test_histogram_accumulator_merge(self):
+        first = HistogramAccumulator.from_range((-2, 2), 15).add(self.values[:500])
+        second = HistogramAccumulator.from_range((-2, 2), 15).add(self.values[500:])
+        merged = first.copy().merge(second)
+        self.assertEqual(merged.counts, first.counts + second.counts)
+
+    def test_histogram_accumulator_merge_mismatched_edges(self):
+        self.assertRaises(ValueError, HistogramAccumulator([0, 1]).merge,
+                          HistogramAccumulator([0, 2]))
+
+    def test_histogram_accumulator_normed(self):
+        accumulator = HistogramAccumulator.from_range((-2, 2), 15).add(self.values)
+        density = np.histogram(self.finite, range=(-2, 2), bins=15, density=True)[0]
+        self.assertTrue(np.allclose(accumulator.histogram(normed=True)[0], density))